@@ -19,8 +19,51 @@ class Config:
     AZURE_OPENAI_EMBEDDING_DEPLOYMENT: str = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-ada-002")
     AZURE_OPENAI_API_VERSION: str = os.getenv("AZURE_OPENAI_API_VERSION", "2024-08-01-preview")
     
+    # Embedding Provider: "azure" (Azure OpenAI) or "local" (deterministic hashed bag-of-words, no network)
+    EMBEDDING_PROVIDER: str = os.getenv("EMBEDDING_PROVIDER", "azure")
+    EMBEDDING_LOCAL_DIMENSION: int = int(os.getenv("EMBEDDING_LOCAL_DIMENSION", "1536"))
+    
     # Vector Database Configuration
+    VECTOR_STORE_BACKEND: str = os.getenv("VECTOR_STORE_BACKEND", "chroma")  # "chroma" or "numpy" (in-process index)
     CHROMA_PERSIST_DIRECTORY: str = os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db")
+    VECTOR_STORE_PATH: str = os.getenv("VECTOR_STORE_PATH", "./vector_index/test_cases.idx")  # Index file for the numpy backend (record log and lock file sit next to it)
+    VECTOR_STORE_QUANTIZE: bool = os.getenv("VECTOR_STORE_QUANTIZE", "false").lower() == "true"  # Scan the stored int8 codes (a quarter of the float32 bytes), re-rank candidates in float32
+    VECTOR_STORE_HNSW_MIN_ITEMS: int = int(os.getenv("VECTOR_STORE_HNSW_MIN_ITEMS", "50000"))  # Use HNSW (if hnswlib is installed) from this size; 0 = never
+    VECTOR_STORE_HNSW_EF_SEARCH: int = int(os.getenv("VECTOR_STORE_HNSW_EF_SEARCH", "64"))  # HNSW recall/latency trade-off
+    
+    # Embedding Cache Configuration
+    # Shared by every EmbeddingGenerator in the process and persisted across restarts
+    CACHE_DIRECTORY: str = os.getenv("CACHE_DIRECTORY", "./cache")
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIRECTORY, "embeddings.db"))
+    EMBEDDING_CACHE_MAX_BYTES: int = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # 256 MB on disk
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "1000"))  # Hot entries kept in memory
+    EMBEDDING_CACHE_QUANTIZE: bool = os.getenv("EMBEDDING_CACHE_QUANTIZE", "false").lower() == "true"  # Store int8 codes (~4x smaller)
+    EMBEDDING_CACHE_ACCESS_FLUSH_SECONDS: float = float(os.getenv("EMBEDDING_CACHE_ACCESS_FLUSH_SECONDS", "30"))  # Batch LRU access-time writes (also flushed on every store)
+    
+    # LLM Response Cache (chat completions keyed by deployment, prompts, temperature and max_tokens)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIRECTORY, "llm_responses.db"))
+    LLM_CACHE_MAX_BYTES: int = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64 MB on disk
+    LLM_CACHE_TTL_SECONDS: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))  # 0 = never expire
+    LLM_CACHE_MAX_TEMPERATURE: float = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.2"))  # Only cache calls at or below this temperature (comparison, extraction)
+    
+    # Decision Store (pair decisions memoized by content hash and decision settings)
+    DECISION_STORE_ENABLED: bool = os.getenv("DECISION_STORE_ENABLED", "true").lower() == "true"
+    DECISION_STORE_PATH: str = os.getenv("DECISION_STORE_PATH", os.path.join(CACHE_DIRECTORY, "decisions.db"))
+    DECISION_STORE_VERSION: str = os.getenv("DECISION_STORE_VERSION", "1")  # Bump to ignore every stored decision
+    
+    # Embedding Input Limits (token-aware)
+    EMBEDDING_TOKEN_ENCODING: str = os.getenv("EMBEDDING_TOKEN_ENCODING", "cl100k_base")  # tiktoken encoding of the embedding model
+    EMBEDDING_MAX_INPUT_TOKENS: int = int(os.getenv("EMBEDDING_MAX_INPUT_TOKENS", "8191"))  # Per-input model limit
+    EMBEDDING_MAX_REQUEST_TOKENS: int = int(os.getenv("EMBEDDING_MAX_REQUEST_TOKENS", "120000"))  # Total tokens packed into one request
+    EMBEDDING_MAX_REQUEST_INPUTS: int = int(os.getenv("EMBEDDING_MAX_REQUEST_INPUTS", "2048"))  # API limit on inputs per embeddings request
+    EMBEDDING_CHUNK_OVERSIZE: bool = os.getenv("EMBEDDING_CHUNK_OVERSIZE", "false").lower() == "true"  # Mean-pool chunks instead of truncating
+    
+    # Batch Embedding Pipeline (async, concurrency-limited)
+    EMBEDDING_MAX_CONCURRENCY: int = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "8"))  # Requests in flight
+    EMBEDDING_RPM_LIMIT: int = int(os.getenv("EMBEDDING_RPM_LIMIT", "300"))  # Requests per minute (0 = unlimited)
+    EMBEDDING_TPM_LIMIT: int = int(os.getenv("EMBEDDING_TPM_LIMIT", "240000"))  # Tokens per minute (0 = unlimited)
+    EMBEDDING_COALESCE_WINDOW_MS: float = float(os.getenv("EMBEDDING_COALESCE_WINDOW_MS", "5"))  # Group concurrent single-text requests (0 = off)
     
     # Similarity Thresholds
     THRESHOLD_SAME: float = float(os.getenv("THRESHOLD_SAME", "0.99"))
@@ -35,6 +78,36 @@ class Config:
     
     # RAG Configuration
     RAG_TOP_K: int = int(os.getenv("RAG_TOP_K", "10"))  # Reduced from 10 to 5 for faster retrieval
+    RAG_RETRIEVAL_MODE: str = os.getenv("RAG_RETRIEVAL_MODE", "vector")  # "vector", "hybrid" (vector + BM25 fused) or "lexical" (BM25 only)
+    RAG_RRF_K: int = int(os.getenv("RAG_RRF_K", "60"))  # Reciprocal rank fusion damping constant
+    RAG_FILTER_BY_SUITE: bool = os.getenv("RAG_FILTER_BY_SUITE", "true").lower() == "true"  # Compare only against cases of the target suite
+    RAG_MATCH_TEST_TYPE: bool = os.getenv("RAG_MATCH_TEST_TYPE", "false").lower() == "true"  # Compare only against cases of the same test type
+    
+    # Near-Duplicate Fast Path (settle obvious SAME / NEW pairs without the LLM)
+    NEAR_DUPLICATE_FAST_PATH: bool = os.getenv("NEAR_DUPLICATE_FAST_PATH", "true").lower() == "true"
+    NEAR_DUPLICATE_MAX_HAMMING: int = int(os.getenv("NEAR_DUPLICATE_MAX_HAMMING", "3"))  # SimHash bits apart still counted as SAME
+    NEAR_DUPLICATE_SAME_MARGIN: float = float(os.getenv("NEAR_DUPLICATE_SAME_MARGIN", "0.30"))  # SAME without LLM from THRESHOLD_ADDON_MIN + this retrieval score
+    NEAR_DUPLICATE_NEW_MARGIN: float = float(os.getenv("NEAR_DUPLICATE_NEW_MARGIN", "0.10"))  # NEW without LLM below THRESHOLD_ADDON_MIN + this retrieval score...
+    NEAR_DUPLICATE_NEW_MAX_JACCARD: float = float(os.getenv("NEAR_DUPLICATE_NEW_MAX_JACCARD", "0.15"))  # ...and this shingle overlap
+    
+    # Suite Deduplication (MinHash + LSH banding)
+    DEDUP_NUM_PERM: int = int(os.getenv("DEDUP_NUM_PERM", "128"))  # MinHash signature length
+    DEDUP_LSH_BANDS: int = int(os.getenv("DEDUP_LSH_BANDS", "32"))  # Must divide DEDUP_NUM_PERM
+    DEDUP_JACCARD_THRESHOLD: float = float(os.getenv("DEDUP_JACCARD_THRESHOLD", "0.70"))  # Shingle overlap counted as duplicate
+    DEDUP_CERTAIN_JACCARD: float = float(os.getenv("DEDUP_CERTAIN_JACCARD", "0.95"))  # Clusters below this are worth LLM verification
+    
+    # Coverage Map (k-means over the stored vectors)
+    CLUSTER_COUNT: int = int(os.getenv("CLUSTER_COUNT", "0"))  # 0 = sqrt(n / 2), between 2 and 50
+    CLUSTER_SPARSE_FACTOR: float = float(os.getenv("CLUSTER_SPARSE_FACTOR", "0.25"))  # Sparse below this fraction of the average size
+    CLUSTER_DENSE_FACTOR: float = float(os.getenv("CLUSTER_DENSE_FACTOR", "2.0"))  # Over-populated above this multiple of the average size
+    CLUSTER_REDUNDANT_COHESION: float = float(os.getenv("CLUSTER_REDUNDANT_COHESION", "0.95"))  # Mean similarity to centroid flagged as redundant
+    
+    # Candidate Comparison (re-rank the top-k hits, compare the shortlist in one LLM call)
+    COMPARISON_MAX_CANDIDATES: int = int(os.getenv("COMPARISON_MAX_CANDIDATES", "3"))  # Candidates sent to the LLM (1 = top hit only)
+    COMPARISON_CANDIDATE_MARGIN: float = float(os.getenv("COMPARISON_CANDIDATE_MARGIN", "0.05"))  # Keep candidates within this rank score of the best
+    COMPARISON_RERANK_SEMANTIC_WEIGHT: float = float(os.getenv("COMPARISON_RERANK_SEMANTIC_WEIGHT", "0.70"))  # Rest of the rank score is field overlap
+    COMPARISON_BATCH_SIZE: int = int(os.getenv("COMPARISON_BATCH_SIZE", "5"))  # Single-candidate pairs analyzed per LLM call (1 = one call per pair)
+    COMPARISON_REASONING_MODE: str = os.getenv("COMPARISON_REASONING_MODE", "template")  # template (no LLM call), inline (part of the analysis JSON) or llm (extra call)
     
     # Test Case Generation Configuration
     USE_PARALLEL_GENERATION: bool = os.getenv("USE_PARALLEL_GENERATION", "true").lower() == "true"  # Enable parallel
@@ -84,6 +157,7 @@ class Config:
         os.makedirs(cls.CHROMA_PERSIST_DIRECTORY, exist_ok=True)
         os.makedirs(cls.KNOWLEDGE_BASE_PATH, exist_ok=True)
         os.makedirs(cls.TEST_SUITE_OUTPUT, exist_ok=True)
+        os.makedirs(cls.CACHE_DIRECTORY, exist_ok=True)
 
 
 # Initialize directories on import
@@ -4,7 +4,7 @@ Knowledge base management for test cases
 import os
 import sys
 import json
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,6 +21,8 @@ class KnowledgeBase:
         """Initialize knowledge base"""
         self.base_path = Config.KNOWLEDGE_BASE_PATH
         self.test_suites: Dict[str, TestSuite] = {}
+        # (suite name, test case ID) -> TestCase for O(1) lookups (IDs are only unique within a suite)
+        self._case_index: Dict[Tuple[str, str], TestCase] = {}
         self._load_existing_suites()
     
     def _load_existing_suites(self):
@@ -36,6 +38,8 @@ class KnowledgeBase:
                     data = load_json(filepath)
                     suite = TestSuite(**data)
                     self.test_suites[suite.name] = suite
+                    for tc in suite.test_cases:
+                        self._case_index[(suite.name, tc.id)] = tc
                 except Exception as e:
                     print(f"Error loading suite {filename}: {e}")
     
@@ -91,6 +95,7 @@ class KnowledgeBase:
             suite = self.create_test_suite(suite_name)
         
         suite.add_test_case(test_case)
+        self._case_index[(suite_name, test_case.id)] = test_case
         self._save_suite(suite)
     
     def update_test_case_in_suite(
@@ -108,6 +113,8 @@ class KnowledgeBase:
         suite = self.test_suites.get(suite_name)
         if suite:
             suite.update_test_case(test_case)
+            if suite.get_test_case_by_id(test_case.id) is test_case:
+                self._case_index[(suite_name, test_case.id)] = test_case
             self._save_suite(suite)
     
     def get_test_case_from_suite(
@@ -125,6 +132,10 @@ class KnowledgeBase:
         Returns:
             TestCase or None
         """
+        indexed = self._case_index.get((suite_name, test_case_id))
+        if indexed is not None:
+            return indexed
+        
         suite = self.test_suites.get(suite_name)
         if suite:
             return suite.get_test_case_by_id(test_case_id)
@@ -179,7 +190,8 @@ class KnowledgeBase:
         self, 
         suite_name: str, 
         output_path: str,
-        format: str = "json"
+        format: str = "json",
+        embeddings: Optional[Dict[str, Dict[str, Any]]] = None
     ):
         """
         Export test suite to file
@@ -188,6 +200,9 @@ class KnowledgeBase:
             suite_name: Suite name
             output_path: Output file path
             format: Export format (json, excel, csv)
+            embeddings: Optional embedding records by test case ID
+                (see build_embedding_record), written into JSON exports
+                so importers can skip re-embedding
         """
         from core.utils import export_to_excel, export_to_csv
         
@@ -196,7 +211,12 @@ class KnowledgeBase:
             raise ValueError(f"Suite '{suite_name}' not found")
         
         if format == "json":
-            save_json(suite.model_dump(), output_path)
+            suite_dict = suite.model_dump()
+            if embeddings:
+                for tc_dict in suite_dict["test_cases"]:
+                    if tc_dict["id"] in embeddings:
+                        tc_dict["embedding"] = embeddings[tc_dict["id"]]
+            save_json(suite_dict, output_path)
         elif format == "excel":
             export_to_excel(suite.test_cases, output_path)
         elif format == "csv":
@@ -76,6 +76,7 @@ class ComparisonResult(BaseModel):
     behavior_match: bool
     coverage_expansion: List[str] = Field(default_factory=list)
     confidence_score: float
+    needs_review: bool = False  # No decision could be scored (e.g. keyword-only retrieval)
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
@@ -2,9 +2,11 @@
 Utility functions for the test case management system
 """
 import json
+import base64
 import hashlib
 import re
 from typing import List, Dict, Any
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from core.models import TestCase, TestStep
@@ -16,6 +18,46 @@ def generate_id(text: str) -> str:
     return hashlib.md5(text.encode()).hexdigest()[:12]
 
 
+def normalize_text(text: str) -> str:
+    """Collapse whitespace runs so formatting-only differences compare equal"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def compute_content_hash(text: str) -> str:
+    """Hash of normalized text, used to detect real content changes"""
+    return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+
+def encode_embedding(embedding) -> str:
+    """Pack an embedding as base64 little-endian float32 (compact JSON-safe form)"""
+    return base64.b64encode(np.asarray(embedding, dtype="<f4").tobytes()).decode("ascii")
+
+
+def decode_embedding(data: str) -> np.ndarray:
+    """Unpack an embedding produced by encode_embedding"""
+    return np.frombuffer(base64.b64decode(data), dtype="<f4").astype(np.float32)
+
+
+def build_embedding_record(embedding, model: str, content_hash: str) -> Dict[str, Any]:
+    """
+    Build the per-case "embedding" entry written by JSON exports
+    
+    Args:
+        embedding: Stored vector
+        model: Embedding model/provider id the vector came from
+        content_hash: Hash of the text that was embedded
+    
+    Returns:
+        Dictionary with model, dim, content_hash and base64 vector
+    """
+    return {
+        "model": model,
+        "dim": len(embedding),
+        "content_hash": content_hash,
+        "vector": encode_embedding(embedding)
+    }
+
+
 def calculate_test_distribution(num_test_cases: int) -> Dict[str, Any]:
     """
     Calculate test case distribution based on total count and configured percentages.
@@ -831,3 +873,44 @@ def import_from_json(file_path: str) -> List[TestCase]:
             continue
     
     return test_cases
+
+
+def load_precomputed_embeddings(file_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read embeddings included in a JSON export
+    
+    Args:
+        file_path: Path to JSON file written with embeddings included
+        
+    Returns:
+        Dictionary mapping test case ID to {"model", "content_hash", "embedding"}
+        (empty if the file carries no embeddings)
+    """
+    data = load_json(file_path)
+    
+    if isinstance(data, dict):
+        data = data.get('test_cases', data.get('testCases', [data]))
+    if not isinstance(data, list):
+        return {}
+    
+    precomputed = {}
+    for tc_data in data:
+        if not isinstance(tc_data, dict):
+            continue
+        record = tc_data.get("embedding")
+        if not isinstance(record, dict) or not tc_data.get("id"):
+            continue
+        try:
+            embedding = decode_embedding(record["vector"])
+        except Exception as e:
+            print(f"Warning: Ignoring invalid embedding for '{tc_data.get('title', 'unknown')}': {str(e)}")
+            continue
+        if record.get("dim") not in (None, len(embedding)):
+            continue
+        precomputed[tc_data["id"]] = {
+            "model": record.get("model"),
+            "content_hash": record.get("content_hash"),
+            "embedding": embedding
+        }
+    
+    return precomputed
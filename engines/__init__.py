@@ -3,16 +3,51 @@ AI Engines for RAG, embeddings, comparison, and test case generation
 """
 from .rag_engine import RAGEngine
 from .embeddings import EmbeddingGenerator
-from .comparison_engine import ComparisonEngine
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .embedding_pipeline import AsyncEmbeddingPipeline
+from .embedding_providers import (
+    EmbeddingProvider,
+    AzureEmbeddingProvider,
+    LocalEmbeddingProvider,
+    get_embedding_provider
+)
+from .vector_compression import DimensionReducer
+from .vector_store import VectorStore, ChromaVectorStore, NumpyVectorStore, get_vector_store
+from .bm25 import BM25Index
+from .llm_cache import LLMResponseCache, get_llm_cache
+from .decision_store import DecisionStore, get_decision_store
+from .comparison_engine import ComparisonEngine, ComparisonContext
 from .test_case_generator import TestCaseGenerator
 from .test_case_manager import TestCaseManager
+from .reconciliation import StoreReconciler
+from .deduplication import SuiteDeduplicator
 from .context_engineering import ContextEngineer
 
 __all__ = [
     'RAGEngine',
     'EmbeddingGenerator',
+    'EmbeddingCache',
+    'get_embedding_cache',
+    'AsyncEmbeddingPipeline',
+    'EmbeddingProvider',
+    'AzureEmbeddingProvider',
+    'LocalEmbeddingProvider',
+    'get_embedding_provider',
+    'DimensionReducer',
+    'VectorStore',
+    'ChromaVectorStore',
+    'NumpyVectorStore',
+    'get_vector_store',
+    'BM25Index',
+    'LLMResponseCache',
+    'get_llm_cache',
+    'DecisionStore',
+    'get_decision_store',
     'ComparisonEngine',
+    'ComparisonContext',
     'TestCaseGenerator',
     'TestCaseManager',
+    'StoreReconciler',
+    'SuiteDeduplicator',
     'ContextEngineer'
 ]
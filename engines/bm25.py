@@ -0,0 +1,188 @@
+"""
+In-memory BM25 inverted index over test case text
+"""
+import os
+import re
+import sys
+import math
+import threading
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.vector_store import matches_where
+
+
+class BM25Index:
+    """
+    Okapi BM25 ranking over an inverted index
+    
+    Documents can be added, replaced and removed one at a time, so the index
+    follows the vector store without rebuilding. Each document keeps its
+    metadata, so searches accept the same `where` filters as the vector
+    stores.
+    """
+    
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty index
+        
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._metadatas: Dict[str, Dict[str, Any]] = {}
+        self._total_length = 0
+    
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """Lowercase alphanumeric tokens"""
+        return cls.TOKEN_PATTERN.findall(text.lower())
+    
+    def add(self, doc_id: str, text: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Index a document (replacing any previous version)
+        
+        Args:
+            doc_id: Document ID
+            text: Document text
+            metadata: Metadata used by filtered searches
+        """
+        terms = Counter(self.tokenize(text))
+        
+        with self._lock:
+            self._remove(doc_id)
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            self._doc_terms[doc_id] = terms
+            length = sum(terms.values())
+            self._doc_lengths[doc_id] = length
+            self._metadatas[doc_id] = dict(metadata or {})
+            self._total_length += length
+    
+    def update_metadata(self, doc_id: str, metadata: Dict[str, Any]):
+        """
+        Merge metadata keys of an indexed document
+        
+        Args:
+            doc_id: Document ID
+            metadata: Keys to set
+        """
+        with self._lock:
+            if doc_id in self._metadatas:
+                self._metadatas[doc_id].update(metadata)
+    
+    def remove(self, doc_id: str):
+        """
+        Drop a document from the index
+        
+        Args:
+            doc_id: Document ID
+        """
+        with self._lock:
+            self._remove(doc_id)
+    
+    def clear(self):
+        """Remove every document"""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._metadatas.clear()
+            self._total_length = 0
+    
+    def search(
+        self,
+        text: str,
+        top_k: int = 10,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank documents against a query
+        
+        Args:
+            text: Query text
+            top_k: Number of results
+            where: Metadata filter in Chroma syntax
+        
+        Returns:
+            List of (doc_id, score), best first (documents sharing no term are omitted)
+        """
+        query_terms = set(self.tokenize(text))
+        
+        with self._lock:
+            n_docs = len(self._doc_lengths)
+            if n_docs == 0 or top_k <= 0:
+                return []
+            
+            avg_length = self._total_length / n_docs
+            scores: Dict[str, float] = {}
+            
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+            
+            if where:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if matches_where(self._metadatas[doc_id], where)
+                }
+        
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+    
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+    
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_lengths
+    
+    def _remove(self, doc_id: str):
+        """Drop a document (caller holds the lock)"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._metadatas.pop(doc_id, None)
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse several rankings of IDs
+    
+    Args:
+        rankings: Lists of IDs, each best first
+        k: Rank damping constant (60 in the original RRF paper)
+    
+    Returns:
+        List of (id, fused score), best first
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
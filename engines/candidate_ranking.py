@@ -0,0 +1,125 @@
+"""
+Cheap re-ranking of retrieved candidates before LLM comparison
+"""
+import os
+import sys
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from core.models import TestCase
+from core.utils import calculate_text_similarity
+
+
+# Relative weight of each field in the overlap score
+FIELD_WEIGHTS = {
+    "business_rule": 0.35,
+    "steps": 0.25,
+    "expected_outcome": 0.15,
+    "title": 0.10,
+    "preconditions": 0.10,
+    "test_type": 0.05
+}
+
+
+def field_overlap(new_test_case: TestCase, existing_test_case: TestCase) -> float:
+    """
+    Weighted word overlap between the key fields of two test cases
+    
+    Business rules and steps dominate: cases that share them usually test
+    the same thing even when titles differ.
+    
+    Args:
+        new_test_case: New test case
+        existing_test_case: Stored test case
+    
+    Returns:
+        Overlap score (0.0 - 1.0)
+    """
+    def steps(tc: TestCase) -> str:
+        return " ".join(f"{s.action} {s.expected_result}" for s in tc.test_steps)
+    
+    fields = {
+        "business_rule": (new_test_case.business_rule, existing_test_case.business_rule),
+        "steps": (steps(new_test_case), steps(existing_test_case)),
+        "expected_outcome": (new_test_case.expected_outcome, existing_test_case.expected_outcome),
+        "title": (new_test_case.title, existing_test_case.title),
+        "preconditions": (" ".join(new_test_case.preconditions), " ".join(existing_test_case.preconditions)),
+        "test_type": (new_test_case.test_type, existing_test_case.test_type)
+    }
+    
+    total, weight = 0.0, 0.0
+    for field, (new_text, existing_text) in fields.items():
+        # Fields empty on both sides say nothing about the pair
+        if not new_text.strip() and not existing_text.strip():
+            continue
+        if field == "test_type":
+            score = 1.0 if new_text == existing_text else 0.0
+        else:
+            score = calculate_text_similarity(new_text, existing_text)
+        total += FIELD_WEIGHTS[field] * score
+        weight += FIELD_WEIGHTS[field]
+    
+    return total / weight if weight else 0.0
+
+
+def rank_candidates(
+    new_test_case: TestCase,
+    candidates: List[Tuple[Dict[str, Any], TestCase]],
+    max_candidates: Optional[int] = None,
+    margin: Optional[float] = None,
+    semantic_weight: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Re-score retrieved candidates and keep the ones worth an LLM comparison
+    
+    The rank score blends the retrieval similarity with field overlap.
+    Candidates below Config.THRESHOLD_ADDON_MIN similarity, or more than
+    `margin` behind the best rank score, are dropped.
+    
+    Args:
+        new_test_case: New test case
+        candidates: (search hit, stored TestCase) pairs
+        max_candidates: Shortlist size (defaults to Config.COMPARISON_MAX_CANDIDATES)
+        margin: Rank score margin (defaults to Config.COMPARISON_CANDIDATE_MARGIN)
+        semantic_weight: Weight of the retrieval similarity (defaults to
+            Config.COMPARISON_RERANK_SEMANTIC_WEIGHT)
+    
+    Returns:
+        Shortlist (best first) of dictionaries with "hit", "test_case",
+        "similarity", "overlap" and "rank_score"
+    """
+    if max_candidates is None:
+        max_candidates = Config.COMPARISON_MAX_CANDIDATES
+    if margin is None:
+        margin = Config.COMPARISON_CANDIDATE_MARGIN
+    if semantic_weight is None:
+        semantic_weight = Config.COMPARISON_RERANK_SEMANTIC_WEIGHT
+    
+    if not candidates:
+        return []
+    
+    similarity = np.array([hit["similarity"] for hit, _ in candidates], dtype=np.float32)
+    overlap = np.array([field_overlap(new_test_case, tc) for _, tc in candidates], dtype=np.float32)
+    rank_score = semantic_weight * similarity + (1 - semantic_weight) * overlap
+    
+    eligible = similarity >= Config.THRESHOLD_ADDON_MIN
+    if not eligible.any():
+        return []
+    
+    best = rank_score[eligible].max()
+    keep = eligible & (rank_score >= best - margin)
+    order = [i for i in np.argsort(-rank_score, kind="stable") if keep[i]][:max(1, max_candidates)]
+    
+    return [
+        {
+            "hit": candidates[i][0],
+            "test_case": candidates[i][1],
+            "similarity": float(similarity[i]),
+            "overlap": float(overlap[i]),
+            "rank_score": float(rank_score[i])
+        }
+        for i in order
+    ]
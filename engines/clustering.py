@@ -0,0 +1,199 @@
+"""
+Semantic clustering and coverage map of stored test cases
+"""
+import os
+import sys
+import numpy as np
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from engines.similarity import normalize_rows
+
+
+def choose_cluster_count(n_items: int) -> int:
+    """Rule-of-thumb cluster count sqrt(n / 2), kept between 2 and 50"""
+    return int(min(50, max(2, round(np.sqrt(n_items / 2)))))
+
+
+def mini_batch_kmeans(
+    matrix,
+    k: int,
+    batch_size: int = 1024,
+    iterations: int = 100,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Spherical mini-batch k-means over unit-length embeddings
+    
+    Each iteration assigns a random batch to its nearest centroid and moves
+    the centroids with per-centroid learning rates (Sculley, 2010), so the
+    cost per iteration does not depend on the number of vectors.
+    
+    Args:
+        matrix: (N x D) embeddings
+        k: Number of clusters (clamped to N)
+        batch_size: Vectors per iteration
+        iterations: Number of mini-batches
+        seed: Random seed
+    
+    Returns:
+        Tuple of (centroids (k x D), labels (N,))
+    """
+    data = normalize_rows(matrix)
+    n_items = len(data)
+    k = max(1, min(k, n_items))
+    rng = np.random.default_rng(seed)
+    
+    # k-means++ seeding on a sample
+    sample = data[rng.choice(n_items, size=min(n_items, max(10 * k, batch_size)), replace=False)]
+    centroids = [sample[rng.integers(len(sample))]]
+    closest = 1 - sample @ centroids[0]
+    for _ in range(1, k):
+        weights = np.clip(closest, 0, None)
+        total = weights.sum()
+        index = rng.choice(len(sample), p=weights / total) if total > 0 else rng.integers(len(sample))
+        centroids.append(sample[index])
+        closest = np.minimum(closest, 1 - sample @ sample[index])
+    centroids = np.array(centroids, dtype=np.float32)
+    
+    counts = np.zeros(k, dtype=np.int64)
+    for _ in range(iterations):
+        batch = data[rng.choice(n_items, size=min(batch_size, n_items), replace=False)]
+        assigned = np.argmax(batch @ centroids.T, axis=1)
+        for cluster in np.unique(assigned):
+            members = batch[assigned == cluster]
+            counts[cluster] += len(members)
+            rate = len(members) / counts[cluster]
+            centroids[cluster] = (1 - rate) * centroids[cluster] + rate * members.mean(axis=0)
+        centroids = normalize_rows(centroids)
+    
+    labels = np.argmax(data @ centroids.T, axis=1)
+    return centroids, labels
+
+
+def summarize_metadata(metadatas: List[Dict[str, Any]], top_n: int = 5) -> Dict[str, Any]:
+    """
+    Counts by test type, priority, business rule and tag
+    
+    Args:
+        metadatas: Stored metadata of the test cases
+        top_n: Business rules and tags to list
+    
+    Returns:
+        Dictionary of count dictionaries (most common first)
+    """
+    test_types, priorities, rules, tags = Counter(), Counter(), Counter(), Counter()
+    for metadata in metadatas:
+        test_types[metadata.get("test_type") or "Unknown"] += 1
+        priorities[metadata.get("priority") or "Unknown"] += 1
+        if metadata.get("business_rule"):
+            rules[metadata["business_rule"]] += 1
+        tags.update(tag for tag in (metadata.get("tags") or "").split(",") if tag)
+    
+    return {
+        "test_types": dict(test_types.most_common()),
+        "priorities": dict(priorities.most_common()),
+        "business_rules": dict(rules.most_common(top_n)),
+        "tags": dict(tags.most_common(top_n))
+    }
+
+
+def cluster_coverage(
+    ids: List[str],
+    matrix,
+    metadatas: List[Dict[str, Any]],
+    k: Optional[int] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Cluster test case vectors and describe what each cluster covers
+    
+    Clusters are flagged "sparse" when they hold fewer than
+    Config.CLUSTER_SPARSE_FACTOR times the average size, "over_populated"
+    above Config.CLUSTER_DENSE_FACTOR times the average, and "redundant"
+    when their members sit closer than Config.CLUSTER_REDUNDANT_COHESION to
+    the centroid on average.
+    
+    Args:
+        ids: Test case IDs
+        matrix: (N x D) embeddings aligned with ids
+        metadatas: Stored metadata aligned with ids
+        k: Number of clusters (defaults to Config.CLUSTER_COUNT, or a
+            size-based choice when that is 0)
+        seed: Random seed
+    
+    Returns:
+        Dictionary with totals, overall counts and the per-cluster report
+        (largest cluster first)
+    """
+    n_items = len(ids)
+    if n_items == 0:
+        return {
+            "total_test_cases": 0,
+            "cluster_count": 0,
+            "average_cluster_size": 0.0,
+            "overall": summarize_metadata([]),
+            "clusters": []
+        }
+    
+    k = k or Config.CLUSTER_COUNT or choose_cluster_count(n_items)
+    centroids, labels = mini_batch_kmeans(matrix, k, seed=seed)
+    data = normalize_rows(matrix)
+    centroid_similarity = np.einsum("ij,ij->i", data, centroids[labels])
+    
+    sizes = np.bincount(labels, minlength=len(centroids))
+    average_size = n_items / max(1, np.count_nonzero(sizes))
+    
+    clusters = []
+    for cluster in np.flatnonzero(sizes):
+        members = np.flatnonzero(labels == cluster)
+        closest = members[np.argsort(-centroid_similarity[members])]
+        cohesion = float(centroid_similarity[members].mean())
+        size = int(sizes[cluster])
+        clusters.append({
+            "cluster": int(cluster),
+            "size": size,
+            "cohesion": round(cohesion, 4),
+            "representative_ids": [ids[i] for i in closest[:3]],
+            "representative_titles": [metadatas[i].get("title", "") for i in closest[:3]],
+            **summarize_metadata([metadatas[i] for i in members]),
+            "sparse": size < Config.CLUSTER_SPARSE_FACTOR * average_size,
+            "over_populated": size > Config.CLUSTER_DENSE_FACTOR * average_size,
+            "redundant": size > 1 and cohesion >= Config.CLUSTER_REDUNDANT_COHESION
+        })
+    
+    clusters.sort(key=lambda entry: entry["size"], reverse=True)
+    return {
+        "total_test_cases": n_items,
+        "cluster_count": len(clusters),
+        "average_cluster_size": round(average_size, 2),
+        "overall": summarize_metadata(metadatas),
+        "clusters": clusters
+    }
+
+
+def build_coverage_map(collection, suite_name: Optional[str] = None, k: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Load every stored vector as one matrix and build the coverage map
+    
+    Args:
+        collection: Vector store (RAGEngine.collection)
+        suite_name: Only map this suite
+        k: Number of clusters
+    
+    Returns:
+        Coverage report (see cluster_coverage)
+    """
+    stored = collection.get(
+        where={"suite_name": suite_name} if suite_name else None,
+        include=["embeddings", "metadatas"]
+    )
+    if not stored['ids']:
+        return cluster_coverage([], np.zeros((0, 0), dtype=np.float32), [], k)
+    
+    matrix = np.asarray(stored['embeddings'], dtype=np.float32)
+    metadatas = [metadata or {} for metadata in stored['metadatas']]
+    return cluster_coverage(list(stored['ids']), matrix, metadatas, k)
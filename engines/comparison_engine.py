@@ -2,8 +2,10 @@
 Comparison engine for analyzing test case similarities with Context Engineering
 """
 import os
+import re
 import sys
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -12,13 +14,48 @@ from config.config import Config
 from core.models import TestCase, ComparisonResult, DecisionType
 from engines.embeddings import EmbeddingGenerator
 from engines.context_engineering import ContextEngineer
-from core.utils import load_json
+from engines.llm_cache import get_llm_cache, cached_chat_completion
+from engines.decision_store import get_decision_store, decision_config_version
+from engines.near_duplicate import classify_near_duplicate
+from core.utils import load_json, compute_content_hash
 import json
 
 
+class ComparisonContext:
+    """
+    Vectors and similarity scores already known within one request
+    
+    Lets the retrieval step hand its scores to the comparison, so every
+    text is embedded at most once per request.
+    """
+    
+    def __init__(self):
+        self._embeddings: Dict[str, List[float]] = {}
+        self._similarities: Dict[Tuple[str, str], float] = {}
+    
+    def add_embedding(self, test_case: TestCase, embedding: List[float]):
+        """Remember the vector of a test case (keyed by its text)"""
+        self._embeddings[compute_content_hash(test_case.to_text())] = embedding
+    
+    def get_embedding(self, test_case: TestCase) -> Optional[List[float]]:
+        """Known vector of a test case, if any"""
+        return self._embeddings.get(compute_content_hash(test_case.to_text()))
+    
+    def add_similarity(self, new_test_case_id: str, existing_test_case_id: str, similarity: float):
+        """Remember the semantic similarity (0-1 scale) of a pair"""
+        self._similarities[(new_test_case_id, existing_test_case_id)] = similarity
+    
+    def get_similarity(self, new_test_case_id: str, existing_test_case_id: str) -> Optional[float]:
+        """Known semantic similarity of a pair, if any"""
+        return self._similarities.get((new_test_case_id, existing_test_case_id))
+
+
 class ComparisonEngine:
     """Compare test cases to determine relationships using advanced context engineering"""
     
+    REASONING_MODES = ("template", "inline", "llm")
+    RECENT_COMPARISONS = 256  # Scored comparisons kept for on-demand explanations
+    
     def __init__(self, use_context_engineering: bool = True):
         """
         Initialize comparison engine
@@ -32,9 +69,15 @@ class ComparisonEngine:
             azure_endpoint=Config.AZURE_OPENAI_ENDPOINT
         )
         self.deployment = Config.AZURE_OPENAI_DEPLOYMENT_NAME
+        self.llm_cache = get_llm_cache()
+        self.decision_store = get_decision_store()
         self.embedding_generator = EmbeddingGenerator()
         self.prompts = load_json("prompts.json")
         self.use_context_engineering = use_context_engineering
+        self.reasoning_mode = Config.COMPARISON_REASONING_MODE.lower()
+        if self.reasoning_mode not in self.REASONING_MODES:
+            raise ValueError(f"Unsupported reasoning mode: {self.reasoning_mode}")
+        self._recent: "OrderedDict[Tuple[str, Optional[str]], Tuple]" = OrderedDict()
         
         # Initialize context engineer if enabled
         if self.use_context_engineering:
@@ -44,7 +87,8 @@ class ComparisonEngine:
         self, 
         new_test_case: TestCase, 
         existing_test_case: TestCase,
-        historical_decisions: Optional[List[Dict]] = None
+        historical_decisions: Optional[List[Dict]] = None,
+        context: Optional[ComparisonContext] = None
     ) -> ComparisonResult:
         """
         Compare two test cases using hybrid semantic + LLM similarity
@@ -57,24 +101,246 @@ class ComparisonEngine:
         Args:
             new_test_case: New test case to compare
             existing_test_case: Existing test case from knowledge base
-            
+            historical_decisions: Similar past decisions for learning (defaults
+                to the stored decisions made against the existing case)
+            context: Vectors and scores already computed in this request
+        
         Returns:
             ComparisonResult with decision and analysis
         """
+        # The same pair of contents was already decided under this configuration
+        remembered = self._remembered(new_test_case, existing_test_case)
+        if remembered is not None:
+            return remembered
+        
         # Step 1: Calculate semantic similarity (embedding-based)
-        new_embedding = self.embedding_generator.generate_embedding(
-            new_test_case.to_text()
-        )
-        existing_embedding = self.embedding_generator.generate_embedding(
-            existing_test_case.to_text()
-        )
-        semantic_similarity = self.embedding_generator.calculate_similarity(
-            new_embedding, existing_embedding
-        )
+        semantic_similarity = self._semantic_similarity(new_test_case, existing_test_case, context)
+        
+        # Obvious duplicates / unrelated pairs need no LLM analysis
+        if Config.NEAR_DUPLICATE_FAST_PATH:
+            fast_result = classify_near_duplicate(new_test_case, existing_test_case, semantic_similarity)
+            if fast_result is not None:
+                return fast_result
         
         # Step 2: Use LLM for deep contextual analysis
-        analysis = self._analyze_with_llm(new_test_case, existing_test_case)
+        if historical_decisions is None and self.decision_store is not None:
+            historical_decisions = self.decision_store.historical_decisions(existing_test_case)
+        analysis = self._analyze_with_llm(
+            new_test_case,
+            existing_test_case,
+            historical_decisions=historical_decisions,
+            semantic_similarity=semantic_similarity
+        )
+        
+        return self._build_result(new_test_case, existing_test_case, semantic_similarity, analysis)
+    
+    def compare_against_candidates(
+        self,
+        new_test_case: TestCase,
+        candidates: List[Tuple[TestCase, Optional[float]]],
+        historical_decisions: Optional[List[Dict]] = None,
+        context: Optional[ComparisonContext] = None
+    ) -> ComparisonResult:
+        """
+        Compare a test case against several shortlisted candidates in one LLM call
+        
+        Each candidate gets its own analysis and hybrid score; the strongest
+        decision wins (SAME over ADD-ON over NEW, then by hybrid score). Falls
+        back to compare_test_cases against the first candidate if the batched
+        analysis cannot be used.
+        
+        Args:
+            new_test_case: New test case to compare
+            candidates: (existing TestCase, semantic similarity) pairs, best
+                first; a None similarity is taken from the context or computed
+            historical_decisions: Similar past decisions for learning
+            context: Vectors and scores already computed in this request
         
+        Returns:
+            ComparisonResult for the best matching candidate
+        """
+        decision_rank = {DecisionType.SAME: 2, DecisionType.ADDON: 1, DecisionType.NEW: 0}
+        
+        # Every candidate already decided under this configuration: no work left
+        remembered = [self._remembered(new_test_case, tc) for tc, _ in candidates]
+        if remembered and all(result is not None for result in remembered):
+            return max(remembered, key=lambda result: (decision_rank[result.decision], result.similarity_score))
+        
+        context = context or ComparisonContext()
+        for tc, similarity in candidates:
+            if similarity is not None:
+                context.add_similarity(new_test_case.id, tc.id, similarity)
+        candidates = [(tc, self._semantic_similarity(new_test_case, tc, context)) for tc, _ in candidates]
+        
+        if Config.NEAR_DUPLICATE_FAST_PATH:
+            fast_results = [
+                classify_near_duplicate(new_test_case, tc, similarity) for tc, similarity in candidates
+            ]
+            for fast_result in fast_results:
+                if fast_result is not None and fast_result.decision == DecisionType.SAME:
+                    return fast_result
+            
+            # Drop candidates that are clearly unrelated
+            remaining = [c for c, fast_result in zip(candidates, fast_results) if fast_result is None]
+            if not remaining:
+                return fast_results[0]
+            candidates = remaining
+        
+        if len(candidates) == 1:
+            return self.compare_test_cases(new_test_case, candidates[0][0], historical_decisions, context)
+        
+        analyses = self._analyze_candidates_with_llm(new_test_case, [tc for tc, _ in candidates])
+        if analyses is None:
+            return self.compare_test_cases(new_test_case, candidates[0][0], historical_decisions, context)
+        
+        best = None
+        for (existing_test_case, semantic_similarity), analysis in zip(candidates, analyses):
+            result = self._build_result(
+                new_test_case,
+                existing_test_case,
+                semantic_similarity,
+                analysis,
+                explain=False
+            )
+            key = (decision_rank[result.decision], result.similarity_score)
+            if best is None or key > best[0]:
+                best = (key, result, existing_test_case, semantic_similarity, analysis)
+        
+        _, result, existing_test_case, semantic_similarity, analysis = best
+        if self.reasoning_mode != "llm":
+            return result
+        
+        # Only the chosen candidate needs an LLM explanation
+        return self._build_result(new_test_case, existing_test_case, semantic_similarity, analysis)
+    
+    def compare_test_case_pairs(
+        self,
+        pairs: List[Tuple[TestCase, TestCase]],
+        context: Optional[ComparisonContext] = None,
+        batch_size: Optional[int] = None
+    ) -> List[ComparisonResult]:
+        """
+        Compare several (new, existing) pairs with one LLM call per batch
+        
+        Pairs settled by the near-duplicate fast path are skipped; the rest
+        are packed `batch_size` at a time into one prompt. Entries of the
+        response that are missing or invalid are re-analyzed one by one.
+        
+        Args:
+            pairs: (new TestCase, existing TestCase) pairs
+            context: Vectors and scores already computed in this request
+            batch_size: Pairs per prompt (defaults to Config.COMPARISON_BATCH_SIZE)
+        
+        Returns:
+            One ComparisonResult per pair, in pair order
+        """
+        batch_size = max(1, batch_size or Config.COMPARISON_BATCH_SIZE)
+        context = context or ComparisonContext()
+        results: List[Optional[ComparisonResult]] = [
+            self._remembered(new_tc, existing_tc) for new_tc, existing_tc in pairs
+        ]
+        similarities: Dict[int, float] = {}
+        
+        for i, (new_tc, existing_tc) in enumerate(pairs):
+            if results[i] is not None:
+                continue
+            similarities[i] = self._semantic_similarity(new_tc, existing_tc, context)
+            if Config.NEAR_DUPLICATE_FAST_PATH:
+                results[i] = classify_near_duplicate(new_tc, existing_tc, similarities[i])
+        
+        pending = [i for i, result in enumerate(results) if result is None]
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            if len(chunk) > 1:
+                analyses = self._analyze_pairs_with_llm([pairs[i] for i in chunk])
+            else:
+                analyses = [None]
+            
+            for i, analysis in zip(chunk, analyses):
+                new_tc, existing_tc = pairs[i]
+                if analysis is None:
+                    analysis = self._analyze_with_llm(
+                        new_tc,
+                        existing_tc,
+                        historical_decisions=self.decision_store.historical_decisions(existing_tc) if self.decision_store else None,
+                        semantic_similarity=similarities[i]
+                    )
+                results[i] = self._build_result(new_tc, existing_tc, similarities[i], analysis)
+        
+        return results  # type: ignore
+    
+    def _remembered(self, new_test_case: TestCase, existing_test_case: TestCase) -> Optional[ComparisonResult]:
+        """Stored decision for a pair, if the decision store is enabled and has one"""
+        if self.decision_store is None:
+            return None
+        try:
+            return self.decision_store.get(new_test_case, existing_test_case, self._decision_version())
+        except Exception as e:
+            print(f"Error reading decision store: {e}")
+            return None
+    
+    def _decision_version(self) -> str:
+        """Fingerprint of the settings this engine decides under (see decision_config_version)"""
+        return decision_config_version(self.prompts, self.use_context_engineering, self.reasoning_mode)
+    
+    def _semantic_similarity(
+        self,
+        new_test_case: TestCase,
+        existing_test_case: TestCase,
+        context: Optional[ComparisonContext] = None
+    ) -> float:
+        """
+        Embedding similarity of a pair, reusing whatever the context knows
+        
+        Args:
+            new_test_case: New test case
+            existing_test_case: Existing test case
+            context: Request context (receives anything computed here)
+        
+        Returns:
+            Similarity score between 0 and 1
+        """
+        if context is not None:
+            known = context.get_similarity(new_test_case.id, existing_test_case.id)
+            if known is not None:
+                return known
+        
+        embeddings = []
+        for tc in (new_test_case, existing_test_case):
+            embedding = context.get_embedding(tc) if context is not None else None
+            if embedding is None:
+                embedding = self.embedding_generator.generate_embedding(tc.to_text())
+                if context is not None:
+                    context.add_embedding(tc, embedding)
+            embeddings.append(embedding)
+        
+        similarity = self.embedding_generator.calculate_similarity(embeddings[0], embeddings[1])
+        if context is not None:
+            context.add_similarity(new_test_case.id, existing_test_case.id, similarity)
+        return similarity
+    
+    def _build_result(
+        self,
+        new_test_case: TestCase,
+        existing_test_case: TestCase,
+        semantic_similarity: float,
+        analysis: Dict[str, Any],
+        explain: bool = True
+    ) -> ComparisonResult:
+        """
+        Turn a semantic score and an LLM analysis into a ComparisonResult
+        
+        Args:
+            new_test_case: New test case
+            existing_test_case: Existing test case
+            semantic_similarity: Embedding-based similarity
+            analysis: LLM analysis of the pair
+            explain: Generate the LLM explanation in "llm" reasoning mode (an extra
+                call); results built without it keep the raw reasoning and are not stored
+        
+        Returns:
+            ComparisonResult with decision and analysis
+        """
         # Step 3: Calculate LLM-based similarity score
         llm_similarity = self._calculate_llm_similarity(analysis)
         
@@ -94,13 +360,35 @@ class ComparisonEngine:
         )
         
         # Step 6: Generate human-readable reasoning
-        reasoning = self._generate_reasoning(
-            decision, 
-            hybrid_similarity,
-            semantic_similarity,
-            llm_similarity,
-            analysis
+        explained = explain or self.reasoning_mode != "llm"
+        if not explained:
+            reasoning = analysis.get("reasoning", "")
+        elif self.reasoning_mode == "llm":
+            reasoning = self._generate_reasoning(
+                decision, 
+                hybrid_similarity,
+                semantic_similarity,
+                llm_similarity,
+                analysis
+            )
+        elif self.reasoning_mode == "inline" and analysis.get("explanation"):
+            reasoning = str(analysis["explanation"])
+        else:
+            reasoning = self._render_reasoning(
+                decision,
+                hybrid_similarity,
+                semantic_similarity,
+                llm_similarity,
+                analysis
+            )
+        
+        # Keep the scores so the LLM explanation can be requested later
+        self._recent[(new_test_case.id, existing_test_case.id)] = (
+            decision, hybrid_similarity, semantic_similarity, llm_similarity, analysis
         )
+        self._recent.move_to_end((new_test_case.id, existing_test_case.id))
+        while len(self._recent) > self.RECENT_COMPARISONS:
+            self._recent.popitem(last=False)
         
         # Step 7: Calculate confidence score
         confidence_score = self._calculate_confidence(
@@ -110,7 +398,7 @@ class ComparisonEngine:
             analysis
         )
         
-        return ComparisonResult(
+        result = ComparisonResult(
             new_test_case_id=new_test_case.id,
             existing_test_case_id=existing_test_case.id,
             similarity_score=hybrid_similarity,  # Use hybrid score as primary
@@ -121,12 +409,220 @@ class ComparisonEngine:
             coverage_expansion=analysis.get("coverage_expansion", []),
             confidence_score=confidence_score
         )
+        
+        # Remember the decision (and the analysis behind it) for later runs
+        if self.decision_store is not None and explained and not analysis.get("analysis_failed"):
+            try:
+                self.decision_store.put(new_test_case, existing_test_case, result, analysis, self._decision_version())
+            except Exception as e:
+                print(f"Error writing decision store: {e}")
+        
+        return result
+    
+    def _analyze_candidates_with_llm(
+        self,
+        new_test_case: TestCase,
+        candidates: List[TestCase]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Analyze the relationship with several candidates in a single prompt
+        
+        Args:
+            new_test_case: New test case
+            candidates: Existing test cases
+        
+        Returns:
+            One analysis per candidate (in candidate order), or None if the
+            response could not be used
+        """
+        system_prompt = self.prompts["candidate_comparison"]["system"]
+        user_prompt = self.prompts["candidate_comparison"]["user"].format(
+            new_test_case=new_test_case.model_dump_json(indent=2),
+            candidates="\n\n".join(
+                f"CANDIDATE {i} (candidate_id: {tc.id}):\n{tc.model_dump_json(indent=2)}"
+                for i, tc in enumerate(candidates, 1)
+            )
+        )
+        if self.reasoning_mode == "inline":
+            user_prompt += "\n\n" + self.prompts["decision_explanation"]["inline"]
+        
+        try:
+            response = cached_chat_completion(
+                self.client,
+                self.llm_cache,
+                model=self.deployment,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1,
+                max_tokens=400 * len(candidates),
+                validate=lambda text: self._is_complete_batch(text, "candidates", len(candidates))
+            )
+            
+            items = self._parse_analysis_batch(response.choices[0].message.content, "candidates")
+        except Exception as e:
+            print(f"Error in batched candidate analysis, comparing top candidate only: {e}")
+            return None
+        
+        by_id = {str(item.get("candidate_id")): item for item in items if isinstance(item, dict)}
+        analyses = []
+        for i, tc in enumerate(candidates):
+            item = by_id.get(tc.id)
+            if item is None and len(items) == len(candidates):
+                item = items[i]  # IDs not echoed back: rely on order
+            analysis = self._validate_analysis(item)
+            if analysis is None:
+                print(f"Batched candidate analysis has no valid entry for {tc.id}, comparing top candidate only")
+                return None
+            analyses.append(analysis)
+        
+        return analyses
+    
+    def _analyze_pairs_with_llm(self, pairs: List[Tuple[TestCase, TestCase]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyze several independent pairs in a single prompt
+        
+        Args:
+            pairs: (new TestCase, existing TestCase) pairs
+        
+        Returns:
+            One analysis per pair (in pair order); None for entries that are
+            missing or invalid
+        """
+        system_prompt = self.prompts["pair_comparison"]["system"]
+        user_prompt = self.prompts["pair_comparison"]["user"].format(
+            pairs="\n\n".join(
+                f"PAIR {i} (pair_id: {i}):\nNEW TEST CASE:\n{new_tc.model_dump_json(indent=2)}\n"
+                f"EXISTING TEST CASE:\n{existing_tc.model_dump_json(indent=2)}"
+                for i, (new_tc, existing_tc) in enumerate(pairs, 1)
+            )
+        )
+        if self.reasoning_mode == "inline":
+            user_prompt += "\n\n" + self.prompts["decision_explanation"]["inline"]
+        
+        try:
+            response = cached_chat_completion(
+                self.client,
+                self.llm_cache,
+                model=self.deployment,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1,
+                max_tokens=400 * len(pairs),
+                validate=lambda text: self._is_complete_batch(text, "pairs", len(pairs))
+            )
+            
+            items = self._parse_analysis_batch(response.choices[0].message.content, "pairs")
+        except Exception as e:
+            print(f"Error in batched pair analysis, analyzing {len(pairs)} pairs one by one: {e}")
+            return [None] * len(pairs)
+        
+        by_id = {str(item.get("pair_id")): item for item in items if isinstance(item, dict)}
+        analyses: List[Optional[Dict[str, Any]]] = []
+        for i in range(len(pairs)):
+            item = by_id.get(str(i + 1))
+            if item is None and len(items) == len(pairs):
+                item = items[i]  # IDs not echoed back: rely on order
+            analysis = self._validate_analysis(item)
+            if analysis is None:
+                print(f"Batched pair analysis has no valid entry for pair {i + 1}, analyzing it separately")
+            analyses.append(analysis)
+        
+        return analyses
+    
+    @staticmethod
+    def _validate_analysis(item: Any) -> Optional[Dict[str, Any]]:
+        """
+        Check one analysis entry of a batched response
+        
+        Args:
+            item: Parsed JSON entry
+        
+        Returns:
+            The analysis with defaults filled in, or None if it is unusable
+        """
+        if not isinstance(item, dict):
+            return None
+        if not isinstance(item.get("business_rule_match"), bool) or not isinstance(item.get("behavior_match"), bool):
+            return None
+        if item.get("relationship") not in ("identical", "expanded", "different"):
+            return None
+        
+        coverage_expansion = item.get("coverage_expansion", [])
+        if isinstance(coverage_expansion, str):
+            coverage_expansion = [coverage_expansion] if coverage_expansion else []
+        if not isinstance(coverage_expansion, list):
+            return None
+        
+        analysis = dict(item)
+        analysis["coverage_expansion"] = [str(entry) for entry in coverage_expansion]
+        analysis.setdefault("reasoning", "Analysis completed")
+        return analysis
+    
+    @staticmethod
+    def _extract_json(content: Optional[str]) -> str:
+        """Strip a response down to its JSON (handles markdown code blocks)"""
+        content = content.strip() if content else ""
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
+        return content
+    
+    @classmethod
+    def _clean_analysis_json(cls, content: Optional[str]) -> str:
+        """
+        Extract the JSON of a single analysis response
+        
+        Args:
+            content: Response text
+        
+        Returns:
+            JSON text with newlines and extra spaces removed
+        """
+        content = cls._extract_json(content)
+        # Remove newlines and extra spaces within the JSON structure
+        content = re.sub(r'\s+', ' ', content)
+        # Fix common JSON issues
+        return content.replace('\\n', ' ').replace('\n', ' ')
+    
+    @classmethod
+    def _parse_analysis_batch(cls, content: Optional[str], list_key: str) -> List[Any]:
+        """
+        Parse a batched analysis response into its entries
+        
+        Args:
+            content: Response text
+            list_key: Key holding the entries when they are wrapped in an object
+        
+        Returns:
+            Parsed entries
+        
+        Raises:
+            ValueError: If the response is not JSON or holds no list
+        """
+        items = json.loads(cls._extract_json(content))
+        if isinstance(items, dict):
+            items = items.get(list_key) or items.get("analyses") or [items]
+        if not isinstance(items, list):
+            raise ValueError("response is not a JSON array")
+        return items
+    
+    @classmethod
+    def _is_complete_batch(cls, content: str, list_key: str, expected: int) -> bool:
+        """Whether a batched response holds a valid analysis for every entry (checked before caching)"""
+        items = cls._parse_analysis_batch(content, list_key)
+        return len(items) == expected and all(cls._validate_analysis(item) is not None for item in items)
     
     def _analyze_with_llm(
         self, 
         new_test_case: TestCase, 
         existing_test_case: TestCase,
-        historical_decisions: Optional[List[Dict]] = None
+        historical_decisions: Optional[List[Dict]] = None,
+        semantic_similarity: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Use LLM to analyze test case relationship with context engineering
@@ -135,16 +631,16 @@ class ComparisonEngine:
             new_test_case: New test case
             existing_test_case: Existing test case
             historical_decisions: Similar past decisions for learning
-            
+            semantic_similarity: Embedding similarity, if already computed
+        
         Returns:
             Analysis dictionary
         """
         # Use context engineering if enabled
         if self.use_context_engineering and hasattr(self, 'context_engineer'):
-            # Calculate semantic similarity for context
-            new_embedding = self.embedding_generator.generate_embedding(new_test_case.to_text())
-            existing_embedding = self.embedding_generator.generate_embedding(existing_test_case.to_text())
-            semantic_similarity = self.embedding_generator.calculate_similarity(new_embedding, existing_embedding)
+            # Calculate semantic similarity for context (unless the caller already did)
+            if semantic_similarity is None:
+                semantic_similarity = self._semantic_similarity(new_test_case, existing_test_case)
             
             # Enhance prompts with context engineering
             enhanced_prompts = self.context_engineer.enhance_comparison_prompt(
@@ -163,31 +659,25 @@ class ComparisonEngine:
                 existing_test_case=existing_test_case.model_dump_json(indent=2)
             )
         
+        # Ask for the user-facing explanation in the same response
+        if self.reasoning_mode == "inline":
+            user_prompt += "\n\n" + self.prompts["decision_explanation"]["inline"]
+        
         try:
-            response = self.client.chat.completions.create(
+            response = cached_chat_completion(
+                self.client,
+                self.llm_cache,
                 model=self.deployment,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.1,
-                max_tokens=800
+                max_tokens=800,
+                validate=lambda text: isinstance(json.loads(self._clean_analysis_json(text)), dict)
             )
             
-            content = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-            
-            # Extract JSON - handle different formatting scenarios
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            # Clean up the JSON string - remove extra whitespace and newlines within quotes
-            import re
-            # Remove newlines and extra spaces within the JSON structure
-            content = re.sub(r'\s+', ' ', content)
-            # Fix common JSON issues
-            content = content.replace('\\n', ' ').replace('\n', ' ')
+            content = self._clean_analysis_json(response.choices[0].message.content)
             
             # Try to parse JSON
             try:
@@ -201,7 +691,8 @@ class ComparisonEngine:
                     "behavior_match": "true" in content.lower() and "behavior_match" in content, 
                     "coverage_expansion": [],
                     "relationship": "different",
-                    "reasoning": "Analysis completed with fallback parsing"
+                    "reasoning": "Analysis completed with fallback parsing",
+                    "analysis_failed": True
                 }
             
             # Ensure all required fields exist
@@ -228,7 +719,8 @@ class ComparisonEngine:
                 "behavior_match": False,
                 "coverage_expansion": [],
                 "relationship": "different",
-                "reasoning": f"Error in analysis: {str(e)[:100]}"
+                "reasoning": f"Error in analysis: {str(e)[:100]}",
+                "analysis_failed": True
             }
     
     def _calculate_llm_similarity(self, analysis: Dict[str, Any]) -> float:
@@ -315,16 +807,40 @@ class ComparisonEngine:
         # NEW: Low similarity or different business rule
         return DecisionType.NEW
     
-    def _generate_reasoning(
-        self, 
-        decision: DecisionType, 
+    def explain_comparison(self, comparison: ComparisonResult) -> str:
+        """
+        Generate the LLM explanation of a comparison on demand
+        
+        Uses the scores and analysis of the comparison if it was made recently
+        by this engine, otherwise the fields of the result itself.
+        
+        Args:
+            comparison: Result to explain
+        
+        Returns:
+            Reasoning text
+        """
+        recent = self._recent.get((comparison.new_test_case_id, comparison.existing_test_case_id))
+        if recent is not None and recent[0] == comparison.decision:
+            return self._generate_reasoning(*recent)
+        
+        analysis = {
+            "business_rule_match": comparison.business_rule_match,
+            "behavior_match": comparison.behavior_match,
+            "coverage_expansion": comparison.coverage_expansion
+        }
+        return self._generate_reasoning(comparison.decision, comparison.similarity_score, None, None, analysis)
+    
+    def _render_reasoning(
+        self,
+        decision: DecisionType,
         hybrid_similarity: float,
         semantic_similarity: float,
         llm_similarity: float,
         analysis: Dict[str, Any]
     ) -> str:
         """
-        Generate human-readable reasoning for the decision
+        Render the reasoning from the analysis fields (no LLM call)
         
         Args:
             decision: Decision type
@@ -332,21 +848,68 @@ class ComparisonEngine:
             semantic_similarity: Semantic similarity score
             llm_similarity: LLM-based similarity score
             analysis: Analysis results
+        
+        Returns:
+            Reasoning text
+        """
+        outcome = {
+            DecisionType.SAME: "Same as the existing test case",
+            DecisionType.ADDON: "Extends the existing test case",
+            DecisionType.NEW: "New test case"
+        }[decision]
+        rule = "same business rule" if analysis.get("business_rule_match") else "a different business rule"
+        behavior = "same behavior" if analysis.get("behavior_match") else "different behavior"
+        
+        parts = [
+            f"{outcome} (similarity {hybrid_similarity:.2%}: semantic {semantic_similarity:.2%}, "
+            f"LLM {llm_similarity:.2%}).",
+            f"It covers {rule} with {behavior}."
+        ]
+        coverage_expansion = analysis.get("coverage_expansion") or []
+        if coverage_expansion:
+            parts.append(f"Adds coverage: {', '.join(str(item) for item in coverage_expansion)}.")
+        if analysis.get("reasoning"):
+            parts.append(str(analysis["reasoning"]))
+        return " ".join(parts)
+    
+    def _generate_reasoning(
+        self, 
+        decision: DecisionType, 
+        hybrid_similarity: float,
+        semantic_similarity: Optional[float],
+        llm_similarity: Optional[float],
+        analysis: Dict[str, Any]
+    ) -> str:
+        """
+        Generate human-readable reasoning for the decision
+        
+        Args:
+            decision: Decision type
+            hybrid_similarity: Hybrid similarity score
+            semantic_similarity: Semantic similarity score (None if unknown)
+            llm_similarity: LLM-based similarity score (None if unknown)
+            analysis: Analysis results
             
         Returns:
             Reasoning text
         """
+        similarity_score = f"{hybrid_similarity:.2%}"
+        if semantic_similarity is not None and llm_similarity is not None:
+            similarity_score += f" (Semantic: {semantic_similarity:.2%}, LLM: {llm_similarity:.2%})"
+        
         system_prompt = self.prompts["decision_explanation"]["system"]
         user_prompt = self.prompts["decision_explanation"]["user"].format(
             decision=decision.value,
-            similarity_score=f"{hybrid_similarity:.2%} (Semantic: {semantic_similarity:.2%}, LLM: {llm_similarity:.2%})",
+            similarity_score=similarity_score,
             business_rule_match=analysis.get("business_rule_match", False),
             behavior_match=analysis.get("behavior_match", False),
             coverage_expansion=", ".join(analysis.get("coverage_expansion", []))
         )
         
         try:
-            response = self.client.chat.completions.create(
+            response = cached_chat_completion(
+                self.client,
+                self.llm_cache,
                 model=self.deployment,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -361,7 +924,7 @@ class ComparisonEngine:
             
         except Exception as e:
             # Fallback reasoning with hybrid details
-            return f"Decision: {decision.value} (Hybrid: {hybrid_similarity:.2%}, Semantic: {semantic_similarity:.2%}, LLM: {llm_similarity:.2%})"
+            return f"Decision: {decision.value} (Similarity: {similarity_score})"
     
     def _calculate_confidence(
         self, 
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.models import TestCase, UserStory
 from config.config import Config
+from engines.clustering import summarize_metadata
 
 
 class ContextEngineer:
@@ -503,27 +504,17 @@ Return ONLY the complete merged test case JSON."""
         if not existing_test_cases:
             return {}
         
-        # Analyze tags to identify domain
-        all_tags = []
-        test_types = []
-        priorities = []
-        
-        for tc in existing_test_cases:
-            all_tags.extend(tc.tags)
-            test_types.append(tc.test_type)
-            priorities.append(tc.priority)
-        
-        # Count frequencies
-        from collections import Counter
-        tag_counts = Counter(all_tags)
-        type_counts = Counter(test_types)
+        counts = summarize_metadata([
+            {"test_type": tc.test_type, "priority": tc.priority, "tags": ",".join(tc.tags)}
+            for tc in existing_test_cases
+        ])
         
         return {
-            "common_tags": [tag for tag, _ in tag_counts.most_common(5)],
-            "primary_test_types": [t for t, _ in type_counts.most_common(3)],
+            "common_tags": list(counts["tags"])[:5],
+            "primary_test_types": list(counts["test_types"])[:3],
             "total_test_cases": len(existing_test_cases),
             "average_steps": sum(len(tc.test_steps) for tc in existing_test_cases) / len(existing_test_cases),
-            "high_priority_count": sum(1 for p in priorities if p.lower() == "high")
+            "high_priority_count": sum(n for p, n in counts["priorities"].items() if p.lower() == "high")
         }
     
     def get_focus_areas(self, requirement: str) -> List[str]:
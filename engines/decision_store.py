@@ -0,0 +1,268 @@
+"""
+Persistent memo of pair comparison decisions keyed by content hashes
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Optional, Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from core.models import TestCase, ComparisonResult
+from core.utils import compute_content_hash, load_json
+
+
+def decision_config_version(
+    prompts: Optional[Dict[str, Any]] = None,
+    use_context_engineering: bool = True,
+    reasoning_mode: Optional[str] = None
+) -> str:
+    """
+    Fingerprint of every setting a comparison decision depends on
+    
+    Changing thresholds, weights, models, prompt templates, the reasoning
+    mode or context engineering starts a fresh memo instead of replaying
+    decisions (and reasoning) made under other settings.
+    
+    Args:
+        prompts: Prompt templates in use (defaults to config/prompts.json)
+        use_context_engineering: Whether comparison prompts are context-engineered
+        reasoning_mode: Reasoning mode (defaults to Config.COMPARISON_REASONING_MODE)
+    
+    Returns:
+        Short hex digest
+    """
+    if prompts is None:
+        prompts = load_json("prompts.json")
+    
+    settings = {
+        "threshold_same": Config.THRESHOLD_SAME,
+        "threshold_addon_min": Config.THRESHOLD_ADDON_MIN,
+        "semantic_weight": Config.SEMANTIC_WEIGHT,
+        "llm_weight": Config.LLM_WEIGHT,
+        "chat_deployment": Config.AZURE_OPENAI_DEPLOYMENT_NAME,
+        "embedding_provider": Config.EMBEDDING_PROVIDER,
+        "embedding_deployment": Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT,
+        "reasoning_mode": (reasoning_mode or Config.COMPARISON_REASONING_MODE).lower(),
+        "use_context_engineering": use_context_engineering,
+        "prompts": hashlib.sha256(json.dumps(prompts, sort_keys=True).encode()).hexdigest(),
+        "version": Config.DECISION_STORE_VERSION
+    }
+    return compute_content_hash(json.dumps(settings, sort_keys=True))[:16]
+
+
+class DecisionStore:
+    """
+    SQLite table of (new case, existing case, config) -> ComparisonResult
+    
+    Pairs are identified by the hashes of both cases' text, so a decision is
+    reused whenever the same contents meet again, whatever their IDs. The
+    stored results also serve as historical decisions for comparison prompts.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store
+        
+        Args:
+            path: SQLite file path (":memory:" for a non-persistent store;
+                defaults to Config.DECISION_STORE_PATH)
+        """
+        self.path = path or Config.DECISION_STORE_PATH
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        
+        if self.path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS decisions (
+                new_hash TEXT NOT NULL,
+                existing_hash TEXT NOT NULL,
+                config_version TEXT NOT NULL,
+                decision TEXT NOT NULL,
+                similarity REAL NOT NULL,
+                result TEXT NOT NULL,
+                analysis TEXT,
+                created REAL NOT NULL,
+                PRIMARY KEY (new_hash, existing_hash, config_version)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_decisions_existing ON decisions(existing_hash, created)"
+        )
+        self._conn.commit()
+    
+    def get(
+        self,
+        new_test_case: TestCase,
+        existing_test_case: TestCase,
+        config_version: Optional[str] = None
+    ) -> Optional[ComparisonResult]:
+        """
+        Look up the decision for a pair under the current configuration
+        
+        Args:
+            new_test_case: New test case
+            existing_test_case: Existing test case
+            config_version: Settings fingerprint (defaults to decision_config_version())
+        
+        Returns:
+            Stored ComparisonResult (with the IDs of the given cases), or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM decisions WHERE new_hash = ? AND existing_hash = ? AND config_version = ?",
+                self._key(new_test_case, existing_test_case, config_version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        
+        result = ComparisonResult.model_validate_json(row[0])
+        return result.model_copy(update={
+            "new_test_case_id": new_test_case.id,
+            "existing_test_case_id": existing_test_case.id,
+            "timestamp": datetime.now()
+        })
+    
+    def put(
+        self,
+        new_test_case: TestCase,
+        existing_test_case: TestCase,
+        result: ComparisonResult,
+        analysis: Optional[Dict[str, Any]] = None,
+        config_version: Optional[str] = None
+    ):
+        """
+        Store the decision for a pair
+        
+        Args:
+            new_test_case: New test case
+            existing_test_case: Existing test case
+            result: Comparison result
+            analysis: Raw LLM analysis behind the result
+            config_version: Settings fingerprint (defaults to decision_config_version())
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO decisions "
+                "(new_hash, existing_hash, config_version, decision, similarity, result, analysis, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    *self._key(new_test_case, existing_test_case, config_version),
+                    result.decision.value,
+                    result.similarity_score,
+                    result.model_dump_json(),
+                    json.dumps(analysis) if analysis is not None else None,
+                    time.time()
+                )
+            )
+            self._conn.commit()
+    
+    def historical_decisions(self, existing_test_case: TestCase, limit: int = 2) -> List[Dict[str, Any]]:
+        """
+        Past decisions made against an existing test case
+        
+        Args:
+            existing_test_case: Existing test case
+            limit: Maximum number of decisions
+        
+        Returns:
+            Most recent first, as {"similarity", "decision", "reasoning"}
+            dictionaries (the format enhance_comparison_prompt expects;
+            reasoning is the LLM analysis' own when stored)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT similarity, decision, result, analysis FROM decisions "
+                "WHERE existing_hash = ? ORDER BY created DESC LIMIT ?",
+                (compute_content_hash(existing_test_case.to_text()), limit)
+            ).fetchall()
+        
+        decisions = []
+        for similarity, decision, result, analysis in rows:
+            # The analyst's own reasoning is shorter than the rendered explanation
+            reasoning = json.loads(analysis).get("reasoning") if analysis else None
+            decisions.append({
+                "similarity": similarity,
+                "decision": decision,
+                "reasoning": reasoning or json.loads(result).get("reasoning", "")
+            })
+        return decisions
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get store counters
+        
+        Returns:
+            Dictionary with hits, misses, hit rate and stored decisions
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self)
+            }
+    
+    def clear(self):
+        """Remove every stored decision"""
+        with self._lock:
+            self._conn.execute("DELETE FROM decisions")
+            self._conn.commit()
+    
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    @staticmethod
+    def _key(new_test_case: TestCase, existing_test_case: TestCase, config_version: Optional[str]) -> tuple:
+        """(new hash, existing hash, config version) of a pair"""
+        return (
+            compute_content_hash(new_test_case.to_text()),
+            compute_content_hash(existing_test_case.to_text()),
+            config_version or decision_config_version()
+        )
+
+
+_shared_store: Optional[DecisionStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_decision_store() -> Optional[DecisionStore]:
+    """
+    Get the process-wide decision store
+    
+    Returns:
+        Shared DecisionStore instance, or None if Config.DECISION_STORE_ENABLED is off
+    """
+    global _shared_store
+    
+    if not Config.DECISION_STORE_ENABLED:
+        return None
+    
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = DecisionStore()
+        return _shared_store
@@ -0,0 +1,175 @@
+"""
+Suite-wide duplicate detection with MinHash and LSH banding
+"""
+import os
+import sys
+import numpy as np
+from typing import List, Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from core.models import TestCase
+from core.utils import compute_content_hash
+from engines.near_duplicate import MinHasher
+
+
+class SuiteDeduplicator:
+    """
+    Find clusters of duplicate test cases inside a suite
+    
+    Signatures are split into bands; only cases sharing a band bucket are
+    compared, so the work grows with the number of likely duplicates
+    instead of quadratically with the suite size.
+    """
+    
+    def __init__(
+        self,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        threshold: Optional[float] = None,
+        certain_threshold: Optional[float] = None
+    ):
+        """
+        Initialize the deduplicator
+        
+        Args:
+            num_perm: MinHash signature length (defaults to Config.DEDUP_NUM_PERM)
+            bands: LSH bands; must divide num_perm (defaults to Config.DEDUP_LSH_BANDS)
+            threshold: Estimated Jaccard from which two cases are duplicates
+                (defaults to Config.DEDUP_JACCARD_THRESHOLD)
+            certain_threshold: Estimated Jaccard from which no verification is
+                needed (defaults to Config.DEDUP_CERTAIN_JACCARD)
+        """
+        self.num_perm = num_perm or Config.DEDUP_NUM_PERM
+        self.bands = bands or Config.DEDUP_LSH_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError(f"LSH bands ({self.bands}) must divide the signature length ({self.num_perm})")
+        self.rows = self.num_perm // self.bands
+        self.threshold = threshold if threshold is not None else Config.DEDUP_JACCARD_THRESHOLD
+        self.certain_threshold = certain_threshold if certain_threshold is not None else Config.DEDUP_CERTAIN_JACCARD
+        self.hasher = MinHasher(num_perm=self.num_perm)
+    
+    def find_duplicate_clusters(self, test_cases: List[TestCase]) -> List[Dict[str, Any]]:
+        """
+        Group duplicate test cases
+        
+        Args:
+            test_cases: Test cases of a suite
+        
+        Returns:
+            Clusters (largest first), each with "test_case_ids", "indices"
+            (positions in test_cases, since IDs need not be unique), "pairs"
+            (id_a, id_b, estimated Jaccard), "min_similarity", "exact"
+            (all members identical apart from whitespace) and "ambiguous"
+            (some pair below the certain threshold)
+        """
+        if len(test_cases) < 2:
+            return []
+        
+        texts = [tc.to_text() for tc in test_cases]
+        signatures = np.stack([self.hasher.signature(text) for text in texts])
+        
+        # LSH: cases sharing all rows of any band become candidate pairs
+        candidates = set()
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = {}
+            block = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows])
+            for i in range(len(test_cases)):
+                buckets.setdefault(block[i].tobytes(), []).append(i)
+            for members in buckets.values():
+                for a in range(len(members)):
+                    for b in range(a + 1, len(members)):
+                        candidates.add((members[a], members[b]))
+        
+        if not candidates:
+            return []
+        
+        pairs = np.array(sorted(candidates), dtype=np.int64)
+        similarity = np.mean(signatures[pairs[:, 0]] == signatures[pairs[:, 1]], axis=1)
+        matched = similarity >= self.threshold
+        
+        # Union-find over the confirmed pairs
+        parent = list(range(len(test_cases)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for a, b in pairs[matched]:
+            root_a, root_b = find(int(a)), find(int(b))
+            if root_a != root_b:
+                parent[root_b] = root_a
+        
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(test_cases)):
+            groups.setdefault(find(i), []).append(i)
+        
+        pairs_by_root: Dict[int, List[tuple]] = {}
+        for (a, b), score in zip(pairs[matched], similarity[matched]):
+            pairs_by_root.setdefault(find(int(a)), []).append(
+                (test_cases[a].id, test_cases[b].id, round(float(score), 4))
+            )
+        
+        clusters = []
+        for root, members in groups.items():
+            if len(members) < 2:
+                continue
+            cluster_pairs = pairs_by_root.get(root, [])
+            exact = len({compute_content_hash(texts[i]) for i in members}) == 1
+            min_similarity = 1.0 if exact else min(score for _, _, score in cluster_pairs)
+            clusters.append({
+                "test_case_ids": [test_cases[i].id for i in members],
+                "indices": members,
+                "pairs": cluster_pairs,
+                "min_similarity": min_similarity,
+                "exact": exact,
+                "ambiguous": not exact and min_similarity < self.certain_threshold
+            })
+        
+        clusters.sort(key=lambda cluster: len(cluster["test_case_ids"]), reverse=True)
+        return clusters
+    
+    def verify_clusters(
+        self,
+        clusters: List[Dict[str, Any]],
+        test_cases: List[TestCase],
+        comparison_engine
+    ) -> List[Dict[str, Any]]:
+        """
+        Confirm ambiguous clusters with the comparison engine
+        
+        Every member of an ambiguous cluster is compared with the cluster's
+        first case; clear-cut clusters are left untouched.
+        
+        Args:
+            clusters: Output of find_duplicate_clusters (updated in place)
+            test_cases: Test cases the clusters were found in (same order)
+            comparison_engine: ComparisonEngine used for the LLM comparison
+        
+        Returns:
+            The clusters, ambiguous ones with a "verification" list of
+            {"test_case_id", "decision", "reasoning"} entries
+        """
+        for cluster in clusters:
+            if not cluster["ambiguous"]:
+                continue
+            
+            representative = test_cases[cluster["indices"][0]]
+            verification = []
+            for index in cluster["indices"][1:]:
+                test_case = test_cases[index]
+                try:
+                    result = comparison_engine.compare_test_cases(test_case, representative)
+                    verification.append({
+                        "test_case_id": test_case.id,
+                        "decision": result.decision.value,
+                        "reasoning": result.reasoning
+                    })
+                except Exception as e:
+                    print(f"Error verifying duplicate {test_case.id}: {e}")
+            cluster["verification"] = verification
+        
+        return clusters
@@ -0,0 +1,293 @@
+"""
+Persistent, size-bounded embedding cache shared across EmbeddingGenerator instances
+"""
+import os
+import sys
+import time
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple, Union
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from engines.vector_compression import quantize_int8, dequantize_int8
+
+
+def make_cache_key(text: str, model: str, truncation: Union[int, str]) -> str:
+    """
+    Build a content-addressed cache key
+    
+    Args:
+        text: Normalized text that is sent to the model
+        model: Embedding deployment/model name
+        truncation: Truncation limit (or chunking mode) applied to the text
+    
+    Returns:
+        Hex digest identifying the embedding
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{model}\x00{truncation}\x00".encode())
+    digest.update(text.encode())
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Disk-backed embedding cache with LRU eviction
+    
+    Embeddings are stored as float32 blobs in SQLite so they survive restarts.
+    A small in-memory LRU of the same blobs sits in front of the database for
+    hot entries, and the database itself is kept under a byte budget by
+    evicting the least recently used rows. Access times of hits (from either
+    tier) are collected in memory and written in one batch before every
+    store and eviction, and at most every few seconds otherwise.
+    
+    In quantized mode vectors are stored as a float32 scale followed by int8
+    codes (dim + 4 bytes instead of dim * 4). Both formats can coexist in one
+    database; each row is decoded according to its size.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        memory_items: Optional[int] = None,
+        quantize: Optional[bool] = None,
+        access_flush_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the cache
+        
+        Args:
+            path: SQLite file path (":memory:" for a non-persistent cache)
+            max_bytes: Byte budget for stored vectors (defaults to Config.EMBEDDING_CACHE_MAX_BYTES)
+            memory_items: Number of hot entries kept in memory (defaults to Config.EMBEDDING_CACHE_SIZE)
+            quantize: Store new vectors as int8 (defaults to Config.EMBEDDING_CACHE_QUANTIZE)
+            access_flush_seconds: Longest delay before access times of hits are
+                written (defaults to Config.EMBEDDING_CACHE_ACCESS_FLUSH_SECONDS)
+        """
+        self.path = path or Config.EMBEDDING_CACHE_PATH
+        self.max_bytes = max_bytes if max_bytes is not None else Config.EMBEDDING_CACHE_MAX_BYTES
+        self.memory_items = memory_items if memory_items is not None else Config.EMBEDDING_CACHE_SIZE
+        self.quantize = quantize if quantize is not None else Config.EMBEDDING_CACHE_QUANTIZE
+        self.access_flush_seconds = (
+            access_flush_seconds if access_flush_seconds is not None else Config.EMBEDDING_CACHE_ACCESS_FLUSH_SECONDS
+        )
+        
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        # Key -> access time of hits not yet written to disk
+        self._touched: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        
+        if self.path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                nbytes INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)"
+        )
+        self._conn.commit()
+        
+        row = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM embeddings").fetchone()
+        self._total_bytes = int(row[0])
+    
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Look up an embedding
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Embedding or None if not cached
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                entry = self._memory[key]
+            else:
+                entry = self._conn.execute(
+                    "SELECT dim, vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if entry is None:
+                    self.misses += 1
+                    return None
+                self._remember(key, entry[0], entry[1])
+            
+            self._touch(key)
+            self.hits += 1
+            return self._decode(entry[0], entry[1])
+    
+    def set(self, key: str, embedding: List[float]):
+        """
+        Store an embedding
+        
+        Args:
+            key: Cache key
+            embedding: Embedding vector
+        """
+        blob = self._encode(embedding)
+        
+        with self._lock:
+            self._flush_access()
+            previous = self._conn.execute(
+                "SELECT nbytes FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector, nbytes, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, len(embedding), blob, len(blob), time.time())
+            )
+            self._total_bytes += len(blob) - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+            
+            self._remember(key, len(embedding), blob)
+    
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._memory:
+                return True
+            row = self._conn.execute(
+                "SELECT 1 FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            return row is not None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently used by stored vectors"""
+        return self._total_bytes
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        
+        Returns:
+            Dictionary with hits, misses, hit rate, entry count and stored bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self),
+                "bytes": self._total_bytes
+            }
+    
+    def clear(self):
+        """Remove every cached embedding"""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._total_bytes = 0
+    
+    def close(self):
+        """Write pending access times and close the underlying database connection"""
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            self._conn.close()
+    
+    def _encode(self, embedding: List[float]) -> bytes:
+        """Serialize a vector in the configured storage format"""
+        if self.quantize:
+            codes, scales = quantize_int8(embedding)
+            return scales.tobytes() + codes.tobytes()
+        return np.asarray(embedding, dtype=np.float32).tobytes()
+    
+    @staticmethod
+    def _decode(dim: int, blob: bytes) -> List[float]:
+        """Deserialize a stored vector (float32 or scale + int8 codes)"""
+        if len(blob) == dim * 4:
+            return np.frombuffer(blob, dtype=np.float32).tolist()
+        
+        scales = np.frombuffer(blob[:4], dtype=np.float32)
+        codes = np.frombuffer(blob[4:], dtype=np.int8)
+        return dequantize_int8(codes, scales)[0].tolist()
+    
+    def _remember(self, key: str, dim: int, blob: bytes):
+        """Keep an entry's stored blob in the in-memory LRU"""
+        self._memory[key] = (dim, blob)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+    
+    def _touch(self, key: str):
+        """Record a hit's access time, writing the batch once the flush interval has passed"""
+        self._touched[key] = time.time()
+        if time.monotonic() - self._last_flush >= self.access_flush_seconds:
+            self._flush_access()
+            self._conn.commit()
+    
+    def _flush_access(self):
+        """Write the access times collected since the last flush (the caller commits)"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+        self._last_flush = time.monotonic()
+    
+    def _evict(self):
+        """Drop least recently used rows until the byte budget is met"""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, nbytes FROM embeddings ORDER BY last_access ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            
+            for key, nbytes in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM embeddings WHERE key = ?", (key,))
+                self._memory.pop(key, None)
+                self._total_bytes -= nbytes
+
+
+_shared_cache: Optional[EmbeddingCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Get the process-wide embedding cache
+    
+    Returns:
+        Shared EmbeddingCache instance
+    """
+    global _shared_cache
+    
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = EmbeddingCache()
+        return _shared_cache
@@ -0,0 +1,153 @@
+"""
+Micro-batching of single-text embedding requests across threads
+"""
+import os
+import sys
+import time
+import queue
+import threading
+import numpy as np
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+
+
+EmbedFunction = Callable[[List[str]], np.ndarray]
+
+
+class EmbeddingCoalescer:
+    """
+    Collect single-text embedding requests and send them as one batch
+    
+    A lone request is sent at once; when others are already queued, requests
+    arriving within a short window (from any thread) are grouped by key,
+    identical texts are sent once, and every caller receives its own future.
+    Requests that arrive while a batch is in flight naturally form the next
+    one. A single worker thread is started on first use.
+    """
+    
+    def __init__(self, window_ms: Optional[float] = None, max_batch: Optional[int] = None):
+        """
+        Initialize coalescer
+        
+        Args:
+            window_ms: How long to wait for more requests once several are
+                pending (defaults to Config.EMBEDDING_COALESCE_WINDOW_MS)
+            max_batch: Maximum distinct texts per batch (defaults to Config.EMBEDDING_MAX_REQUEST_INPUTS)
+        """
+        self.window = (window_ms if window_ms is not None else Config.EMBEDDING_COALESCE_WINDOW_MS) / 1000.0
+        self.max_batch = max_batch or Config.EMBEDDING_MAX_REQUEST_INPUTS
+        
+        self._queue: "queue.Queue[Tuple[Hashable, EmbedFunction, str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def submit(self, text: str, embed_fn: EmbedFunction, key: Optional[Hashable] = None) -> Future:
+        """
+        Queue a text for embedding
+        
+        Args:
+            text: Text to embed
+            embed_fn: Function embedding a list of texts into a (N x D) matrix
+            key: Requests with the same key are embedded together by the
+                first one's embed_fn (defaults to embed_fn itself)
+        
+        Returns:
+            Future resolving to the embedding (1-D float32 array)
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((key if key is not None else embed_fn, embed_fn, text, future))
+        return future
+    
+    def embed(self, text: str, embed_fn: EmbedFunction, key: Optional[Hashable] = None) -> np.ndarray:
+        """
+        Embed a text, waiting for the batch it was grouped into
+        
+        Args:
+            text: Text to embed
+            embed_fn: Function embedding a list of texts into a (N x D) matrix
+            key: Batching key (see submit)
+        
+        Returns:
+            Embedding as a 1-D float32 array
+        """
+        return self.submit(text, embed_fn, key).result()
+    
+    def _ensure_worker(self):
+        """Start the worker thread if it is not running"""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="embedding-coalescer",
+                    daemon=True
+                )
+                self._worker.start()
+    
+    def _run(self):
+        """Worker loop: gather the pending requests and embed them together"""
+        while True:
+            groups: Dict[Hashable, Tuple[EmbedFunction, Dict[str, List[Future]]]] = {}
+            self._add(groups, self._queue.get())
+            
+            # Nothing else waiting: no reason to delay the request
+            if not self._queue.empty():
+                deadline = time.monotonic() + self.window
+                while sum(len(pending) for _, pending in groups.values()) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        self._add(groups, self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+            
+            for embed_fn, pending in groups.values():
+                self._dispatch(embed_fn, pending)
+    
+    @staticmethod
+    def _add(groups: Dict[Hashable, Tuple[EmbedFunction, Dict[str, List[Future]]]], request: tuple):
+        """Add a queued request to its key's group"""
+        key, embed_fn, text, future = request
+        _, pending = groups.setdefault(key, (embed_fn, {}))
+        pending.setdefault(text, []).append(future)
+    
+    @staticmethod
+    def _dispatch(embed_fn: EmbedFunction, pending: Dict[str, List[Future]]):
+        """Embed one batch and resolve every waiting future"""
+        texts = list(pending)
+        
+        try:
+            vectors = embed_fn(texts)
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+        
+        for text, vector in zip(texts, vectors):
+            for future in pending[text]:
+                future.set_result(vector)
+
+
+_shared_coalescer: Optional[EmbeddingCoalescer] = None
+_shared_coalescer_lock = threading.Lock()
+
+
+def get_embedding_coalescer() -> EmbeddingCoalescer:
+    """
+    Get the process-wide coalescer (one worker thread for every generator)
+    
+    Returns:
+        Shared EmbeddingCoalescer instance
+    """
+    global _shared_coalescer
+    
+    with _shared_coalescer_lock:
+        if _shared_coalescer is None:
+            _shared_coalescer = EmbeddingCoalescer()
+        return _shared_coalescer
@@ -0,0 +1,234 @@
+"""
+Asynchronous, concurrency-limited batch embedding pipeline
+"""
+import os
+import sys
+import time
+import asyncio
+import threading
+import numpy as np
+from typing import List, Dict, Optional, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import AsyncAzureOpenAI
+from config.config import Config
+from engines.tokenization import TokenCounter, get_token_counter, pack_batches
+
+
+class RateLimiter:
+    """
+    Token bucket limiting a quantity per minute (requests or tokens)
+    
+    Callers reserve their amount under a lock and sleep off any shortfall
+    outside it, so one limiter can be shared by every job and event loop.
+    """
+    
+    def __init__(self, per_minute: int):
+        """
+        Initialize rate limiter
+        
+        Args:
+            per_minute: Budget replenished every minute (0 disables limiting)
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = float(per_minute)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Take an amount from the budget, going into debt if needed
+        
+        Args:
+            amount: Quantity to consume
+        
+        Returns:
+            Seconds to wait before the reservation may be used
+        """
+        if self.capacity <= 0:
+            return 0.0
+        
+        # A single request larger than the whole budget can only wait for a full bucket
+        amount = min(amount, self.capacity)
+        
+        with self._lock:
+            now = time.monotonic()
+            self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.available -= amount
+            return max(0.0, -self.available / self.rate)
+    
+    async def acquire(self, amount: float = 1.0):
+        """
+        Wait until the requested amount fits in the budget
+        
+        Args:
+            amount: Quantity to consume
+        """
+        wait = self.reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_shared_limiters: Dict[Tuple[str, int], RateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, per_minute: int) -> RateLimiter:
+    """
+    Get the process-wide limiter of a budget
+    
+    Args:
+        name: Budget name (e.g. "<deployment>:requests")
+        per_minute: Budget replenished every minute (0 disables limiting)
+    
+    Returns:
+        Shared RateLimiter instance
+    """
+    with _shared_limiters_lock:
+        key = (name, per_minute)
+        if key not in _shared_limiters:
+            _shared_limiters[key] = RateLimiter(per_minute)
+        return _shared_limiters[key]
+
+
+class AsyncEmbeddingPipeline:
+    """
+    Embed many texts by dispatching batches concurrently
+    
+    Identical texts are embedded once per job, requests are packed up to the
+    per-request item and token limits, batches run under a concurrency limit
+    plus request-per-minute and token-per-minute budgets, and the result is a
+    contiguous float32 matrix aligned with the input. The budgets are shared
+    by every pipeline of the same deployment in the process.
+    """
+    
+    def __init__(
+        self,
+        deployment: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        client: Optional[Any] = None,
+        token_counter: Optional[TokenCounter] = None
+    ):
+        """
+        Initialize pipeline
+        
+        Args:
+            deployment: Embedding deployment name (defaults to Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT)
+            batch_size: Maximum texts per request (defaults to Config.EMBEDDING_MAX_REQUEST_INPUTS;
+                Config.EMBEDDING_MAX_REQUEST_TOKENS bounds requests of long texts)
+            max_concurrency: Requests in flight (defaults to Config.EMBEDDING_MAX_CONCURRENCY)
+            requests_per_minute: RPM budget (defaults to Config.EMBEDDING_RPM_LIMIT)
+            tokens_per_minute: TPM budget (defaults to Config.EMBEDDING_TPM_LIMIT)
+            client: Async OpenAI-compatible client (a new AsyncAzureOpenAI per job if omitted)
+            token_counter: Token counter used for packing and the TPM budget
+        """
+        self.deployment = deployment or Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
+        self.batch_size = batch_size or Config.EMBEDDING_MAX_REQUEST_INPUTS
+        self.max_concurrency = max_concurrency or Config.EMBEDDING_MAX_CONCURRENCY
+        self.requests_per_minute = requests_per_minute if requests_per_minute is not None else Config.EMBEDDING_RPM_LIMIT
+        self.tokens_per_minute = tokens_per_minute if tokens_per_minute is not None else Config.EMBEDDING_TPM_LIMIT
+        self.client = client
+        self.token_counter = token_counter or get_token_counter()
+        self.request_limiter = get_rate_limiter(f"{self.deployment}:requests", self.requests_per_minute)
+        self.token_limiter = get_rate_limiter(f"{self.deployment}:tokens", self.tokens_per_minute)
+    
+    def run(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts synchronously
+        
+        Safe to call from code already running inside an event loop (e.g. a
+        FastAPI handler); the job then runs on a helper thread.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Float32 matrix of shape (len(texts), dim)
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.embed(texts))
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.embed(texts)).result()
+    
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts concurrently
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Float32 matrix of shape (len(texts), dim)
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        
+        # Dedupe identical texts within the job
+        unique_texts = list(dict.fromkeys(texts))
+        token_counts = [self.token_counter.count(t) for t in unique_texts]
+        
+        # Pack as many texts per request as the item and token limits allow
+        packed = pack_batches(token_counts, self.batch_size, Config.EMBEDDING_MAX_REQUEST_TOKENS)
+        batches = [[unique_texts[i] for i in batch] for batch in packed]
+        batch_tokens = [sum(token_counts[i] for i in batch) for batch in packed]
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        if self.client is not None:
+            results = await self._embed_batches(self.client, batches, batch_tokens, semaphore)
+        else:
+            async with AsyncAzureOpenAI(
+                api_key=Config.AZURE_OPENAI_API_KEY,
+                api_version=Config.AZURE_OPENAI_API_VERSION,
+                azure_endpoint=Config.AZURE_OPENAI_ENDPOINT
+            ) as client:
+                results = await self._embed_batches(client, batches, batch_tokens, semaphore)
+        
+        vectors: Dict[str, List[float]] = {}
+        for batch, batch_vectors in zip(batches, results):
+            vectors.update(zip(batch, batch_vectors))
+        
+        dim = len(results[0][0])
+        matrix = np.empty((len(texts), dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            matrix[i] = vectors[text]
+        
+        return matrix
+    
+    async def _embed_batches(
+        self,
+        client: Any,
+        batches: List[List[str]],
+        batch_tokens: List[int],
+        semaphore: asyncio.Semaphore
+    ) -> List[List[List[float]]]:
+        """Dispatch all batches and gather results in input order"""
+        
+        async def embed_batch(batch: List[str], tokens: int) -> List[List[float]]:
+            async with semaphore:
+                await self.request_limiter.acquire(1)
+                await self.token_limiter.acquire(tokens)
+                
+                response = await client.embeddings.create(
+                    input=batch,
+                    model=self.deployment
+                )
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        
+        try:
+            return await asyncio.gather(*(
+                embed_batch(batch, tokens) for batch, tokens in zip(batches, batch_tokens)
+            ))
+        except Exception as e:
+            print(f"Error generating batch embeddings: {e}")
+            raise
@@ -0,0 +1,168 @@
+"""
+Embedding providers: Azure OpenAI and a local deterministic backend
+"""
+import os
+import re
+import sys
+import math
+import hashlib
+import numpy as np
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import AzureOpenAI
+from config.config import Config
+from engines.embedding_pipeline import AsyncEmbeddingPipeline
+from engines.tokenization import get_token_counter, pack_batches
+
+
+class EmbeddingProvider(ABC):
+    """Interface implemented by every embedding backend"""
+    
+    # Identifies the vector space; part of every cache key
+    model_id: str = ""
+    
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts in a single request
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Float32 matrix of shape (len(texts), dim)
+        """
+    
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed an arbitrarily large list of texts
+        
+        Backends with a faster bulk path override this.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Float32 matrix of shape (len(texts), dim)
+        """
+        return self.embed_packed(texts)
+    
+    def embed_packed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts in sequential requests packed by item and token limits
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Float32 matrix of shape (len(texts), dim)
+        """
+        counter = get_token_counter()
+        batches = pack_batches(
+            [counter.count(t) for t in texts],
+            Config.EMBEDDING_MAX_REQUEST_INPUTS,
+            Config.EMBEDDING_MAX_REQUEST_TOKENS
+        )
+        return np.vstack([
+            self.embed([texts[i] for i in batch])
+            for batch in batches
+        ])
+
+
+class AzureEmbeddingProvider(EmbeddingProvider):
+    """Embeddings from an Azure OpenAI deployment"""
+    
+    def __init__(self, deployment: Optional[str] = None):
+        """
+        Initialize Azure OpenAI clients
+        
+        Args:
+            deployment: Embedding deployment name (defaults to Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT)
+        """
+        self.model_id = deployment or Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
+        self.client = AzureOpenAI(
+            api_key=Config.AZURE_OPENAI_API_KEY,
+            api_version=Config.AZURE_OPENAI_API_VERSION,
+            azure_endpoint=Config.AZURE_OPENAI_ENDPOINT
+        )
+        self.pipeline = AsyncEmbeddingPipeline(deployment=self.model_id)
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        response = self.client.embeddings.create(
+            input=texts,
+            model=self.model_id
+        )
+        data = sorted(response.data, key=lambda item: item.index)
+        return np.asarray([item.embedding for item in data], dtype=np.float32)
+    
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        # Concurrent, rate-limited batches
+        return self.pipeline.run(texts)
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic hashed bag-of-words embeddings computed in NumPy
+    
+    Unigrams and bigrams are hashed into a fixed number of signed buckets
+    with sublinear term frequency, then L2-normalized. Needs no network
+    access, so it serves load tests, CI and air-gapped deployments, and gives
+    a zero-latency baseline against the remote model.
+    """
+    
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+    
+    def __init__(self, dimension: Optional[int] = None):
+        """
+        Initialize local provider
+        
+        Args:
+            dimension: Embedding size (defaults to Config.EMBEDDING_LOCAL_DIMENSION)
+        """
+        self.dimension = dimension or Config.EMBEDDING_LOCAL_DIMENSION
+        self.model_id = f"local-hash-{self.dimension}"
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        
+        for row, text in enumerate(texts):
+            tokens = self.TOKEN_PATTERN.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            
+            for feature, count in Counter(features).items():
+                digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                index = value % self.dimension
+                sign = 1.0 if (value >> 63) & 1 else -1.0
+                matrix[row, index] += sign * (1.0 + math.log(count))
+        
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        return self.embed(texts)
+
+
+def get_embedding_provider(name: Optional[str] = None) -> EmbeddingProvider:
+    """
+    Create the configured embedding provider
+    
+    Args:
+        name: Provider name ("azure" or "local"; defaults to Config.EMBEDDING_PROVIDER)
+    
+    Returns:
+        EmbeddingProvider instance
+    """
+    name = (name or Config.EMBEDDING_PROVIDER).lower()
+    
+    if name == "azure":
+        return AzureEmbeddingProvider()
+    elif name == "local":
+        return LocalEmbeddingProvider()
+    else:
+        raise ValueError(f"Unsupported embedding provider: {name}")
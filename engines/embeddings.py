@@ -1,31 +1,100 @@
 """
-Embedding generation for test cases using Azure OpenAI
+Embedding generation for test cases (Azure OpenAI or local provider)
 """
 import os
 import sys
-import hashlib
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from functools import lru_cache
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from openai import AzureOpenAI
 from config.config import Config
+from engines.embedding_providers import EmbeddingProvider, get_embedding_provider
+from engines.similarity import normalize_rows, similarity_matrix, to_unit_interval
+from engines.tokenization import get_token_counter
+from engines.embedding_coalescer import get_embedding_coalescer
+from engines.embedding_cache import EmbeddingCache, get_embedding_cache, make_cache_key
+from core.utils import normalize_text
 
 
 class EmbeddingGenerator:
     """Generate embeddings for test cases"""
     
-    def __init__(self):
-        """Initialize Azure OpenAI client"""
-        self.client = AzureOpenAI(
-            api_key=Config.AZURE_OPENAI_API_KEY,
-            api_version=Config.AZURE_OPENAI_API_VERSION,
-            azure_endpoint=Config.AZURE_OPENAI_ENDPOINT
-        )
-        self.deployment = Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
-        self.cache: Dict[str, List[float]] = {}
+    def __init__(
+        self,
+        cache: Optional[EmbeddingCache] = None,
+        provider: Optional[EmbeddingProvider] = None
+    ):
+        """
+        Initialize embedding provider
+        
+        Args:
+            cache: Embedding cache to use (defaults to the process-wide shared cache)
+            provider: Embedding backend (defaults to Config.EMBEDDING_PROVIDER)
+        """
+        self.provider = provider if provider is not None else get_embedding_provider()
+        self.deployment = self.provider.model_id
+        self.cache = cache if cache is not None else get_embedding_cache()
+        self.token_counter = get_token_counter()
+        self.max_tokens = Config.EMBEDDING_MAX_INPUT_TOKENS
+        self.chunk_oversize = Config.EMBEDDING_CHUNK_OVERSIZE
+        
+        # Part of every cache key: truncated and chunked inputs embed differently
+        self.truncation = f"chunked:{self.max_tokens}" if self.chunk_oversize else f"tokens:{self.max_tokens}"
+        
+        # Group concurrent single-text requests (of every generator) into one batched call
+        self.coalescer = get_embedding_coalescer() if Config.EMBEDDING_COALESCE_WINDOW_MS > 0 else None
+    
+    def _prepare_text(self, text: str) -> str:
+        """Normalize text and, unless chunking is enabled, truncate it to the token limit"""
+        prepared = normalize_text(text)
+        if not self.chunk_oversize:
+            prepared = self.token_counter.truncate(prepared, self.max_tokens)
+        return prepared
+    
+    def _cache_key(self, prepared_text: str) -> str:
+        """Build the content-addressed cache key for prepared text"""
+        return make_cache_key(prepared_text, self.deployment, self.truncation)
+    
+    def _embed_uncached(self, texts: List[str], bulk: bool = True) -> np.ndarray:
+        """
+        Embed prepared texts through the provider
+        
+        Oversize texts (only possible when chunking is enabled) are split into
+        token-limited chunks; all chunks are embedded together and each text's
+        vector is the token-weighted mean of its chunks, renormalized.
+        
+        Args:
+            texts: Prepared, uncached texts
+            bulk: Use the provider's bulk path (sequential packed requests otherwise)
+            
+        Returns:
+            Float32 matrix of shape (len(texts), dim)
+        """
+        chunks_per_text = [
+            self.token_counter.split(t, self.max_tokens) if self.chunk_oversize else [t]
+            for t in texts
+        ]
+        flat_chunks = [chunk for chunks in chunks_per_text for chunk in chunks]
+        
+        if bulk:
+            chunk_vectors = self.provider.embed_many(flat_chunks)
+        else:
+            chunk_vectors = self.provider.embed_packed(flat_chunks)
+        
+        if len(flat_chunks) == len(texts):
+            return chunk_vectors
+        
+        pooled = np.empty((len(texts), chunk_vectors.shape[1]), dtype=np.float32)
+        offset = 0
+        for i, chunks in enumerate(chunks_per_text):
+            weights = np.asarray([self.token_counter.count(c) for c in chunks], dtype=np.float32)
+            vectors = chunk_vectors[offset:offset + len(chunks)]
+            pooled[i] = weights @ vectors / weights.sum()
+            offset += len(chunks)
+        
+        return normalize_rows(pooled)
     
     def generate_embedding(self, text: str) -> List[float]:
         """
@@ -37,22 +106,27 @@ class EmbeddingGenerator:
         Returns:
             List of floats representing the embedding
         """
-        # Create hash for cache key to handle long texts
-        text_hash = hashlib.md5(text.encode()).hexdigest()
+        prepared = self._prepare_text(text)
+        cache_key = self._cache_key(prepared)
         
         # Check cache
-        if text_hash in self.cache:
-            return self.cache[text_hash]
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            response = self.client.embeddings.create(
-                input=text[:8000],  # Truncate to avoid token limits
-                model=self.deployment
-            )
-            embedding = response.data[0].embedding
+            if self.coalescer is not None:
+                # Generators of the same model and truncation embed interchangeably
+                embedding = self.coalescer.embed(
+                    prepared,
+                    lambda texts: self._embed_uncached(texts, bulk=False),
+                    key=(self.deployment, self.truncation)
+                ).tolist()
+            else:
+                embedding = self._embed_uncached([prepared], bulk=False)[0].tolist()
             
             # Cache the result
-            self.cache[text_hash] = embedding
+            self.cache.set(cache_key, embedding)
             return embedding
             
         except Exception as e:
@@ -63,42 +137,53 @@ class EmbeddingGenerator:
         """
         Generate embeddings for multiple texts
         
+        Uses the same normalization, truncation and cache keys as
+        generate_embedding, so either path warms the cache for the other.
+        
         Args:
             texts: List of texts to embed
             
         Returns:
             List of embeddings
         """
-        embeddings = []
+        return self.generate_embeddings_matrix(texts).tolist()
+    
+    def generate_embeddings_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts as a float32 matrix
         
-        # Process in batches to avoid rate limits
-        batch_size = 16
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            
-            # Check which texts  are not in cache
-            uncached_texts = [t for t in batch if t not in self.cache]
+        Cached texts are served from the shared cache; the remaining unique
+        texts go to the provider's bulk path, packed into requests by token
+        count (for Azure, the asynchronous pipeline dispatching batches under
+        the configured RPM/TPM budgets).
+        
+        Args:
+            texts: List of texts to embed
             
-            if uncached_texts:
-                try:
-                    response = self.client.embeddings.create(
-                        input=uncached_texts,
-                        model=self.deployment
-                    )
-                    
-                    # Cache results
-                    for j, text in enumerate(uncached_texts):
-                        self.cache[text] = response.data[j].embedding
-                        
-                except Exception as e:
-                    print(f"Error generating batch embeddings: {e}")
-                    raise
+        Returns:
+            Contiguous float32 matrix of shape (len(texts), dim)
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        
+        prepared = [self._prepare_text(t) for t in texts]
+        keys = {t: self._cache_key(t) for t in prepared}
+        
+        # Check which texts are not in cache
+        vectors = {t: self.cache.get(key) for t, key in keys.items()}
+        uncached_texts = [t for t, e in vectors.items() if e is None]
+        
+        if uncached_texts:
+            fresh = self._embed_uncached(uncached_texts)
             
-            # Get all embeddings (from cache or newly generated)
-            batch_embeddings = [self.cache[t] for t in batch]
-            embeddings.extend(batch_embeddings)
+            # Cache results
+            for text, embedding in zip(uncached_texts, fresh):
+                vectors[text] = embedding
+                self.cache.set(keys[text], embedding.tolist())
         
-        return embeddings
+        return np.ascontiguousarray(
+            np.stack([np.asarray(vectors[t], dtype=np.float32) for t in prepared])
+        )
     
     def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """
@@ -127,6 +212,28 @@ class EmbeddingGenerator:
         # Normalize to 0-1 range (cosine similarity is -1 to 1)
         return (similarity + 1) / 2
     
+    def calculate_similarity_matrix(self, embeddings1, embeddings2) -> np.ndarray:
+        """
+        Calculate pairwise similarity between two sets of embeddings
+        
+        Vectorized counterpart of calculate_similarity: both sets are
+        normalized once and compared in a single matrix product.
+        
+        Args:
+            embeddings1: (N x D) embeddings
+            embeddings2: (M x D) embeddings
+            
+        Returns:
+            (N x M) float32 matrix of similarity scores between 0 and 1
+        """
+        return to_unit_interval(
+            similarity_matrix(embeddings1, embeddings2, normalized=False)
+        )
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache hit/miss counters"""
+        return self.cache.stats()
+    
     def clear_cache(self):
         """Clear the embedding cache"""
         self.cache.clear()
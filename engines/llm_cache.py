@@ -0,0 +1,314 @@
+"""
+Persistent chat completion cache keyed by prompt fingerprint
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+
+
+def make_prompt_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: Optional[int]
+) -> str:
+    """
+    Build a content-addressed cache key for a chat request
+    
+    Args:
+        model: Chat deployment/model name
+        messages: Chat messages (system and user prompts)
+        temperature: Sampling temperature
+        max_tokens: Completion token limit
+    
+    Returns:
+        Hex digest identifying the request
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{model}\x00{temperature}\x00{max_tokens}\x00".encode())
+    digest.update(json.dumps(messages, sort_keys=True, ensure_ascii=False).encode())
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Disk-backed cache of chat completion texts with TTL and LRU eviction
+    
+    Responses are stored in SQLite so repeated runs (CI, UI refreshes,
+    re-processing the same requirement) skip the LLM entirely. Entries older
+    than the TTL are ignored and removed; the database is kept under a byte
+    budget by evicting the least recently used rows.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[int] = None
+    ):
+        """
+        Initialize the cache
+        
+        Args:
+            path: SQLite file path (":memory:" for a non-persistent cache)
+            max_bytes: Byte budget for stored responses (defaults to Config.LLM_CACHE_MAX_BYTES)
+            ttl_seconds: Entry lifetime, 0 = no expiry (defaults to Config.LLM_CACHE_TTL_SECONDS)
+        """
+        self.path = path or Config.LLM_CACHE_PATH
+        self.max_bytes = max_bytes if max_bytes is not None else Config.LLM_CACHE_MAX_BYTES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.LLM_CACHE_TTL_SECONDS
+        
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        
+        if self.path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                nbytes INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_created ON responses(created)"
+        )
+        self._conn.commit()
+        
+        row = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM responses").fetchone()
+        self._total_bytes = int(row[0])
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Response text or None if not cached (or expired)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, nbytes, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            now = time.time()
+            if self.ttl_seconds and now - row[2] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= row[1]
+                self.misses += 1
+                return None
+            
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+    
+    def set(self, key: str, content: str):
+        """
+        Store a response
+        
+        Args:
+            key: Cache key
+            content: Response text
+        """
+        nbytes = len(content.encode())
+        now = time.time()
+        
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT nbytes FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, nbytes, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, content, nbytes, now, now)
+            )
+            self._total_bytes += nbytes - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+    
+    def delete(self, key: str):
+        """
+        Remove a response
+        
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT nbytes FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return
+            
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+            self._total_bytes -= row[0]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        
+        Returns:
+            Dictionary with hits, misses, hit rate, entry count and stored bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self),
+                "bytes": self._total_bytes
+            }
+    
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total_bytes = 0
+    
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    def _evict(self):
+        """Drop expired rows, then least recently used rows until the byte budget is met"""
+        if self.ttl_seconds:
+            cutoff = time.time() - self.ttl_seconds
+            expired = self._conn.execute(
+                "SELECT COALESCE(SUM(nbytes), 0) FROM responses WHERE created < ?", (cutoff,)
+            ).fetchone()[0]
+            if expired:
+                self._conn.execute("DELETE FROM responses WHERE created < ?", (cutoff,))
+                self._total_bytes -= int(expired)
+        
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, nbytes FROM responses ORDER BY last_access ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            
+            for key, nbytes in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= nbytes
+
+
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide response cache
+    
+    Returns:
+        Shared LLMResponseCache instance, or None if Config.LLM_CACHE_ENABLED is off
+    """
+    global _shared_cache
+    
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache()
+        return _shared_cache
+
+
+def cached_chat_completion(
+    client,
+    cache: Optional[LLMResponseCache],
+    validate: Optional[Callable[[str], bool]] = None,
+    **request
+):
+    """
+    Chat completion that is served from the cache when possible
+    
+    Only requests at or below Config.LLM_CACHE_MAX_TEMPERATURE are cached
+    (comparison and extraction calls by default); generation and merge calls
+    always reach the model. Truncated and empty responses are not stored,
+    nor are responses the caller cannot use: a cached entry that fails
+    validation is removed and the request is sent again.
+    
+    Args:
+        client: Azure OpenAI client
+        cache: Response cache (None disables caching)
+        validate: Check run on the response text before it is stored or
+            served from the cache (False or an exception rejects it)
+        **request: Arguments of client.chat.completions.create
+    
+    Returns:
+        The API response, or an object with the same choices[0] shape on a hit
+    """
+    cacheable = cache is not None and request.get("temperature", 1.0) <= Config.LLM_CACHE_MAX_TEMPERATURE
+    if cacheable:
+        key = make_prompt_key(
+            request["model"],
+            request["messages"],
+            request.get("temperature", 1.0),
+            request.get("max_tokens")
+        )
+        content = cache.get(key)
+        if content is not None:
+            if _is_valid(content, validate):
+                message = SimpleNamespace(content=content)
+                return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")])
+            cache.delete(key)
+    
+    response = client.chat.completions.create(**request)
+    
+    if cacheable:
+        choice = response.choices[0]
+        content = choice.message.content
+        if content and getattr(choice, "finish_reason", "stop") != "length" and _is_valid(content, validate):
+            cache.set(key, content)
+    return response
+
+
+def _is_valid(content: str, validate: Optional[Callable[[str], bool]]) -> bool:
+    """Run the caller's check on a response text (no check accepts everything)"""
+    if validate is None:
+        return True
+    try:
+        return bool(validate(content))
+    except Exception:
+        return False
@@ -0,0 +1,253 @@
+"""
+Deterministic near-duplicate detection (content hash, SimHash, MinHash)
+
+Used to settle obvious SAME / NEW pairs without calling the LLM.
+"""
+import os
+import re
+import sys
+import hashlib
+import numpy as np
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from core.models import TestCase, ComparisonResult, DecisionType
+from core.utils import compute_content_hash
+from engines.similarity import retrieval_to_unit_interval
+
+
+# Comparison operators and signs are kept: "> 1000" and "< 1000" test opposite behaviour
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[<>=!-]+")
+
+# Mersenne prime for the MinHash permutations (a * x + b) mod p
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric and operator tokens (other punctuation and formatting are ignored)"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def condition_tokens(text: str) -> List[str]:
+    """Operator, sign and number tokens in order (a change in any of them changes the expected behaviour)"""
+    return [token for token in tokenize(text) if not token.isalpha()]
+
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """
+    Word n-grams of a text
+    
+    Args:
+        text: Input text
+        size: Words per shingle
+    
+    Returns:
+        List of shingles (the whole text as one shingle if it is shorter)
+    """
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return [" ".join(tokens)] if tokens else []
+    return [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+
+
+def _hash64(value: str) -> int:
+    """Stable 64-bit hash (Python's hash() is salted per process)"""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash over word tokens
+    
+    Texts differing in a few words have fingerprints a few bits apart.
+    
+    Args:
+        text: Input text
+    
+    Returns:
+        Fingerprint as an int
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return 0
+    
+    hashes = np.array([_hash64(token) for token in tokens], dtype=np.uint64)
+    bits = (hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    votes = bits.astype(np.int64).sum(axis=0) * 2 - len(tokens)
+    
+    fingerprint = 0
+    for bit in np.flatnonzero(votes > 0):
+        fingerprint |= 1 << int(bit)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count("1")
+
+
+class MinHasher:
+    """MinHash signatures estimating the Jaccard similarity of shingle sets"""
+    
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        """
+        Initialize the hash family
+        
+        Args:
+            num_perm: Signature length (more = lower estimation error)
+            shingle_size: Words per shingle
+            seed: Seed of the permutation coefficients
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    
+    def signature(self, text: str) -> np.ndarray:
+        """
+        MinHash signature of a text
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            (num_perm,) uint64 signature (all max values for empty text)
+        """
+        values = np.array(
+            [_hash64(shingle) & int(_MERSENNE_PRIME) for shingle in set(shingles(text, self.shingle_size))],
+            dtype=np.uint64
+        )
+        if len(values) == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        
+        # Products wrap modulo 2**64 before the reduction; still a valid hash family
+        permuted = (values[:, None] * self._a + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+    
+    @staticmethod
+    def jaccard(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.mean(signature_a == signature_b))
+
+
+_default_hasher: Optional[MinHasher] = None
+
+
+def get_min_hasher() -> MinHasher:
+    """Shared MinHasher (signatures are only comparable within one hash family)"""
+    global _default_hasher
+    if _default_hasher is None:
+        _default_hasher = MinHasher()
+    return _default_hasher
+
+
+def fast_path_bands() -> Tuple[float, float]:
+    """
+    Similarity bands of the fast path on the [0, 1] decision scale
+    
+    Pairs only reach a comparison once their retrieval score passes
+    Config.THRESHOLD_ADDON_MIN, so both bands are margins above that gate
+    on the retrieval scale.
+    
+    Returns:
+        Tuple of (NEW upper bound, SAME lower bound)
+    """
+    gate = Config.THRESHOLD_ADDON_MIN
+    return (
+        retrieval_to_unit_interval(min(gate + Config.NEAR_DUPLICATE_NEW_MARGIN, 1.0)),
+        retrieval_to_unit_interval(min(gate + Config.NEAR_DUPLICATE_SAME_MARGIN, 1.0))
+    )
+
+
+def classify_near_duplicate(
+    new_test_case: TestCase,
+    existing_test_case: TestCase,
+    semantic_similarity: Optional[float] = None
+) -> Optional[ComparisonResult]:
+    """
+    Settle obvious pairs without the LLM
+    
+    - SAME: identical text apart from whitespace, or SimHash fingerprints
+      within Config.NEAR_DUPLICATE_MAX_HAMMING bits, the same business rule,
+      the same operators, signs and numbers and an embedding similarity in
+      the SAME band of fast_path_bands()
+    - NEW: different business rule, embedding similarity below the NEW band
+      of fast_path_bands() and estimated word-shingle Jaccard below
+      Config.NEAR_DUPLICATE_NEW_MAX_JACCARD
+    
+    Args:
+        new_test_case: New test case
+        existing_test_case: Existing test case
+        semantic_similarity: Embedding similarity of the pair on the [0, 1]
+            scale, if known
+    
+    Returns:
+        ComparisonResult, or None when the pair needs a full comparison
+    """
+    new_text = new_test_case.to_text()
+    existing_text = existing_test_case.to_text()
+    same_rule = compute_content_hash(new_test_case.business_rule) == compute_content_hash(existing_test_case.business_rule)
+    
+    if compute_content_hash(new_text) == compute_content_hash(existing_text):
+        return _result(
+            new_test_case, existing_test_case, DecisionType.SAME, 1.0,
+            "Identical to the existing test case apart from whitespace.",
+            rule_match=True, confidence=1.0
+        )
+    
+    if semantic_similarity is None:
+        return None
+    
+    new_max_similarity, same_min_similarity = fast_path_bands()
+    distance = hamming_distance(simhash(new_text), simhash(existing_text))
+    if (
+        distance <= Config.NEAR_DUPLICATE_MAX_HAMMING
+        and semantic_similarity >= same_min_similarity
+        and same_rule
+        and condition_tokens(new_text) == condition_tokens(existing_text)
+    ):
+        return _result(
+            new_test_case, existing_test_case, DecisionType.SAME, semantic_similarity,
+            f"Near-duplicate of the existing test case (fingerprints {distance} bits apart, "
+            f"semantic similarity {semantic_similarity:.2%}).",
+            rule_match=True, confidence=0.95
+        )
+    
+    if semantic_similarity < new_max_similarity:
+        hasher = get_min_hasher()
+        jaccard = MinHasher.jaccard(hasher.signature(new_text), hasher.signature(existing_text))
+        if jaccard < Config.NEAR_DUPLICATE_NEW_MAX_JACCARD and not same_rule:
+            return _result(
+                new_test_case, existing_test_case, DecisionType.NEW, semantic_similarity,
+                f"Different test: low semantic similarity ({semantic_similarity:.2%}) and little shared "
+                f"wording ({jaccard:.0%}) with the closest existing case.",
+                rule_match=False, confidence=0.85
+            )
+    
+    return None
+
+
+def _result(
+    new_test_case: TestCase,
+    existing_test_case: TestCase,
+    decision: DecisionType,
+    similarity: float,
+    reasoning: str,
+    rule_match: bool,
+    confidence: float
+) -> ComparisonResult:
+    """Build the ComparisonResult of a fast-path decision"""
+    return ComparisonResult(
+        new_test_case_id=new_test_case.id,
+        existing_test_case_id=existing_test_case.id,
+        similarity_score=similarity,
+        decision=decision,
+        reasoning=reasoning,
+        business_rule_match=rule_match,
+        behavior_match=decision == DecisionType.SAME,
+        coverage_expansion=[],
+        confidence_score=confidence
+    )
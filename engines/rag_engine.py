@@ -1,56 +1,68 @@
 """
-RAG Engine for test case retrieval using ChromaDB
+RAG Engine for test case retrieval using ChromaDB or an in-process vector index
 """
 import os
 import sys
 import json
-from typing import List, Dict, Any, Optional
+import numpy as np
+import threading
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import chromadb
-from chromadb.config import Settings
 from core.models import TestCase
 from engines.embeddings import EmbeddingGenerator
+from engines.similarity import normalize_rows
+from engines.bm25 import BM25Index, reciprocal_rank_fusion
+from engines.vector_store import VectorStore, get_vector_store, build_where, tag_key
+from core.utils import compute_content_hash, calculate_text_similarity
 from config.config import Config
 
 
 class RAGEngine:
     """RAG engine for test case storage and retrieval"""
     
-    def __init__(self):
-        """Initialize ChromaDB and embedding generator"""
-        self.embedding_generator = EmbeddingGenerator()
-        
-        # Initialize ChromaDB with persistence
-        self.client = chromadb.PersistentClient(
-            path=Config.CHROMA_PERSIST_DIRECTORY,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-            )
-        )
-        
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name=Config.CHROMA_COLLECTION_NAME,
-            metadata={"description": "Test case knowledge base"}
-        )
+    RETRIEVAL_MODES = ("vector", "hybrid", "lexical")
+    HYBRID_POOL_FACTOR = 3
     
-    def add_test_case(self, test_case: TestCase):
+    def __init__(
+        self,
+        embedding_generator: Optional[EmbeddingGenerator] = None,
+        vector_store: Optional[VectorStore] = None
+    ):
         """
-        Add a test case to the knowledge base
+        Initialize vector store and embedding generator
         
         Args:
-            test_case: TestCase to add
+            embedding_generator: Embedding generator to use (a default one is created if omitted)
+            vector_store: Vector store to use (defaults to the Config.VECTOR_STORE_BACKEND backend)
         """
-        # Convert test case to searchable text
-        text = test_case.to_text()
+        self.embedding_generator = embedding_generator or EmbeddingGenerator()
+        
+        # Chroma-compatible store (ChromaDB collection or in-process index)
+        self.collection = vector_store or get_vector_store()
+        
+        # BM25 index for hybrid/lexical retrieval, built on first use
+        self._lexical: Optional[BM25Index] = None
+        self._lexical_lock = threading.Lock()
+    
+    def _build_metadata(
+        self,
+        test_case: TestCase,
+        text: str,
+        suite_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the stored metadata for a test case
         
-        # Generate embedding
-        embedding = self.embedding_generator.generate_embedding(text)
+        Args:
+            test_case: TestCase being stored
+            text: Embedded text of the test case
+            suite_name: Suite the case belongs to (used by filtered searches)
         
-        # Prepare metadata
+        Returns:
+            Metadata dictionary
+        """
         metadata = {
             "id": test_case.id,
             "title": test_case.title,
@@ -60,23 +72,61 @@ class RAGEngine:
             "tags": ",".join(test_case.tags),
             "version": test_case.version,
             "created_at": str(test_case.created_at),
-            "updated_at": str(test_case.updated_at)
+            "updated_at": str(test_case.updated_at),
+            "content_hash": compute_content_hash(text),
+            "is_regression": test_case.is_regression,
+            # Full case as compact JSON, so hits need no reconstruction
+            "payload": test_case.model_dump_json()
         }
         
+        if suite_name:
+            metadata["suite_name"] = suite_name
+        for tag in test_case.tags:
+            metadata[tag_key(tag)] = True
+        
+        return metadata
+    
+    def add_test_case(self, test_case: TestCase, suite_name: Optional[str] = None):
+        """
+        Add a test case to the knowledge base
+        
+        Args:
+            test_case: TestCase to add
+            suite_name: Suite the case belongs to
+        """
+        # Convert test case to searchable text
+        text = test_case.to_text()
+        
+        # Generate embedding (stored as unit-length float32)
+        embedding = normalize_rows(self.embedding_generator.generate_embedding(text))
+        
+        metadata = self._build_metadata(test_case, text, suite_name)
+        
         # Add to collection
         self.collection.add(
             ids=[test_case.id],
-            embeddings=[embedding],
+            embeddings=embedding,  # type: ignore
             documents=[text],
             metadatas=[metadata]
         )
+        self._index_lexical([test_case.id], [text], [metadata])
     
-    def add_test_cases_batch(self, test_cases: List[TestCase]):
+    def add_test_cases_batch(
+        self,
+        test_cases: List[TestCase],
+        embeddings: Optional[List[Optional[Any]]] = None,
+        suite_name: Optional[str] = None,
+        upsert: bool = False
+    ):
         """
         Add multiple test cases to the knowledge base
         
         Args:
             test_cases: List of TestCases to add
+            embeddings: Optional precomputed vectors aligned with test_cases
+                (None entries are embedded as usual)
+            suite_name: Suite the cases belong to
+            upsert: Replace records that already exist instead of skipping them
         """
         if not test_cases:
             return
@@ -84,86 +134,359 @@ class RAGEngine:
         # Convert all test cases to text
         texts = [tc.to_text() for tc in test_cases]
         
-        # Generate embeddings in batch
-        embeddings = self.embedding_generator.generate_embeddings_batch(texts)
+        precomputed = embeddings or [None] * len(test_cases)
+        missing = [i for i, vector in enumerate(precomputed) if vector is None]
+        
+        # Generate embeddings in batch (concurrent, deduplicated, float32 matrix)
+        fresh = {}
+        if missing:
+            generated = self.embedding_generator.generate_embeddings_matrix([texts[i] for i in missing])
+            fresh = dict(zip(missing, generated))
+        
+        embeddings = normalize_rows(np.stack([
+            fresh[i] if vector is None else np.asarray(vector, dtype=np.float32)
+            for i, vector in enumerate(precomputed)
+        ]))
         
         # Prepare data
         ids = [tc.id for tc in test_cases]
-        metadatas = []
-        
-        for tc in test_cases:
-            metadata = {
-                "id": tc.id,
-                "title": tc.title,
-                "business_rule": tc.business_rule,
-                "priority": tc.priority,
-                "test_type": tc.test_type,
-                "tags": ",".join(tc.tags),
-                "version": tc.version,
-                "created_at": str(tc.created_at),
-                "updated_at": str(tc.updated_at)
-            }
-            metadatas.append(metadata)
+        metadatas = [self._build_metadata(tc, text, suite_name) for tc, text in zip(test_cases, texts)]
         
         # Add to collection
-        self.collection.add(
+        write = self.collection.upsert if upsert else self.collection.add
+        write(
             ids=ids,
             embeddings=embeddings,  # type: ignore
             documents=texts,
             metadatas=metadatas
         )
+        self._index_lexical(ids, texts, metadatas)
     
     def search_similar_test_cases(
         self, 
         test_case: TestCase, 
-        top_k: Optional[int] = None
+        top_k: Optional[int] = None,
+        suite_name: Optional[str] = None,
+        priorities: Optional[List[str]] = None,
+        test_types: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        is_regression: Optional[bool] = None,
+        mode: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for similar test cases
         
+        Filters are applied by the vector store, so only matching cases are
+        ranked.
+        
         Args:
             test_case: TestCase to search for
             top_k: Number of results to return (defaults to Config.RAG_TOP_K)
-            
+            suite_name: Only search this suite
+            priorities: Only cases with one of these priorities
+            test_types: Only cases of these test types
+            tags: Only cases with at least one of these tags
+            is_regression: Only regression (True) or non-regression (False) cases
+            mode: "vector", "hybrid" or "lexical" (defaults to Config.RAG_RETRIEVAL_MODE)
+        
         Returns:
             List of similar test cases with similarity scores
         """
-        # Use config default if not specified
+        filters = build_where(suite_name, priorities, test_types, tags, is_regression)
+        
+        return self._search(
+            [test_case],
+            lambda texts: normalize_rows(self.embedding_generator.generate_embedding(texts[0])),
+            top_k,
+            [(filters, [0])],
+            mode
+        )[0]
+    
+    def search_similar_batch(
+        self,
+        test_cases: List[TestCase],
+        top_k: Optional[int] = None,
+        suite_name: Optional[str] = None,
+        priorities: Optional[List[str]] = None,
+        test_types: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        is_regression: Optional[bool] = None,
+        match_test_type: bool = False,
+        mode: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar test cases for several queries at once
+        
+        All queries are embedded in one batch and sent to the collection in
+        a single query call (one call per test type with match_test_type).
+        
+        Args:
+            test_cases: TestCases to search for
+            top_k: Number of results per test case (defaults to Config.RAG_TOP_K)
+            suite_name: Only search this suite
+            priorities: Only cases with one of these priorities
+            test_types: Only cases of these test types
+            tags: Only cases with at least one of these tags
+            is_regression: Only regression (True) or non-regression (False) cases
+            match_test_type: Only compare each case with cases of its own test type
+            mode: "vector", "hybrid" or "lexical" (defaults to Config.RAG_RETRIEVAL_MODE)
+        
+        Returns:
+            One list of similar test cases per input, in input order
+        """
+        # Group queries that share a filter
+        groups: Dict[Optional[str], List[int]] = {}
+        for i, tc in enumerate(test_cases):
+            groups.setdefault(tc.test_type if match_test_type else None, []).append(i)
+        
+        filter_groups = [
+            (
+                build_where(
+                    suite_name,
+                    priorities,
+                    [test_type] if test_type is not None else test_types,
+                    tags,
+                    is_regression
+                ),
+                indices
+            )
+            for test_type, indices in groups.items()
+        ]
+        
+        return self._search(
+            test_cases,
+            lambda texts: normalize_rows(self.embedding_generator.generate_embeddings_matrix(texts)),
+            top_k,
+            filter_groups,
+            mode
+        )
+    
+    def _search(
+        self,
+        test_cases: List[TestCase],
+        embed: Callable[[List[str]], np.ndarray],
+        top_k: Optional[int],
+        filter_groups: List[Tuple[Optional[Dict[str, Any]], List[int]]],
+        mode: Optional[str]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run vector, hybrid or lexical retrieval for a list of queries
+        
+        If embedding the queries fails, the lexical index answers instead so
+        retrieval keeps working while the embedding service is unavailable.
+        
+        Args:
+            test_cases: TestCases to search for
+            embed: Function returning unit-length query vectors for texts
+            top_k: Number of results per query (defaults to Config.RAG_TOP_K)
+            filter_groups: (where clause, query indices) pairs
+            mode: Retrieval mode (defaults to Config.RAG_RETRIEVAL_MODE)
+        
+        Returns:
+            One list of similar test cases per input, in input order
+        """
         if top_k is None:
             top_k = Config.RAG_TOP_K
+        mode = (mode or Config.RAG_RETRIEVAL_MODE).lower()
+        if mode not in self.RETRIEVAL_MODES:
+            raise ValueError(f"Unsupported retrieval mode: {mode}")
+        
+        if not test_cases:
+            return []
         
         # Check if collection is empty
-        collection_count = self.collection.count()
+        collection_count = self.count()
         if collection_count == 0:
-            return []  # No test cases in knowledge base yet
+            return [[] for _ in test_cases]  # No test cases in knowledge base yet
         
-        # Convert to text and generate embedding
-        text = test_case.to_text()
-        embedding = self.embedding_generator.generate_embedding(text)
+        texts = [tc.to_text() for tc in test_cases]
         
-        # Query the collection with safe n_results
-        n_results = min(top_k, collection_count)
+        embeddings = None
+        if mode != "lexical":
+            try:
+                embeddings = embed(texts)
+            except Exception as e:
+                print(f"Warning: Embedding failed, falling back to lexical retrieval: {e}")
+                mode = "lexical"
         
-        results = self.collection.query(
-            query_embeddings=[embedding],
-            n_results=n_results
-        )
+        # Hybrid mode fuses deeper candidate lists than it returns
+        pool = top_k * self.HYBRID_POOL_FACTOR if mode == "hybrid" else top_k
+        similar: List[List[Dict[str, Any]]] = [[] for _ in test_cases]
+        
+        for where, indices in filter_groups:
+            if mode == "lexical":
+                for i in indices:
+                    similar[i] = self._lexical_search(texts[i], top_k, where)
+                continue
+            
+            # Query the collection with safe n_results
+            results = self.collection.query(
+                query_embeddings=embeddings[indices],  # type: ignore
+                n_results=min(pool, collection_count),
+                where=where
+            )
+            
+            for row, i in enumerate(indices):
+                hits = self._format_query_results(results, row)
+                if mode == "hybrid":
+                    hits = self._fuse(hits, self.lexical_index.search(texts[i], pool, where), embeddings[i], top_k)
+                similar[i] = hits
+        
+        return similar
+    
+    def _fuse(
+        self,
+        vector_hits: List[Dict[str, Any]],
+        lexical_ranking: List[Tuple[str, float]],
+        query_embedding: np.ndarray,
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge vector and BM25 rankings with reciprocal rank fusion
+        
+        Hits keep their vector similarity (so decision thresholds still
+        apply); cases found only lexically are scored against the query vector.
+        
+        Args:
+            vector_hits: Formatted vector hits, best first
+            lexical_ranking: (id, BM25 score) pairs, best first
+            query_embedding: Unit-length query vector
+            top_k: Number of results
+        
+        Returns:
+            Fused hits, best first, with an added "rrf_score"
+        """
+        fused = reciprocal_rank_fusion(
+            [[hit["id"] for hit in vector_hits], [doc_id for doc_id, _ in lexical_ranking]],
+            k=Config.RAG_RRF_K
+        )[:top_k]
+        
+        hits_by_id = {hit["id"]: hit for hit in vector_hits}
+        missing = [doc_id for doc_id, _ in fused if doc_id not in hits_by_id]
+        if missing:
+            stored = self.collection.get(
+                ids=missing,
+                include=["documents", "metadatas", "embeddings"]  # type: ignore
+            )
+            for j, doc_id in enumerate(stored['ids']):
+                vector = np.asarray(stored['embeddings'][j], dtype=np.float32)
+                hits_by_id[doc_id] = {
+                    "id": doc_id,
+                    "document": stored['documents'][j],
+                    "metadata": stored['metadatas'][j],
+                    # Same scale as vector hits: 1 - squared L2 distance
+                    "similarity": 1 - float(np.sum((query_embedding - vector) ** 2))
+                }
+        
+        return [
+            dict(hits_by_id[doc_id], rrf_score=score)
+            for doc_id, score in fused
+            if doc_id in hits_by_id
+        ]
+    
+    def _lexical_search(self, text: str, top_k: int, where: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        BM25-only retrieval (no embedding call)
         
-        # Format results
+        Similarity is the Jaccard word overlap with the stored text, for
+        display only: neither it nor BM25 is on the vector scale the decision
+        thresholds use, so hits are marked "retrieval": "lexical" and left
+        for review by TestCaseManager.
+        
+        Args:
+            text: Query text
+            top_k: Number of results
+            where: Metadata filter
+        
+        Returns:
+            Hits in BM25 order
+        """
+        ranking = self.lexical_index.search(text, top_k, where)
+        if not ranking:
+            return []
+        
+        stored = self.collection.get(ids=[doc_id for doc_id, _ in ranking])
+        records = {
+            doc_id: (stored['documents'][j], stored['metadatas'][j])
+            for j, doc_id in enumerate(stored['ids'])
+        }
+        
+        return [
+            {
+                "id": doc_id,
+                "document": records[doc_id][0],
+                "metadata": records[doc_id][1],
+                "similarity": calculate_text_similarity(text, records[doc_id][0]),
+                "bm25_score": score,
+                "retrieval": "lexical"
+            }
+            for doc_id, score in ranking
+            if doc_id in records
+        ]
+    
+    @property
+    def lexical_index(self) -> BM25Index:
+        """BM25 index over the stored documents, built from the vector store on first use"""
+        with self._lexical_lock:
+            if self._lexical is None:
+                index = BM25Index()
+                stored = self.collection.get()
+                for j, doc_id in enumerate(stored['ids']):
+                    index.add(doc_id, stored['documents'][j] or "", stored['metadatas'][j])
+                self._lexical = index
+            return self._lexical
+    
+    def _index_lexical(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]):
+        """Keep the BM25 index (if built) in sync after a write"""
+        if self._lexical is not None:
+            for doc_id, document, metadata in zip(ids, documents, metadatas):
+                self._lexical.add(doc_id, document, metadata)
+    
+    def _format_query_results(self, results: Dict[str, Any], row: int) -> List[Dict[str, Any]]:
+        """
+        Convert one query row of a collection.query result into hit dictionaries
+        
+        Args:
+            results: Result of collection.query
+            row: Index of the query
+        
+        Returns:
+            List of similar test cases with similarity scores
+        """
         similar_cases = []
         
-        if (results['ids'] and len(results['ids'][0]) > 0 and 
+        if (results['ids'] and len(results['ids'][row]) > 0 and 
             results['documents'] and results['metadatas'] and results['distances']):
-            for i in range(len(results['ids'][0])):
+            for i in range(len(results['ids'][row])):
                 similar_cases.append({
-                    "id": results['ids'][0][i],
-                    "document": results['documents'][0][i],
-                    "metadata": results['metadatas'][0][i],
-                    "similarity": 1 - results['distances'][0][i]  # Convert distance to similarity
+                    "id": results['ids'][row][i],
+                    "document": results['documents'][row][i],
+                    "metadata": results['metadatas'][row][i],
+                    "similarity": 1 - results['distances'][row][i]  # Convert distance to similarity
                 })
         
         return similar_cases
     
+    @staticmethod
+    def hit_test_case(hit: Dict[str, Any]) -> Optional[TestCase]:
+        """
+        Full TestCase stored with a search hit
+        
+        Args:
+            hit: Hit returned by a search (or get_test_case_by_id)
+        
+        Returns:
+            TestCase, or None for records stored without a payload
+        """
+        payload = (hit.get("metadata") or {}).get("payload")
+        if not payload:
+            return None
+        try:
+            return TestCase.model_validate_json(payload)
+        except Exception as e:
+            print(f"Warning: Invalid stored payload for {hit.get('id')}: {e}")
+            return None
+    
     def get_test_case_by_id(self, test_case_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a test case by ID
@@ -190,21 +513,127 @@ class RAGEngine:
         except Exception:
             return None
     
-    def update_test_case(self, test_case: TestCase):
+    def get_embeddings(self, test_case_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve stored vectors
+        
+        Args:
+            test_case_ids: IDs of the test cases
+        
+        Returns:
+            Dictionary mapping ID to {"embedding", "content_hash"} for stored cases
+        """
+        if not test_case_ids:
+            return {}
+        
+        results = self.collection.get(
+            ids=test_case_ids,
+            include=["embeddings", "metadatas"]  # type: ignore
+        )
+        
+        stored = {}
+        for i, test_case_id in enumerate(results['ids']):
+            metadata = results['metadatas'][i] or {}
+            stored[test_case_id] = {
+                "embedding": np.asarray(results['embeddings'][i], dtype=np.float32),
+                "content_hash": metadata.get("content_hash")
+            }
+        return stored
+    
+    def update_test_case(self, test_case: TestCase, suite_name: Optional[str] = None):
         """
         Update an existing test case
         
+        The stored vector is reused when only metadata changed (priority,
+        tags, version, ...); the case is re-embedded only when its embedded
+        text differs from what is stored.
+        
         Args:
             test_case: Updated TestCase
+            suite_name: Suite the case belongs to (keeps the stored suite if omitted)
         """
-        # Delete old version
-        try:
-            self.collection.delete(ids=[test_case.id])
-        except Exception:
-            pass
+        text = test_case.to_text()
+        metadata = self._build_metadata(test_case, text, suite_name)
+        
+        existing = self.collection.get(
+            ids=[test_case.id],
+            include=["metadatas", "documents"]  # type: ignore
+        )
         
-        # Add new version
-        self.add_test_case(test_case)
+        if existing['ids'] and existing['metadatas']:
+            stored_metadata = existing['metadatas'][0] or {}
+            self._merge_stored_metadata(metadata, stored_metadata)
+            
+            stored_hash = stored_metadata.get("content_hash")
+            if stored_hash is None and existing['documents']:
+                # Records written before content hashes were stored
+                stored_hash = compute_content_hash(existing['documents'][0] or "")
+            
+            if stored_hash == metadata["content_hash"]:
+                # Text unchanged: keep the stored vector and document
+                self.collection.update(
+                    ids=[test_case.id],
+                    metadatas=[metadata]
+                )
+                if self._lexical is not None:
+                    self._lexical.update_metadata(test_case.id, metadata)
+                return
+        
+        # Text changed (or case not stored yet): re-embed and upsert
+        embedding = normalize_rows(self.embedding_generator.generate_embedding(text))
+        self.collection.upsert(
+            ids=[test_case.id],
+            embeddings=embedding,  # type: ignore
+            documents=[text],
+            metadatas=[metadata]
+        )
+        self._index_lexical([test_case.id], [text], [metadata])
+    
+    def update_metadata_batch(self, test_cases: List[TestCase], suite_name: Optional[str] = None):
+        """
+        Rewrite the stored metadata of several test cases without re-embedding
+        
+        Only use this for cases whose embedded text is unchanged.
+        
+        Args:
+            test_cases: Updated TestCases (already stored)
+            suite_name: Suite the cases belong to (keeps the stored suite if omitted)
+        """
+        if not test_cases:
+            return
+        
+        ids = [tc.id for tc in test_cases]
+        existing = self.collection.get(ids=ids, include=["metadatas"])  # type: ignore
+        stored = dict(zip(existing['ids'], existing['metadatas'] or []))
+        
+        metadatas = []
+        for tc in test_cases:
+            metadata = self._build_metadata(tc, tc.to_text(), suite_name)
+            self._merge_stored_metadata(metadata, stored.get(tc.id) or {})
+            metadatas.append(metadata)
+        
+        self.collection.update(ids=ids, metadatas=metadatas)
+        if self._lexical is not None:
+            for test_case_id, metadata in zip(ids, metadatas):
+                self._lexical.update_metadata(test_case_id, metadata)
+    
+    @staticmethod
+    def _merge_stored_metadata(metadata: Dict[str, Any], stored_metadata: Dict[str, Any]):
+        """
+        Adjust new metadata for a merge into an existing record
+        
+        Metadata updates merge keys, so flags of removed tags are cleared
+        and the stored suite is kept when none is given.
+        
+        Args:
+            metadata: New metadata (modified in place)
+            stored_metadata: Metadata currently stored
+        """
+        for key in stored_metadata:
+            if key.startswith(tag_key("")) and key not in metadata:
+                metadata[key] = False
+        if "suite_name" not in metadata and stored_metadata.get("suite_name"):
+            metadata["suite_name"] = stored_metadata["suite_name"]
     
     def delete_test_case(self, test_case_id: str):
         """
@@ -213,7 +642,22 @@ class RAGEngine:
         Args:
             test_case_id: ID of the test case to delete
         """
-        self.collection.delete(ids=[test_case_id])
+        self.delete_test_cases([test_case_id])
+    
+    def delete_test_cases(self, test_case_ids: List[str]):
+        """
+        Delete several test cases in one call
+        
+        Args:
+            test_case_ids: IDs of the test cases to delete
+        """
+        if not test_case_ids:
+            return
+        
+        self.collection.delete(ids=test_case_ids)
+        if self._lexical is not None:
+            for test_case_id in test_case_ids:
+                self._lexical.remove(test_case_id)
     
     def get_all_test_cases(self) -> List[Dict[str, Any]]:
         """
@@ -236,13 +680,16 @@ class RAGEngine:
         return test_cases
     
     def count(self) -> int:
-        """Get the number of test cases in the knowledge base"""
+        """
+        Get the number of test cases in the knowledge base
+        
+        Not cached: other engines, workers or processes may write to the same
+        store, and a stale 0 would make every search come back empty.
+        Both backends answer this cheaply (a SQL count, or a header read).
+        """
         return self.collection.count()
     
     def reset(self):
         """Reset the knowledge base (delete all test cases)"""
-        self.client.delete_collection(Config.CHROMA_COLLECTION_NAME)
-        self.collection = self.client.create_collection(
-            name=Config.CHROMA_COLLECTION_NAME,
-            metadata={"description": "Test case knowledge base"}
-        )
+        self.collection.reset()
+        self._lexical = None
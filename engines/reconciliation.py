@@ -0,0 +1,151 @@
+"""
+Reconcile the RAG vector store with the knowledge base
+
+The knowledge base (JSON suites) is the source of truth. Records are compared
+by ID and content hash so only cases that actually drifted are re-embedded,
+rewritten or deleted.
+"""
+import os
+import sys
+from typing import List, Dict, Any, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import TestCase
+from core.knowledge_base import KnowledgeBase
+from core.utils import compute_content_hash
+from engines.rag_engine import RAGEngine
+
+
+class StoreReconciler:
+    """Diff and repair the vector store against the knowledge base"""
+    
+    def __init__(self, rag_engine: RAGEngine, knowledge_base: KnowledgeBase, batch_size: int = 256):
+        """
+        Initialize the reconciler
+        
+        Args:
+            rag_engine: RAG engine whose store is repaired
+            knowledge_base: Knowledge base holding the expected test cases
+            batch_size: Test cases embedded and written per call
+        """
+        self.rag_engine = rag_engine
+        self.knowledge_base = knowledge_base
+        self.batch_size = max(1, batch_size)
+    
+    def diff(self) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Compare both stores without changing anything
+        
+        Returns:
+            Dictionary of (test case ID, suite name) lists:
+            'missing' (not in the vector store), 'stale' (embedded text
+            differs), 'metadata' (same text, outdated metadata or payload)
+            and 'orphaned' (only in the vector store; suite is the stored one)
+        """
+        expected: Dict[str, Tuple[str, TestCase]] = {}
+        for suite_name, suite in self.knowledge_base.test_suites.items():
+            for tc in suite.test_cases:
+                expected[tc.id] = (suite_name, tc)
+        
+        stored = self.rag_engine.collection.get(include=["metadatas"])  # type: ignore
+        stored_metadata = {
+            test_case_id: metadata or {}
+            for test_case_id, metadata in zip(stored['ids'], stored['metadatas'] or [])
+        }
+        
+        # Records written before content hashes were stored: hash their documents
+        stored_hashes = {
+            test_case_id: metadata.get("content_hash")
+            for test_case_id, metadata in stored_metadata.items()
+        }
+        unhashed = [test_case_id for test_case_id, content_hash in stored_hashes.items() if not content_hash]
+        if unhashed:
+            documents = self.rag_engine.collection.get(ids=unhashed, include=["documents"])  # type: ignore
+            for test_case_id, document in zip(documents['ids'], documents['documents'] or []):
+                stored_hashes[test_case_id] = compute_content_hash(document or "")
+        
+        report: Dict[str, List[Tuple[str, str]]] = {"missing": [], "stale": [], "metadata": [], "orphaned": []}
+        for test_case_id, (suite_name, tc) in expected.items():
+            metadata = stored_metadata.get(test_case_id)
+            if metadata is None:
+                report["missing"].append((test_case_id, suite_name))
+            elif stored_hashes[test_case_id] != compute_content_hash(tc.to_text()):
+                report["stale"].append((test_case_id, suite_name))
+            elif metadata.get("suite_name") != suite_name or metadata.get("payload") != tc.model_dump_json():
+                report["metadata"].append((test_case_id, suite_name))
+        
+        for test_case_id, metadata in stored_metadata.items():
+            if test_case_id not in expected:
+                report["orphaned"].append((test_case_id, metadata.get("suite_name", "")))
+        
+        return report
+    
+    def reconcile(self, dry_run: bool = False, delete_orphans: bool = True) -> Dict[str, Any]:
+        """
+        Bring the vector store in line with the knowledge base
+        
+        Missing and stale cases are embedded and upserted in batches, cases
+        with only outdated metadata are rewritten without re-embedding, and
+        orphaned records are deleted.
+        
+        Args:
+            dry_run: Only report the differences
+            delete_orphans: Delete records that have no knowledge base case
+        
+        Returns:
+            Dictionary with the diff counts, the affected IDs and any errors
+        """
+        report = self.diff()
+        errors: List[str] = []
+        
+        if not dry_run:
+            for key in ("missing", "stale"):
+                for suite_name, test_cases in self._group_by_suite(report[key]):
+                    for start in range(0, len(test_cases), self.batch_size):
+                        batch = test_cases[start:start + self.batch_size]
+                        try:
+                            self.rag_engine.add_test_cases_batch(batch, suite_name=suite_name, upsert=True)
+                        except Exception as e:
+                            errors.append(f"Failed to embed {len(batch)} {key} cases of suite '{suite_name}': {e}")
+            
+            for suite_name, test_cases in self._group_by_suite(report["metadata"]):
+                for start in range(0, len(test_cases), self.batch_size):
+                    batch = test_cases[start:start + self.batch_size]
+                    try:
+                        self.rag_engine.update_metadata_batch(batch, suite_name=suite_name)
+                    except Exception as e:
+                        errors.append(f"Failed to update metadata of {len(batch)} cases of suite '{suite_name}': {e}")
+            
+            if delete_orphans and report["orphaned"]:
+                orphan_ids = [test_case_id for test_case_id, _ in report["orphaned"]]
+                for start in range(0, len(orphan_ids), self.batch_size):
+                    try:
+                        self.rag_engine.delete_test_cases(orphan_ids[start:start + self.batch_size])
+                    except Exception as e:
+                        errors.append(f"Failed to delete orphaned records: {e}")
+        
+        return {
+            "dry_run": dry_run,
+            "counts": {key: len(entries) for key, entries in report.items()},
+            "ids": {key: [test_case_id for test_case_id, _ in entries] for key, entries in report.items()},
+            "orphans_deleted": not dry_run and delete_orphans,
+            "errors": errors
+        }
+    
+    def _group_by_suite(self, entries: List[Tuple[str, str]]) -> List[Tuple[str, List[TestCase]]]:
+        """
+        Group diff entries by suite, resolving IDs to knowledge base cases
+        
+        Args:
+            entries: (test case ID, suite name) pairs
+        
+        Returns:
+            List of (suite name, test cases)
+        """
+        groups: Dict[str, List[TestCase]] = {}
+        for test_case_id, suite_name in entries:
+            tc = self.knowledge_base.get_test_case_from_suite(suite_name, test_case_id)
+            if tc is not None:
+                groups.setdefault(suite_name, []).append(tc)
+        return list(groups.items())
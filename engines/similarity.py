@@ -0,0 +1,113 @@
+"""
+Vectorized similarity kernels over embedding matrices
+"""
+import numpy as np
+from typing import Tuple
+
+
+def normalize_rows(matrix) -> np.ndarray:
+    """
+    L2-normalize each row of an embedding matrix
+    
+    Args:
+        matrix: (N x D) embeddings (or a single D-dim vector)
+    
+    Returns:
+        Contiguous float32 (N x D) matrix with unit-length rows (zero rows stay zero)
+    """
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms)
+
+
+def similarity_matrix(queries, candidates, normalized: bool = True) -> np.ndarray:
+    """
+    Cosine similarity between every query and every candidate in one BLAS call
+    
+    Args:
+        queries: (N x D) float32 embeddings
+        candidates: (M x D) float32 embeddings
+        normalized: Whether rows are already unit length (skips normalization)
+    
+    Returns:
+        (N x M) float32 matrix of cosine similarities in [-1, 1]
+    """
+    if not normalized:
+        queries = normalize_rows(queries)
+        candidates = normalize_rows(candidates)
+    else:
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        candidates = np.atleast_2d(np.asarray(candidates, dtype=np.float32))
+    
+    return queries @ candidates.T
+
+
+def top_k_similar(
+    queries,
+    candidates,
+    k: int,
+    normalized: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k most similar candidates for each query
+    
+    Uses argpartition so only the k best entries per row are sorted.
+    
+    Args:
+        queries: (N x D) float32 embeddings
+        candidates: (M x D) float32 embeddings
+        k: Number of neighbours per query (clamped to M)
+        normalized: Whether rows are already unit length
+    
+    Returns:
+        Tuple of (indices, scores), each (N x k), ordered best first
+    """
+    scores = similarity_matrix(queries, candidates, normalized=normalized)
+    n_candidates = scores.shape[1]
+    k = min(k, n_candidates)
+    
+    if k <= 0:
+        empty = np.zeros((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+    
+    if k < n_candidates:
+        indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        indices = np.tile(np.arange(n_candidates), (scores.shape[0], 1))
+    
+    top_scores = np.take_along_axis(scores, indices, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    
+    return (
+        np.take_along_axis(indices, order, axis=1),
+        np.take_along_axis(top_scores, order, axis=1)
+    )
+
+
+def to_unit_interval(cosine):
+    """
+    Map cosine similarity from [-1, 1] to the [0, 1] scale used by decisions
+    
+    Args:
+        cosine: Scalar or array of cosine similarities
+    
+    Returns:
+        Similarity in [0, 1]
+    """
+    return (cosine + 1) / 2
+
+
+def retrieval_to_unit_interval(score):
+    """
+    Map a vector store score to the [0, 1] scale used by decisions
+    
+    Stores report 1 - squared L2 distance of unit vectors, i.e. 2 * cosine - 1.
+    
+    Args:
+        score: Scalar or array of retrieval similarities
+    
+    Returns:
+        Similarity in [0, 1] (same as EmbeddingGenerator.calculate_similarity)
+    """
+    return to_unit_interval((score + 1) / 2)
@@ -12,6 +12,7 @@ from config.config import Config
 from core.models import TestCase, UserStory
 from core.utils import load_json, parse_test_case_json, generate_id, calculate_test_distribution
 from engines.context_engineering import ContextEngineer
+from engines.llm_cache import get_llm_cache, cached_chat_completion
 import json
 
 
@@ -31,6 +32,7 @@ class TestCaseGenerator:
             azure_endpoint=Config.AZURE_OPENAI_ENDPOINT
         )
         self.deployment = Config.AZURE_OPENAI_DEPLOYMENT_NAME
+        self.llm_cache = get_llm_cache()
         self.prompts = load_json("prompts.json")
         self.use_context_engineering = use_context_engineering
         
@@ -186,7 +188,9 @@ Business Rules:
         
         try:
             # Call Azure OpenAI with optimized settings
-            response = self.client.chat.completions.create(
+            response = cached_chat_completion(
+                self.client,
+                self.llm_cache,
                 model=self.deployment,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -194,7 +198,8 @@ Business Rules:
                 ],
                 temperature=0.3,  # Reduced from 0.3 for faster, more deterministic responses
                 max_tokens=16000,  # Reduced from 16000 - sufficient for most cases
-                timeout=30  # 30 second timeout for faster failure detection
+                timeout=30,  # 30 second timeout for faster failure detection
+                validate=lambda text: isinstance(json.loads(self._extract_json(text)), list)
             )
             
             # Check if response was truncated
@@ -203,17 +208,8 @@ Business Rules:
                 print(" WARNING: Response was truncated due to token limit")
                 print(" This may result in incomplete JSON. Consider reducing complexity or splitting the request.")
             
-            # Parse response
-            content = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-            
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            # Clean JSON content
-            content = self._clean_json_content(content)
+            # Parse response (JSON extracted from markdown code blocks and cleaned)
+            content = self._extract_json(response.choices[0].message.content)
             
             # Parse JSON with better error handling
             try:
@@ -308,6 +304,23 @@ Business Rules:
             print(f"Error generating test cases: {e}")
             raise Exception(f"Error generating test cases: {e}")
     
+    def _extract_json(self, content: Optional[str]) -> str:
+        """
+        Extract the JSON of a response (handles markdown code blocks) and clean it
+        
+        Args:
+            content: Response text
+            
+        Returns:
+            Cleaned JSON string
+        """
+        content = content.strip() if content else ""
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
+        return self._clean_json_content(content)
+    
     def _clean_json_content(self, content: str) -> str:
         """
         Clean JSON content by removing common issues from LLM responses
@@ -439,7 +452,9 @@ Business Rules:
         )
         
         try:
-            response = self.client.chat.completions.create(
+            response = cached_chat_completion(
+                self.client,
+                self.llm_cache,
                 model=self.deployment,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -479,27 +494,21 @@ Business Rules:
         )
         
         try:
-            response = self.client.chat.completions.create(
+            response = cached_chat_completion(
+                self.client,
+                self.llm_cache,
                 model=self.deployment,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.4,  # Balanced for merging
-                max_tokens=1500  # Reduced tokens
+                max_tokens=1500,  # Reduced tokens
+                validate=lambda text: isinstance(json.loads(self._extract_json(text)), dict)
             )
             
             # Parse response
-            content = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-            
-            # Extract JSON
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            # Clean JSON content
-            content = self._clean_json_content(content)
+            content = self._extract_json(response.choices[0].message.content)
             
             merged_data = json.loads(content)
             merged_test_case = parse_test_case_json(merged_data)
@@ -697,14 +706,17 @@ NO markdown, NO explanations, JUST the JSON array.
         
         try:
             # Call Azure OpenAI with reduced token limit for batch
-            response = self.client.chat.completions.create(
+            response = cached_chat_completion(
+                self.client,
+                self.llm_cache,
                 model=self.deployment,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": batch_prompt}
                 ],
                 temperature=0.3,
-                max_tokens=2048  # Smaller per batch to avoid truncation
+                max_tokens=2048,  # Smaller per batch to avoid truncation
+                validate=lambda text: isinstance(json.loads(self._extract_json(text)), list)
             )
             
             # Check for truncation
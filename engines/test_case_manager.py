@@ -3,7 +3,7 @@ Test case manager - orchestrates the entire workflow
 """
 import os
 import sys
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add parent directory to path
@@ -12,10 +12,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.models import TestCase, UserStory, ComparisonResult, DecisionType
 from engines.rag_engine import RAGEngine
 from engines.test_case_generator import TestCaseGenerator
-from engines.comparison_engine import ComparisonEngine
+from engines.comparison_engine import ComparisonEngine, ComparisonContext
+from engines.reconciliation import StoreReconciler
+from engines.candidate_ranking import rank_candidates
+from engines.deduplication import SuiteDeduplicator
+from engines.clustering import build_coverage_map
+from engines.similarity import retrieval_to_unit_interval
 from core.knowledge_base import KnowledgeBase
 from config.config import Config
-from core.utils import parse_test_case_json
+from core.utils import parse_test_case_json, build_embedding_record, compute_content_hash
 
 
 class TestCaseManager:
@@ -31,7 +36,9 @@ class TestCaseManager:
     def _analyze_new_test_case(
         self, 
         new_test_case: TestCase,
-        top_k: Optional[int] = None
+        top_k: Optional[int] = None,
+        similar_cases: Optional[List[Dict[str, Any]]] = None,
+        suite_name: Optional[str] = None
     ) -> ComparisonResult:
         """
         Analyze a new test case against existing knowledge base
@@ -39,19 +46,128 @@ class TestCaseManager:
         Args:
             new_test_case: New test case to analyze
             top_k: Number of similar cases to retrieve (defaults to Config.RAG_TOP_K)
+            similar_cases: Already retrieved similar cases (e.g. from
+                RAGEngine.search_similar_batch); retrieved here if omitted
+            suite_name: Suite being processed (scopes retrieval when
+                Config.RAG_FILTER_BY_SUITE is enabled)
             
         Returns:
             ComparisonResult with decision
         """
+        context = ComparisonContext()
+        prepared = self._prepare_comparison(new_test_case, context, top_k, similar_cases, suite_name)
+        if isinstance(prepared, ComparisonResult):
+            return prepared
+        
+        # Perform detailed comparison (one LLM analysis for the whole shortlist)
+        if len(prepared) == 1:
+            return self.comparison_engine.compare_test_cases(new_test_case, prepared[0], context=context)
+        
+        return self.comparison_engine.compare_against_candidates(
+            new_test_case,
+            [(candidate, None) for candidate in prepared],
+            context=context
+        )
+    
+    def _analyze_new_test_cases(
+        self,
+        new_test_cases: List[TestCase],
+        similar_by_case: List[List[Dict[str, Any]]],
+        max_workers: int = 4
+    ) -> List[ComparisonResult]:
+        """
+        Analyze generated test cases with as few LLM calls as possible
+        
+        Cases with a single shortlisted candidate are compared in batches of
+        Config.COMPARISON_BATCH_SIZE pairs per prompt; cases with several
+        candidates get one candidate comparison each. Calls run in parallel.
+        
+        Args:
+            new_test_cases: New test cases
+            similar_by_case: Retrieved similar cases, aligned with new_test_cases
+            max_workers: Parallel LLM calls
+        
+        Returns:
+            One ComparisonResult per new test case, in input order
+        """
+        context = ComparisonContext()
+        comparisons: List[Optional[ComparisonResult]] = [None] * len(new_test_cases)
+        pair_indices, multi_indices, shortlists = [], [], {}
+        
+        for i, (test_case, similar_cases) in enumerate(zip(new_test_cases, similar_by_case)):
+            prepared = self._prepare_comparison(test_case, context, similar_cases=similar_cases)
+            if isinstance(prepared, ComparisonResult):
+                comparisons[i] = prepared
+            elif len(prepared) == 1 and Config.COMPARISON_BATCH_SIZE > 1:
+                pair_indices.append(i)
+                shortlists[i] = prepared
+            else:
+                multi_indices.append(i)
+                shortlists[i] = prepared
+        
+        def compare_pairs(indices):
+            pairs = [(new_test_cases[i], shortlists[i][0]) for i in indices]
+            return indices, self.comparison_engine.compare_test_case_pairs(pairs, context=context)
+        
+        def compare_candidates(i):
+            if len(shortlists[i]) == 1:
+                result = self.comparison_engine.compare_test_cases(new_test_cases[i], shortlists[i][0], context=context)
+            else:
+                result = self.comparison_engine.compare_against_candidates(
+                    new_test_cases[i],
+                    [(candidate, None) for candidate in shortlists[i]],
+                    context=context
+                )
+            return [i], [result]
+        
+        batch_size = max(1, Config.COMPARISON_BATCH_SIZE)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [
+                executor.submit(compare_pairs, pair_indices[start:start + batch_size])
+                for start in range(0, len(pair_indices), batch_size)
+            ]
+            futures += [executor.submit(compare_candidates, i) for i in multi_indices]
+            
+            for future in as_completed(futures):
+                indices, results = future.result()
+                for i, result in zip(indices, results):
+                    comparisons[i] = result
+        
+        return comparisons  # type: ignore
+    
+    def _prepare_comparison(
+        self,
+        new_test_case: TestCase,
+        context: ComparisonContext,
+        top_k: Optional[int] = None,
+        similar_cases: Optional[List[Dict[str, Any]]] = None,
+        suite_name: Optional[str] = None
+    ) -> Union[ComparisonResult, List[TestCase]]:
+        """
+        Retrieve and shortlist the candidates of a new test case
+        
+        Args:
+            new_test_case: New test case to analyze
+            context: Request context (receives the retrieval scores)
+            top_k: Number of similar cases to retrieve (defaults to Config.RAG_TOP_K)
+            similar_cases: Already retrieved similar cases; retrieved here if omitted
+            suite_name: Suite being processed
+        
+        Returns:
+            ComparisonResult when no LLM comparison is needed, otherwise the
+            shortlisted existing TestCases (best first)
+        """
         # Use config default if not specified
         if top_k is None:
             top_k = Config.RAG_TOP_K
             
         # Search for similar test cases
-        similar_cases = self.rag_engine.search_similar_test_cases(
-            new_test_case, 
-            top_k=top_k
-        )
+        if similar_cases is None:
+            similar_cases = self.rag_engine.search_similar_test_cases(
+                new_test_case, 
+                top_k=top_k,
+                **self._retrieval_filters(new_test_case, suite_name)
+            )
         
         # If no existing cases, it's a new test case
         if not similar_cases:
@@ -67,8 +183,27 @@ class TestCaseManager:
                 confidence_score=1.0
             )
         
+        # Keyword-only hits carry a word-overlap score, not an embedding
+        # similarity: no threshold applies to them, so leave the case for review
+        if all(hit.get("retrieval") == "lexical" for hit in similar_cases):
+            return ComparisonResult(
+                new_test_case_id=new_test_case.id,
+                existing_test_case_id=similar_cases[0]['id'],
+                similarity_score=0.0,
+                decision=DecisionType.NEW,
+                reasoning=(
+                    f"Only keyword matches were found (closest: {similar_cases[0]['id']}), so similarity "
+                    "could not be scored. Review before applying."
+                ),
+                business_rule_match=False,
+                behavior_match=False,
+                coverage_expansion=[],
+                confidence_score=0.0,
+                needs_review=True
+            )
+        
         # Get the most similar case
-        most_similar = similar_cases[0]
+        most_similar = max(similar_cases, key=lambda hit: hit['similarity'])
         
         # If similarity is very low, it's a new test case
         if most_similar['similarity'] < Config.THRESHOLD_ADDON_MIN:
@@ -84,16 +219,35 @@ class TestCaseManager:
                 confidence_score=0.9
             )
         
-        # Reconstruct existing test case from stored data
-        existing_test_case = self._reconstruct_test_case(most_similar)
+        # Reuse the retrieval scores so the comparison embeds nothing again
+        for hit in similar_cases:
+            context.add_similarity(new_test_case.id, hit['id'], retrieval_to_unit_interval(hit['similarity']))
         
-        # Perform detailed comparison
-        comparison_result = self.comparison_engine.compare_test_cases(
+        # Re-rank all retrieved cases cheaply and keep the close contenders
+        shortlist = rank_candidates(
             new_test_case,
-            existing_test_case
+            [(hit, self._reconstruct_test_case(hit)) for hit in similar_cases]
         )
         
-        return comparison_result
+        return [candidate["test_case"] for candidate in shortlist]
+    
+    def _retrieval_filters(self, test_case: TestCase, suite_name: Optional[str]) -> Dict[str, Any]:
+        """
+        Build the vector store filters used when looking for existing cases
+        
+        Args:
+            test_case: Case being analyzed
+            suite_name: Suite being processed
+        
+        Returns:
+            Keyword arguments for RAGEngine.search_similar_test_cases
+        """
+        filters: Dict[str, Any] = {}
+        if Config.RAG_FILTER_BY_SUITE and suite_name:
+            filters["suite_name"] = suite_name
+        if Config.RAG_MATCH_TEST_TYPE:
+            filters["test_types"] = [test_case.test_type]
+        return filters
     
     def _get_recommendation(self, comparison_result: ComparisonResult) -> str:
         """
@@ -105,7 +259,10 @@ class TestCaseManager:
         Returns:
             Recommendation text
         """
-        if comparison_result.decision == DecisionType.SAME:
+        if comparison_result.needs_review:
+            return f"Review manually: compare with existing test case (ID: {comparison_result.existing_test_case_id}) before applying."
+        
+        elif comparison_result.decision == DecisionType.SAME:
             return f"Keep existing test case (ID: {comparison_result.existing_test_case_id}). The new test case is identical."
         
         elif comparison_result.decision == DecisionType.ADDON:
@@ -116,17 +273,30 @@ class TestCaseManager:
     
     def _reconstruct_test_case(self, similar_case_data: dict) -> TestCase:
         """
-        Reconstruct TestCase object from ChromaDB data
+        Get the full TestCase behind a retrieval hit
+        
+        Looks the case up in the suite it was stored under, then in the
+        payload stored with the vector; only records from before payloads
+        were stored fall back to a partial rebuild from metadata.
         
         Args:
-            similar_case_data: Data from ChromaDB
+            similar_case_data: Hit returned by the RAG engine
             
         Returns:
-            Reconstructed TestCase
+            TestCase
         """
+        test_case = None
+        suite_name = similar_case_data['metadata'].get('suite_name')
+        if suite_name:
+            test_case = self.knowledge_base.get_test_case_from_suite(suite_name, similar_case_data['id'])
+        if test_case is None:
+            test_case = self.rag_engine.hit_test_case(similar_case_data)
+        if test_case is not None:
+            return test_case
+        
         metadata = similar_case_data['metadata']
         
-        # Create a minimal test case from metadata
+        # Record stored without a payload: create a minimal test case from metadata
         test_case_dict = {
             "id": metadata['id'],
             "title": metadata['title'],
@@ -173,49 +343,37 @@ class TestCaseManager:
         )
         print(f"Generated {len(new_test_cases)} test cases")
         
-        # Step 2: Analyze each test case in parallel for better performance
-        results = []
-        actions_taken = []
+        # Step 2: Retrieve similar cases for all generated cases in one batch
+        similar_by_case = self.rag_engine.search_similar_batch(
+            new_test_cases,
+            suite_name=suite_name if Config.RAG_FILTER_BY_SUITE else None,
+            match_test_type=Config.RAG_MATCH_TEST_TYPE
+        )
         
-        # Determine number of workers (max 4 to avoid rate limits)
-        max_workers = min(4, len(new_test_cases))
+        # Step 3: Compare with existing test cases (batched, in parallel; max 4 workers to avoid rate limits)
+        comparisons = self._analyze_new_test_cases(new_test_cases, similar_by_case, max_workers=4)
         
-        def analyze_test_case(test_case):
-            """Analyze a single test case"""
-            print(f"\nAnalyzing: {test_case.title}")
-            
-            # Compare with existing test cases
-            comparison = self._analyze_new_test_case(test_case)
-            
+        results = []
+        actions_taken = []
+        for test_case, comparison in zip(new_test_cases, comparisons):
             # Get recommendation
             recommendation = self._get_recommendation(comparison)
             
+            print(f"\nAnalyzed: {test_case.title}")
             print(f"Decision: {comparison.decision.value}")
             print(f"Similarity: {comparison.similarity_score:.2%}")
             print(f"Recommendation: {recommendation}")
             
-            return {
+            results.append({
                 "test_case": test_case,
                 "comparison": comparison,
                 "recommendation": recommendation
-            }
-        
-        # Process test cases in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_tc = {executor.submit(analyze_test_case, tc): tc for tc in new_test_cases}
+            })
             
-            for future in as_completed(future_to_tc):
-                result = future.result()
-                results.append(result)
-                
-                # Apply decision if auto_apply is True
-                if auto_apply:
-                    action = self._apply_decision(
-                        result["test_case"], 
-                        result["comparison"], 
-                        suite_name
-                    )
-                    actions_taken.append(action)
+            # Apply decision if auto_apply is True (unscored results wait for review)
+            if auto_apply:
+                action = self._auto_apply(test_case, comparison, suite_name)
+                actions_taken.append(action)
         
         return {
             "user_story": user_story,
@@ -252,40 +410,34 @@ class TestCaseManager:
         )
         print(f"Generated {len(new_test_cases)} test cases")
         
-        # Analyze each test case in parallel
-        results = []
-        actions_taken = []
+        # Retrieve similar cases for all generated cases in one batch
+        similar_by_case = self.rag_engine.search_similar_batch(
+            new_test_cases,
+            suite_name=suite_name if Config.RAG_FILTER_BY_SUITE else None,
+            match_test_type=Config.RAG_MATCH_TEST_TYPE
+        )
         
-        # Determine number of workers (max 4 to avoid rate limits)
-        max_workers = min(10, len(new_test_cases))
+        # Compare with existing test cases (batched, in parallel)
+        comparisons = self._analyze_new_test_cases(new_test_cases, similar_by_case, max_workers=10)
         
-        def analyze_test_case(test_case):
-            """Analyze a single test case"""
-            print(f"\nAnalyzing: {test_case.title}")
-            
-            comparison = self._analyze_new_test_case(test_case)
+        results = []
+        actions_taken = []
+        for test_case, comparison in zip(new_test_cases, comparisons):
             recommendation = self._get_recommendation(comparison)
             
+            print(f"\nAnalyzed: {test_case.title}")
             print(f"Decision: {comparison.decision.value}")
             print(f"Similarity: {comparison.similarity_score:.2%}")
             
-            return {
+            results.append({
                 "test_case": test_case,
                 "comparison": comparison,
                 "recommendation": recommendation
-            }
-        
-        # Process test cases in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_tc = {executor.submit(analyze_test_case, tc): tc for tc in new_test_cases}
+            })
             
-            for future in as_completed(future_to_tc):
-                result = future.result()
-                results.append(result)
-                
-                if auto_apply:
-                    action = self._apply_decision(result["test_case"], result["comparison"], suite_name)
-                    actions_taken.append(action)
+            if auto_apply:
+                action = self._auto_apply(test_case, comparison, suite_name)
+                actions_taken.append(action)
         
         return {
             "requirement_text": requirement_text,
@@ -318,6 +470,29 @@ class TestCaseManager:
         
         return action
     
+    def explain_comparison(self, comparison: ComparisonResult) -> str:
+        """
+        Generate the LLM explanation of a comparison on demand
+        
+        Args:
+            comparison: Comparison result (e.g. from a processing response)
+        
+        Returns:
+            Reasoning text
+        """
+        return self.comparison_engine.explain_comparison(comparison)
+    
+    def _auto_apply(
+        self,
+        test_case: TestCase,
+        comparison: ComparisonResult,
+        suite_name: str
+    ) -> str:
+        """Apply a decision unless it needs review"""
+        if comparison.needs_review:
+            return f"Left for review (ID: {test_case.id})"
+        return self._apply_decision(test_case, comparison, suite_name)
+    
     def _apply_decision(
         self,
         test_case: TestCase,
@@ -345,19 +520,19 @@ class TestCaseManager:
                     self.knowledge_base.update_test_case_in_suite(suite_name, merged_tc)
                     
                     # Update in RAG engine
-                    self.rag_engine.update_test_case(merged_tc)
+                    self.rag_engine.update_test_case(merged_tc, suite_name=suite_name)
                     
                     return f"Merged test case into existing (ID: {comparison.existing_test_case_id})"
             
             # Fallback: add as new if no existing ID or existing not found
             self.knowledge_base.add_test_case_to_suite(suite_name, test_case)
-            self.rag_engine.add_test_case(test_case)
+            self.rag_engine.add_test_case(test_case, suite_name=suite_name)
             return f"Added as new test case (existing not found)"
         
         else:  # NEW
             # Add new test case
             self.knowledge_base.add_test_case_to_suite(suite_name, test_case)
-            self.rag_engine.add_test_case(test_case)
+            self.rag_engine.add_test_case(test_case, suite_name=suite_name)
             return f"Created new test case (ID: {test_case.id})"
     
     def _generate_summary(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -366,12 +541,14 @@ class TestCaseManager:
         same = len([r for r in results if r['comparison'].decision == DecisionType.SAME])
         addon = len([r for r in results if r['comparison'].decision == DecisionType.ADDON])
         new = len([r for r in results if r['comparison'].decision == DecisionType.NEW])
+        review = len([r for r in results if r['comparison'].needs_review])
         
         return {
             "total_test_cases": total,
             "same_count": same,
             "addon_count": addon,
             "new_count": new,
+            "review_count": review,
             "same_percentage": (same / total * 100) if total > 0 else 0,
             "addon_percentage": (addon / total * 100) if total > 0 else 0,
             "new_percentage": (new / total * 100) if total > 0 else 0
@@ -434,7 +611,8 @@ class TestCaseManager:
         priorities: Optional[List[str]] = None,
         test_types: Optional[List[str]] = None,
         tags: Optional[List[str]] = None,
-        is_regression: Optional[bool] = None
+        is_regression: Optional[bool] = None,
+        include_embeddings: bool = False
     ):
         """
         Export test suite to file with optional filtering
@@ -447,6 +625,8 @@ class TestCaseManager:
             test_types: Filter by test types
             tags: Filter by tags
             is_regression: Filter by regression flag
+            include_embeddings: Include stored vectors in JSON exports so
+                the file can be imported without re-embedding
         """
         from core.utils import export_to_excel, export_to_csv, save_json
         
@@ -459,6 +639,11 @@ class TestCaseManager:
             # Export filtered test cases directly
             if format == "json":
                 data = [tc.model_dump() for tc in test_cases]
+                if include_embeddings:
+                    records = self._embedding_records(test_cases)
+                    for tc_dict in data:
+                        if tc_dict["id"] in records:
+                            tc_dict["embedding"] = records[tc_dict["id"]]
                 save_json(data, output_path)
             elif format == "excel":
                 export_to_excel(test_cases, output_path)
@@ -468,7 +653,117 @@ class TestCaseManager:
                 raise ValueError(f"Unsupported format: {format}")
         else:
             # Export entire suite without filtering
-            self.knowledge_base.export_suite(suite_name, output_path, format)
+            embeddings = None
+            if include_embeddings and format == "json":
+                embeddings = self._embedding_records(self.knowledge_base.get_all_test_cases(suite_name))
+            self.knowledge_base.export_suite(suite_name, output_path, format, embeddings=embeddings)
+    
+    def _embedding_records(self, test_cases: List[TestCase]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build export embedding records from the vectors stored in the RAG engine
+        
+        Args:
+            test_cases: Test cases being exported
+        
+        Returns:
+            Dictionary mapping test case ID to embedding record
+        """
+        model = self.rag_engine.embedding_generator.deployment
+        stored = self.rag_engine.get_embeddings([tc.id for tc in test_cases])
+        
+        return {
+            test_case_id: build_embedding_record(entry["embedding"], model, entry["content_hash"])
+            for test_case_id, entry in stored.items()
+            if entry["content_hash"]
+        }
+    
+    def _match_precomputed_embeddings(
+        self,
+        test_cases: List[TestCase],
+        precomputed: Dict[str, Dict[str, Any]]
+    ) -> List[Optional[Any]]:
+        """
+        Pick reusable imported vectors
+        
+        A vector is reused only when it was produced by the current embedding
+        model and for exactly the text that would be embedded now.
+        
+        Args:
+            test_cases: Imported test cases
+            precomputed: Embeddings read from the import file, by test case ID
+        
+        Returns:
+            Vectors aligned with test_cases (None where re-embedding is needed)
+        """
+        model = self.rag_engine.embedding_generator.deployment
+        matched = []
+        
+        for test_case in test_cases:
+            entry = precomputed.get(test_case.id)
+            if (
+                entry is not None
+                and entry["model"] == model
+                and entry["content_hash"] == compute_content_hash(test_case.to_text())
+            ):
+                matched.append(entry["embedding"])
+            else:
+                matched.append(None)
+        
+        return matched
+    
+    def find_duplicates(self, suite_name: str, verify_with_llm: bool = False) -> Dict[str, Any]:
+        """
+        Find duplicate test cases already stored in a suite
+        
+        Args:
+            suite_name: Suite to scan
+            verify_with_llm: Confirm ambiguous clusters with the comparison engine
+        
+        Returns:
+            Dictionary with the suite size, duplicate clusters and the number
+            of cases that could be removed
+        """
+        test_cases = self.knowledge_base.get_all_test_cases(suite_name)
+        deduplicator = SuiteDeduplicator()
+        clusters = deduplicator.find_duplicate_clusters(test_cases)
+        if verify_with_llm:
+            deduplicator.verify_clusters(clusters, test_cases, self.comparison_engine)
+        
+        return {
+            "suite_name": suite_name,
+            "total_test_cases": len(test_cases),
+            "clusters": clusters,
+            "redundant_test_cases": sum(len(cluster["test_case_ids"]) - 1 for cluster in clusters)
+        }
+    
+    def get_coverage_map(self, suite_name: Optional[str] = None, k: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Cluster the stored vectors and report what each cluster covers
+        
+        Args:
+            suite_name: Only map this suite (all suites if omitted)
+            k: Number of clusters (defaults to Config.CLUSTER_COUNT)
+        
+        Returns:
+            Coverage report (see engines.clustering.cluster_coverage)
+        """
+        return build_coverage_map(self.rag_engine.collection, suite_name=suite_name, k=k)
+    
+    def reconcile_stores(self, dry_run: bool = False, delete_orphans: bool = True) -> Dict[str, Any]:
+        """
+        Repair drift between the knowledge base and the RAG engine
+        
+        Args:
+            dry_run: Only report the differences
+            delete_orphans: Delete vector records without a knowledge base case
+        
+        Returns:
+            Reconciliation report (see StoreReconciler.reconcile)
+        """
+        return StoreReconciler(self.rag_engine, self.knowledge_base).reconcile(
+            dry_run=dry_run,
+            delete_orphans=delete_orphans
+        )
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get system statistics"""
@@ -476,7 +771,10 @@ class TestCaseManager:
             "knowledge_base": {
                 "total_test_cases": self.rag_engine.count(),
                 "test_suites": self.knowledge_base.list_suites()
-            }
+            },
+            "embedding_cache": self.rag_engine.embedding_generator.cache_stats(),
+            "llm_cache": self.comparison_engine.llm_cache.stats() if self.comparison_engine.llm_cache else None,
+            "decision_store": self.comparison_engine.decision_store.stats() if self.comparison_engine.decision_store else None
         }
     
     def import_existing_test_cases(
@@ -507,7 +805,7 @@ class TestCaseManager:
                 'test_cases': List[TestCase]
             }
         """
-        from core.utils import import_from_excel, import_from_json
+        from core.utils import import_from_excel, import_from_json, load_precomputed_embeddings
         
         # Auto-detect format
         if file_format == "auto":
@@ -567,13 +865,22 @@ class TestCaseManager:
                     failed_count += 1
                     errors.append(f"Failed to import {test_case.title}: {str(e)}")
             
+            # Reuse embeddings shipped in the file when they match this model and text
+            embeddings = None
+            if file_format == "json":
+                precomputed = load_precomputed_embeddings(file_path)
+                if precomputed:
+                    embeddings = self._match_precomputed_embeddings(test_cases, precomputed)
+                    reused = sum(1 for vector in embeddings if vector is not None)
+                    print(f"Reusing {reused} precomputed embeddings ({len(test_cases) - reused} to embed)")
+            
             # Add all test cases to RAG engine in batch for efficiency
             try:
                 print("Adding test cases to RAG engine for semantic search...")
-                self.rag_engine.add_test_cases_batch(test_cases)
+                self.rag_engine.add_test_cases_batch(test_cases, embeddings=embeddings, suite_name=suite_name)
                 print(f"✓ Added {len(test_cases)} test cases to RAG engine")
             except Exception as e:
-                errors.append(f"Failed to add to RAG engine: {str(e)}")
+                errors.append(f"Failed to add to RAG engine: {str(e)} (run scripts/reconcile_stores.py to repair)")
             
             success = imported_count > 0
             
@@ -0,0 +1,156 @@
+"""
+Token counting, truncation and batch packing for embedding inputs
+"""
+import os
+import sys
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken is listed in requirements.txt
+    tiktoken = None
+
+
+class TokenCounter:
+    """
+    Count and cut text in model tokens
+    
+    Uses tiktoken when the encoding can be loaded; otherwise (package
+    missing, or encoding files unavailable in an air-gapped environment)
+    falls back to a conservative approximation of 3 characters per token.
+    """
+    
+    CHARS_PER_TOKEN = 3
+    
+    def __init__(self, encoding_name: Optional[str] = None):
+        """
+        Initialize token counter
+        
+        Args:
+            encoding_name: tiktoken encoding (defaults to Config.EMBEDDING_TOKEN_ENCODING)
+        """
+        self.encoding_name = encoding_name or Config.EMBEDDING_TOKEN_ENCODING
+        self.encoding = None
+        
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.get_encoding(self.encoding_name)
+            except Exception as e:
+                print(f"Warning: tiktoken encoding '{self.encoding_name}' unavailable, approximating tokens: {e}")
+    
+    def count(self, text: str) -> int:
+        """
+        Count tokens in text
+        
+        Args:
+            text: Text to measure
+        
+        Returns:
+            Number of tokens
+        """
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return max(1, -(-len(text) // self.CHARS_PER_TOKEN))
+    
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Cut text to at most max_tokens tokens
+        
+        Args:
+            text: Text to truncate
+            max_tokens: Token limit
+        
+        Returns:
+            Truncated text (unchanged if already within the limit)
+        """
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            return self.encoding.decode(tokens[:max_tokens])
+        
+        return text[:max_tokens * self.CHARS_PER_TOKEN]
+    
+    def split(self, text: str, max_tokens: int) -> List[str]:
+        """
+        Split text into consecutive chunks of at most max_tokens tokens
+        
+        Args:
+            text: Text to split
+            max_tokens: Token limit per chunk
+        
+        Returns:
+            List of chunks (a single chunk when the text fits)
+        """
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return [text]
+            return [
+                self.encoding.decode(tokens[i:i + max_tokens])
+                for i in range(0, len(tokens), max_tokens)
+            ]
+        
+        max_chars = max_tokens * self.CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return [text]
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+
+def pack_batches(
+    token_counts: List[int],
+    max_items: int,
+    max_tokens: int
+) -> List[List[int]]:
+    """
+    Group inputs into requests bounded by item count and total tokens
+    
+    Inputs keep their order; an input larger than max_tokens gets a request
+    of its own.
+    
+    Args:
+        token_counts: Token count of each input
+        max_items: Maximum inputs per request
+        max_tokens: Maximum total tokens per request
+    
+    Returns:
+        List of batches, each a list of input indices
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    
+    for index, tokens in enumerate(token_counts):
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        
+        current.append(index)
+        current_tokens += tokens
+    
+    if current:
+        batches.append(current)
+    
+    return batches
+
+
+_shared_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    """
+    Get the process-wide token counter (loading an encoding is not free)
+    
+    Returns:
+        Shared TokenCounter instance
+    """
+    global _shared_counter
+    
+    if _shared_counter is None:
+        _shared_counter = TokenCounter()
+    return _shared_counter
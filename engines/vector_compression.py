@@ -0,0 +1,240 @@
+"""
+Dimensionality reduction and int8 quantization for stored embeddings
+"""
+import os
+import sys
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.similarity import normalize_rows, top_k_similar
+
+
+def quantize_int8(matrix) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 scalar quantization
+    
+    Args:
+        matrix: (N x D) float embeddings (or a single D-dim vector)
+    
+    Returns:
+        Tuple of (codes, scales): int8 (N x D) codes and float32 (N,) scales
+    """
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """
+    Reverse quantize_int8
+    
+    Args:
+        codes: int8 (N x D) codes
+        scales: float32 (N,) per-row scales
+    
+    Returns:
+        float32 (N x D) approximate embeddings
+    """
+    return np.atleast_2d(codes).astype(np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
+
+class DimensionReducer:
+    """
+    Project embeddings to fewer dimensions
+    
+    "pca" fits principal components on a sample of stored vectors;
+    "random" uses a seeded Gaussian random projection (no fitting data
+    needed beyond the input dimension). Outputs are L2-normalized so cosine
+    similarity stays a dot product.
+    """
+    
+    METHODS = ("pca", "random")
+    
+    def __init__(self, target_dim: int, method: str = "pca", seed: int = 42):
+        """
+        Initialize reducer
+        
+        Args:
+            target_dim: Output dimension
+            method: "pca" or "random"
+            seed: Seed for the random projection
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported reduction method: {method}")
+        
+        self.target_dim = target_dim
+        self.method = method
+        self.seed = seed
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+    
+    @property
+    def is_fitted(self) -> bool:
+        """Whether a projection has been fitted"""
+        return self.components is not None
+    
+    def fit(self, matrix) -> "DimensionReducer":
+        """
+        Fit the projection
+        
+        Args:
+            matrix: (N x D) embeddings to fit on
+        
+        Returns:
+            self
+        """
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+        input_dim = matrix.shape[1]
+        
+        if self.method == "pca":
+            self.mean = matrix.mean(axis=0)
+            # Right singular vectors of the centred data are the principal axes
+            _, _, vt = np.linalg.svd(matrix - self.mean, full_matrices=False)
+            self.components = np.ascontiguousarray(vt[:self.target_dim].T, dtype=np.float32)
+        else:
+            rng = np.random.default_rng(self.seed)
+            self.mean = np.zeros(input_dim, dtype=np.float32)
+            projection = rng.standard_normal((input_dim, self.target_dim)) / np.sqrt(self.target_dim)
+            self.components = projection.astype(np.float32)
+        
+        return self
+    
+    def transform(self, matrix) -> np.ndarray:
+        """
+        Project embeddings
+        
+        Args:
+            matrix: (N x D) embeddings
+        
+        Returns:
+            L2-normalized float32 (N x target_dim) matrix
+        """
+        if not self.is_fitted:
+            raise ValueError("DimensionReducer must be fitted before transform")
+        
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+        return normalize_rows((matrix - self.mean) @ self.components)
+    
+    def save(self, path: str):
+        """
+        Save the fitted projection to a .npz file
+        
+        Args:
+            path: Output file path
+        """
+        if not self.is_fitted:
+            raise ValueError("DimensionReducer must be fitted before saving")
+        
+        np.savez(
+            path,
+            mean=self.mean,
+            components=self.components,
+            method=np.array(self.method),
+            seed=np.array(self.seed)
+        )
+    
+    @classmethod
+    def load(cls, path: str) -> "DimensionReducer":
+        """
+        Load a projection saved with save()
+        
+        Args:
+            path: .npz file path
+        
+        Returns:
+            Fitted DimensionReducer
+        """
+        data = np.load(path)
+        reducer = cls(
+            target_dim=data["components"].shape[1],
+            method=str(data["method"]),
+            seed=int(data["seed"])
+        )
+        reducer.mean = data["mean"]
+        reducer.components = data["components"]
+        return reducer
+
+
+def load_collection_embeddings(collection) -> np.ndarray:
+    """
+    Read every stored vector from a vector store
+    
+    Args:
+        collection: Chroma collection or VectorStore (e.g. RAGEngine.collection)
+    
+    Returns:
+        float32 (N x D) matrix (empty when the collection is empty)
+    """
+    results = collection.get(include=["embeddings"])
+    embeddings = results.get("embeddings")
+    if embeddings is None or len(embeddings) == 0:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def recall_report(
+    matrix,
+    reducer: Optional[DimensionReducer] = None,
+    quantize: bool = False,
+    k: int = 10,
+    sample_size: int = 200,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Measure how well compressed vectors preserve nearest neighbours
+    
+    A sample of stored vectors is used as queries; recall@k is the share of
+    exact top-k neighbours (full float32 vectors) that the compressed
+    vectors also return.
+    
+    Args:
+        matrix: (N x D) stored embeddings
+        reducer: Fitted DimensionReducer (None keeps full dimension)
+        quantize: Also apply int8 quantization
+        k: Neighbours per query
+        sample_size: Number of query vectors sampled from the matrix
+        seed: Sampling seed
+    
+    Returns:
+        Dictionary with recall@k and per-vector sizes
+    """
+    exact = normalize_rows(matrix)
+    n_vectors, full_dim = exact.shape
+    k = min(k, n_vectors)
+    
+    rng = np.random.default_rng(seed)
+    query_idx = rng.choice(n_vectors, size=min(sample_size, n_vectors), replace=False)
+    
+    compressed = reducer.transform(exact) if reducer is not None else exact
+    if quantize:
+        compressed = normalize_rows(dequantize_int8(*quantize_int8(compressed)))
+    
+    exact_top, _ = top_k_similar(exact[query_idx], exact, k)
+    approx_top, _ = top_k_similar(compressed[query_idx], compressed, k)
+    
+    hits = sum(
+        len(set(exact_row.tolist()) & set(approx_row.tolist()))
+        for exact_row, approx_row in zip(exact_top, approx_top)
+    )
+    
+    dim = compressed.shape[1]
+    original_bytes = full_dim * 4
+    compressed_bytes = dim + 4 if quantize else dim * 4
+    
+    return {
+        "vectors": n_vectors,
+        "queries": len(query_idx),
+        "k": k,
+        "original_dim": full_dim,
+        "compressed_dim": dim,
+        "method": reducer.method if reducer is not None else "none",
+        "quantized": quantize,
+        "recall_at_k": hits / (len(query_idx) * k) if k else 0.0,
+        "bytes_per_vector": compressed_bytes,
+        "original_bytes_per_vector": original_bytes,
+        "compression_ratio": original_bytes / compressed_bytes
+    }
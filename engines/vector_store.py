@@ -0,0 +1,823 @@
+"""
+Pluggable vector stores: ChromaDB and an in-process NumPy/HNSW index
+"""
+import os
+import sys
+import glob
+import json
+import struct
+import threading
+import numpy as np
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from engines.vector_compression import quantize_int8
+
+try:
+    import hnswlib
+except ImportError:  # Optional: approximate search for large collections
+    hnswlib = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
+
+
+class VectorStore(ABC):
+    """
+    Interface implemented by every vector store backend
+    
+    Method names, arguments and result shapes follow the ChromaDB collection
+    API, so RAGEngine talks to every backend the same way. Distances are
+    squared L2 (Chroma's default space).
+    """
+    
+    @abstractmethod
+    def add(self, ids: List[str], embeddings, documents: List[str], metadatas: List[Dict[str, Any]]):
+        """Insert new records (existing IDs are left untouched)"""
+    
+    @abstractmethod
+    def upsert(self, ids: List[str], embeddings, documents: List[str], metadatas: List[Dict[str, Any]]):
+        """Insert or replace records"""
+    
+    @abstractmethod
+    def update(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        """Update metadata of existing records, keeping vectors and documents"""
+    
+    @abstractmethod
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch records
+        
+        Args:
+            ids: IDs to fetch (all records if omitted)
+            where: Metadata filter in Chroma syntax (see build_where)
+            include: Fields to return ("documents", "metadatas", "embeddings")
+        
+        Returns:
+            Dictionary with "ids" plus the included fields
+        """
+    
+    @abstractmethod
+    def query(
+        self,
+        query_embeddings,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Find nearest neighbours for each query vector
+        
+        Args:
+            query_embeddings: (N x D) query vectors
+            n_results: Neighbours per query
+            where: Metadata filter in Chroma syntax (see build_where)
+        
+        Returns:
+            Dictionary of "ids", "documents", "metadatas" and "distances",
+            each a list with one inner list per query
+        """
+    
+    @abstractmethod
+    def delete(self, ids: List[str]):
+        """Remove records"""
+    
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored records"""
+    
+    @abstractmethod
+    def reset(self):
+        """Remove every record"""
+
+
+class ChromaVectorStore(VectorStore):
+    """Vectors stored in a persistent ChromaDB collection"""
+    
+    def __init__(self, persist_directory: Optional[str] = None, collection_name: Optional[str] = None):
+        """
+        Initialize ChromaDB
+        
+        Args:
+            persist_directory: Chroma directory (defaults to Config.CHROMA_PERSIST_DIRECTORY)
+            collection_name: Collection name (defaults to Config.CHROMA_COLLECTION_NAME)
+        """
+        import chromadb
+        from chromadb.config import Settings
+        
+        self.collection_name = collection_name or Config.CHROMA_COLLECTION_NAME
+        
+        # Initialize ChromaDB with persistence
+        self.client = chromadb.PersistentClient(
+            path=persist_directory or Config.CHROMA_PERSIST_DIRECTORY,
+            settings=Settings(
+                anonymized_telemetry=False,
+                allow_reset=True
+            )
+        )
+        
+        # Get or create collection
+        self.collection = self.client.get_or_create_collection(
+            name=self.collection_name,
+            metadata={"description": "Test case knowledge base"}
+        )
+    
+    def add(self, ids, embeddings, documents, metadatas):
+        self.collection.add(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+    
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+    
+    def update(self, ids, metadatas):
+        # Documents are deliberately not passed: Chroma would re-embed them
+        self.collection.update(ids=ids, metadatas=metadatas)
+    
+    def get(self, ids=None, where=None, include=None):
+        kwargs: Dict[str, Any] = {"ids": ids}
+        if where:
+            kwargs["where"] = where
+        if include is not None:
+            kwargs["include"] = include
+        return self.collection.get(**kwargs)
+    
+    def query(self, query_embeddings, n_results=10, where=None):
+        if where:
+            return self.collection.query(query_embeddings=query_embeddings, n_results=n_results, where=where)
+        return self.collection.query(query_embeddings=query_embeddings, n_results=n_results)
+    
+    def delete(self, ids):
+        self.collection.delete(ids=ids)
+    
+    def count(self):
+        return self.collection.count()
+    
+    def reset(self):
+        self.client.delete_collection(self.collection_name)
+        self.collection = self.client.create_collection(
+            name=self.collection_name,
+            metadata={"description": "Test case knowledge base"}
+        )
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    In-process vector index persisted to a memory-mapped file and a record log
+    
+    The index file holds a 64-byte header, a float32 (capacity x dim) vector
+    block, and per-row int8 codes with their float32 scales. All of it is
+    memory-mapped, so worker processes share pages.
+    IDs, documents and metadata live in an append-only JSON-lines log next to
+    it. A row keeps its position until the file is compacted: adds and
+    upserts append rows, deletes only log a tombstone, so a change costs
+    O(records changed), not O(collection).
+    
+    Writers hold an exclusive flock on `<path>.lock`. A change writes the new
+    vectors and log lines first and the header (row count, committed log
+    length) last, so readers never see a partial change. Growing past the
+    capacity, or compacting once most rows are deleted, writes a new file
+    generation and publishes it with an atomic rename. Other handles catch up
+    on their next call by replaying the log tail.
+    
+    Search is exact (one matrix product over the mapped block). When hnswlib
+    is installed and the collection reaches Config.VECTOR_STORE_HNSW_MIN_ITEMS,
+    an in-memory HNSW graph labelled by row is used instead; deletes mark
+    labels deleted rather than rebuilding the graph. With quantize enabled,
+    the scan reads only the int8 codes (a quarter of the float32 bytes) and
+    the float32 rows of the best candidates are read for the re-rank.
+    """
+    
+    MAGIC = b"TCVSTOR3"
+    HEADER_FORMAT = "<8sIIQQQQ"  # magic, version, dim, capacity, rows, generation, committed log length
+    HEADER_SIZE = 64
+    VERSION = 3
+    MIN_CAPACITY = 64
+    RERANK_FACTOR = 4
+    SCAN_BLOCK = 8192
+    HNSW_M = 16
+    HNSW_EF_CONSTRUCTION = 200
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        quantize: Optional[bool] = None,
+        hnsw_min_items: Optional[int] = None
+    ):
+        """
+        Open (or lazily create) an index file
+        
+        Args:
+            path: Index file path (defaults to Config.VECTOR_STORE_PATH)
+            quantize: Scan the stored int8 codes then re-rank (defaults to Config.VECTOR_STORE_QUANTIZE)
+            hnsw_min_items: Collection size from which HNSW is used; 0 disables it
+                (defaults to Config.VECTOR_STORE_HNSW_MIN_ITEMS)
+        """
+        self.path = path or Config.VECTOR_STORE_PATH
+        self.quantize = quantize if quantize is not None else Config.VECTOR_STORE_QUANTIZE
+        self.hnsw_min_items = hnsw_min_items if hnsw_min_items is not None else Config.VECTOR_STORE_HNSW_MIN_ITEMS
+        
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._load()
+    
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    
+    def add(self, ids, embeddings, documents, metadatas):
+        with self._writer():
+            fresh = [i for i, record_id in enumerate(ids) if record_id not in self._index]
+            if fresh:
+                self._put(
+                    [ids[i] for i in fresh],
+                    np.atleast_2d(np.asarray(embeddings, dtype=np.float32))[fresh],
+                    [documents[i] for i in fresh],
+                    [metadatas[i] for i in fresh]
+                )
+    
+    def upsert(self, ids, embeddings, documents, metadatas):
+        with self._writer():
+            # Replaced records get a new row; the old one becomes a tombstone
+            self._put(ids, embeddings, documents, metadatas)
+    
+    def update(self, ids, metadatas):
+        with self._writer():
+            records = [
+                {"op": "update", "id": record_id, "metadata": dict(metadata)}
+                for record_id, metadata in zip(ids, metadatas)
+                if record_id in self._index
+            ]
+            if records:
+                self._commit(records, self._rows)
+    
+    def get(self, ids=None, where=None, include=None):
+        include = include if include is not None else ["metadatas", "documents"]
+        
+        with self._lock:
+            self._refresh()
+            if ids is None:
+                rows = self._live_rows().tolist()
+            else:
+                rows = [self._index[i] for i in ids if i in self._index]
+            if where:
+                rows = [r for r in rows if matches_where(self._metadatas[r], where)]
+            
+            return self._collect(rows, include)
+    
+    def query(self, query_embeddings, n_results=10, where=None):
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        
+        with self._lock:
+            self._refresh()
+            subset = None
+            if where:
+                # Filtered queries scan only the matching rows
+                subset = np.array([
+                    row for row in self._live_rows()
+                    if matches_where(self._metadatas[row], where)
+                ], dtype=np.int64)
+            elif self._count != self._rows:
+                subset = self._live_rows()
+            n_results = min(n_results, self._count if subset is None else len(subset))
+            
+            if n_results <= 0:
+                rows = [[] for _ in queries]
+                distances = [[] for _ in queries]
+            elif self._use_hnsw() and not where:
+                rows, distances = self._search_hnsw(queries, n_results)
+            else:
+                rows, distances = self._search_exact(queries, n_results, subset)
+            
+            results = {"ids": [], "documents": [], "metadatas": [], "distances": distances}
+            for query_rows in rows:
+                collected = self._collect(query_rows, ["documents", "metadatas"])
+                results["ids"].append(collected["ids"])
+                results["documents"].append(collected["documents"])
+                results["metadatas"].append(collected["metadatas"])
+            return results
+    
+    def delete(self, ids):
+        with self._writer():
+            records = [{"op": "delete", "id": record_id} for record_id in dict.fromkeys(ids) if record_id in self._index]
+            if not records:
+                return
+            self._commit(records, self._rows)
+            
+            if self._rows > self.MIN_CAPACITY and self._rows - self._count > self._count:
+                # Mostly tombstones: drop them instead of scanning them forever
+                self._rewrite(0, self._dim)
+    
+    def count(self):
+        with self._lock:
+            self._refresh()
+            return self._count
+    
+    def reset(self):
+        with self._writer():
+            self._release()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            for log_path in glob.glob(f"{glob.escape(self.path)}.*.log"):
+                os.remove(log_path)
+            self._load()
+    
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    
+    def _log_path(self, generation: int) -> str:
+        """Record log belonging to a file generation"""
+        return f"{self.path}.{generation}.log"
+    
+    def _layout(self, capacity: int, dim: int) -> tuple:
+        """Offsets of the scale and code blocks, and the file size, for a capacity"""
+        scales_offset = self.HEADER_SIZE + capacity * dim * 4
+        codes_offset = scales_offset + capacity * 4
+        return scales_offset, codes_offset, codes_offset + capacity * dim
+    
+    def _release(self):
+        """Drop the mappings of the current file (before it is replaced or removed)"""
+        self._vectors = None
+        self._codes = None
+        self._scales = None
+    
+    @contextmanager
+    def _writer(self):
+        """Hold the thread lock and the inter-process writer lock, caught up with the file"""
+        with self._lock:
+            with open(f"{self.path}.lock", "a+b") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    self._refresh()
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def _read_header(self, f) -> tuple:
+        """Read and check the header of an open index file"""
+        f.seek(0)
+        header = struct.unpack(self.HEADER_FORMAT, f.read(struct.calcsize(self.HEADER_FORMAT)))
+        if header[0] != self.MAGIC or header[1] != self.VERSION:
+            raise ValueError(f"Not a vector index file: {self.path}")
+        return header
+    
+    def _write_header(self, rows: int, log_length: int):
+        """Publish the row count and committed log length (always the last write of a change)"""
+        with open(self.path, "r+b") as f:
+            f.write(struct.pack(
+                self.HEADER_FORMAT, self.MAGIC, self.VERSION, self._dim,
+                self._capacity, rows, self._generation, log_length
+            ))
+    
+    def _load(self):
+        """Read the index file (or start empty if it does not exist)"""
+        self._ids: List[Optional[str]] = []
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        self._index: Dict[str, int] = {}
+        self._dim = 0
+        self._capacity = 0
+        self._rows = 0
+        self._count = 0
+        self._generation = 0
+        self._log_length = 0
+        self._inode = None
+        self._vectors: Optional[np.ndarray] = None
+        self._live = np.zeros(0, dtype=bool)
+        self._sq_norms = np.zeros(0, dtype=np.float32)
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._hnsw = None
+        
+        for _ in range(3):
+            try:
+                with open(self.path, "r+b") as f:
+                    _, _, dim, capacity, rows, generation, log_length = self._read_header(f)
+                    inode = os.fstat(f.fileno()).st_ino
+                    # Map through the open handle so vectors and header come from the same file
+                    scales_offset, codes_offset, _ = self._layout(capacity, dim)
+                    vectors = np.memmap(
+                        f, dtype=np.float32, mode="r+",
+                        offset=self.HEADER_SIZE, shape=(capacity, dim)
+                    )
+                    scales = np.memmap(f, dtype=np.float32, mode="r+", offset=scales_offset, shape=(capacity,))
+                    codes = np.memmap(f, dtype=np.int8, mode="r+", offset=codes_offset, shape=(capacity, dim))
+                with open(self._log_path(generation), "rb") as log:
+                    payload = log.read(log_length)
+                break
+            except FileNotFoundError:
+                if not os.path.exists(self.path):
+                    return
+                # A writer replaced the file between reading the header and the log
+        else:
+            raise RuntimeError(f"Vector index kept changing while loading: {self.path}")
+        
+        self._dim, self._capacity = dim, capacity
+        self._generation, self._log_length, self._inode = generation, log_length, inode
+        self._vectors, self._codes, self._scales = vectors, codes, scales
+        self._live = np.zeros(capacity, dtype=bool)
+        self._sq_norms = np.zeros(capacity, dtype=np.float32)
+        self._apply(self._parse(payload), rows)
+    
+    def _refresh(self):
+        """Catch up with changes other handles made since the last call"""
+        try:
+            if os.stat(self.path).st_ino != self._inode:
+                self._release()
+                self._load()
+                return
+            
+            with open(self.path, "rb") as f:
+                _, _, _, capacity, rows, generation, log_length = self._read_header(f)
+            if generation != self._generation or capacity != self._capacity or log_length < self._log_length:
+                self._release()
+                self._load()
+            elif log_length > self._log_length:
+                with open(self._log_path(generation), "rb") as log:
+                    log.seek(self._log_length)
+                    payload = log.read(log_length - self._log_length)
+                self._apply(self._parse(payload), rows)
+                self._log_length = log_length
+        except FileNotFoundError:
+            # Reset or replaced by another handle
+            if self._inode is not None or os.path.exists(self.path):
+                self._release()
+                self._load()
+    
+    @staticmethod
+    def _parse(payload: bytes) -> List[Dict[str, Any]]:
+        """Decode committed log lines"""
+        return [json.loads(line) for line in payload.decode("utf-8").splitlines() if line]
+    
+    def _commit(self, records: List[Dict[str, Any]], rows: int):
+        """Append log records, then publish them with the header"""
+        payload = "".join(json.dumps(record, default=str) + "\n" for record in records).encode("utf-8")
+        
+        with open(self._log_path(self._generation), "r+b") as log:
+            log.seek(self._log_length)
+            log.write(payload)
+            log.truncate()  # drop anything a crashed writer left past the committed length
+        
+        log_length = self._log_length + len(payload)
+        self._write_header(rows, log_length)
+        self._apply(records, rows)
+        self._log_length = log_length
+    
+    def _rewrite(self, extra: int, dim: int):
+        """
+        Write a new file generation holding only live rows, with room for `extra` more
+        
+        Args:
+            extra: Rows to reserve beyond the live ones
+            dim: Vector dimension of the new generation
+        """
+        live_rows = self._live_rows()
+        count = len(live_rows)
+        capacity = max(self.MIN_CAPACITY, self._capacity)
+        while capacity < count + extra:
+            capacity *= 2
+        generation = self._generation + 1
+        
+        records = [
+            {"op": "put", "row": new_row, "id": self._ids[row], "document": self._documents[row], "metadata": self._metadatas[row]}
+            for new_row, row in enumerate(live_rows.tolist())
+        ]
+        payload = "".join(json.dumps(record, default=str) + "\n" for record in records).encode("utf-8")
+        with open(self._log_path(generation), "wb") as log:
+            log.write(payload)
+            log.flush()
+            os.fsync(log.fileno())
+        
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(struct.pack(
+                self.HEADER_FORMAT, self.MAGIC, self.VERSION, dim,
+                capacity, count, generation, len(payload)
+            ).ljust(self.HEADER_SIZE, b"\0"))
+            for start in range(0, count, self.SCAN_BLOCK):
+                f.write(np.ascontiguousarray(self._vectors[live_rows[start:start + self.SCAN_BLOCK]]).tobytes())
+            
+            # Codes and scales are copied as stored, not re-quantized
+            scales_offset, codes_offset, size = self._layout(capacity, dim)
+            f.truncate(size)
+            if count:
+                f.seek(scales_offset)
+                f.write(np.ascontiguousarray(self._scales[live_rows]).tobytes())
+                f.seek(codes_offset)
+                for start in range(0, count, self.SCAN_BLOCK):
+                    f.write(np.ascontiguousarray(self._codes[live_rows[start:start + self.SCAN_BLOCK]]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        
+        # Labels only survive when no row moved
+        hnsw = self._hnsw if count == self._rows else None
+        old_log = self._log_path(self._generation) if self._inode is not None else None
+        
+        self._release()  # before replacing the file
+        os.replace(temp_path, self.path)
+        if old_log and os.path.exists(old_log):
+            os.remove(old_log)
+        
+        self._load()
+        if hnsw is not None:
+            hnsw.resize_index(self._capacity)
+            self._hnsw = hnsw
+    
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+    
+    def _live_rows(self) -> np.ndarray:
+        """Row numbers of records that are not deleted, in row order"""
+        return np.flatnonzero(self._live[:self._rows])
+    
+    def _put(self, ids, embeddings, documents, metadatas):
+        """Write records into new rows after the last one"""
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if self._count and embeddings.shape[1] != self._dim:
+            raise ValueError(f"Embedding dimension {embeddings.shape[1]} does not match index dimension {self._dim}")
+        
+        if self._vectors is None or embeddings.shape[1] != self._dim or self._rows + len(ids) > self._capacity:
+            self._rewrite(len(ids), embeddings.shape[1])
+        
+        start = self._rows
+        end = start + len(ids)
+        self._vectors[start:end] = embeddings
+        self._codes[start:end], self._scales[start:end] = quantize_int8(embeddings)
+        self._vectors.flush()
+        self._codes.flush()
+        self._scales.flush()
+        self._commit([
+            {"op": "put", "row": start + offset, "id": record_id, "document": document, "metadata": dict(metadata)}
+            for offset, (record_id, document, metadata) in enumerate(zip(ids, documents, metadatas))
+        ], start + len(ids))
+    
+    def _apply(self, records: List[Dict[str, Any]], rows: int):
+        """
+        Apply log records to the in-memory state
+        
+        Args:
+            records: Decoded log records
+            rows: Row count published with them
+        """
+        start = self._rows
+        if rows > start:
+            self._ids.extend([None] * (rows - start))
+            self._documents.extend([None] * (rows - start))
+            self._metadatas.extend([None] * (rows - start))
+            block = np.asarray(self._vectors[start:rows])
+            self._sq_norms[start:rows] = np.einsum("ij,ij->i", block, block)
+        
+        removed = []
+        for record in records:
+            op = record["op"]
+            if op == "put":
+                previous = self._index.get(record["id"])
+                if previous is not None:
+                    self._drop(previous)
+                    removed.append(previous)
+                row = record["row"]
+                self._ids[row] = record["id"]
+                self._documents[row] = record["document"]
+                self._metadatas[row] = record["metadata"]
+                self._live[row] = True
+                self._index[record["id"]] = row
+            elif op == "update":
+                row = self._index.get(record["id"])
+                if row is not None:
+                    self._metadatas[row].update(record["metadata"])
+            elif op == "delete":
+                row = self._index.pop(record["id"], None)
+                if row is not None:
+                    self._drop(row)
+                    removed.append(row)
+        
+        self._rows = max(rows, start)
+        self._count = len(self._index)
+        
+        if self._hnsw is not None:
+            added = [row for row in range(start, self._rows) if self._live[row]]
+            if added:
+                if self._rows > self._hnsw.get_max_elements():
+                    self._hnsw.resize_index(self._capacity)
+                self._hnsw.add_items(self._vectors[added], np.array(added))
+            for row in removed:
+                if row < start:
+                    self._hnsw.mark_deleted(row)
+    
+    def _drop(self, row: int):
+        """Turn a row into a tombstone"""
+        self._index.pop(self._ids[row], None)
+        self._live[row] = False
+        self._ids[row] = None
+        self._documents[row] = None
+        self._metadatas[row] = None
+    
+    def _collect(self, rows: List[int], include: List[str]) -> Dict[str, Any]:
+        """Build a Chroma-shaped result for the given rows"""
+        result: Dict[str, Any] = {"ids": [self._ids[r] for r in rows]}
+        if "documents" in include:
+            result["documents"] = [self._documents[r] for r in rows]
+        if "metadatas" in include:
+            result["metadatas"] = [dict(self._metadatas[r]) for r in rows]
+        if "embeddings" in include:
+            if rows:
+                result["embeddings"] = np.array(self._vectors[rows], dtype=np.float32)
+            else:
+                result["embeddings"] = np.zeros((0, self._dim), dtype=np.float32)
+        return result
+    
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    
+    def _distances(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Squared L2 distances (N x M) between queries and stored rows"""
+        if rows is None:
+            vectors = self._vectors[:self._rows]
+            sq_norms = self._sq_norms[:self._rows]
+        else:
+            vectors = self._vectors[rows]
+            sq_norms = self._sq_norms[rows]
+        
+        q_sq_norms = np.einsum("ij,ij->i", queries, queries)
+        distances = q_sq_norms[:, None] + sq_norms[None, :] - 2 * (queries @ vectors.T)
+        return np.maximum(distances, 0)
+    
+    @staticmethod
+    def _smallest(distances: np.ndarray, k: int) -> np.ndarray:
+        """Column indices of the k smallest entries of each row, nearest first"""
+        if k < distances.shape[1]:
+            candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.tile(np.arange(distances.shape[1]), (distances.shape[0], 1))
+        order = np.argsort(np.take_along_axis(distances, candidates, axis=1), axis=1)
+        return np.take_along_axis(candidates, order, axis=1)
+    
+    def _search_exact(self, queries: np.ndarray, n_results: int, subset: Optional[np.ndarray] = None):
+        """Brute-force search over all rows or a subset (int8 candidate selection when quantized)"""
+        if not self.quantize:
+            distances = self._distances(queries, subset)
+            nearest = self._smallest(distances, n_results)
+            rows = nearest if subset is None else subset[nearest]
+            return rows.tolist(), np.take_along_axis(distances, nearest, axis=1).tolist()
+        
+        # Approximate scores on int8 codes, then exact re-rank of the best candidates
+        size = self._rows if subset is None else len(subset)
+        n_candidates = min(size, n_results * self.RERANK_FACTOR)
+        approx = np.empty((len(queries), size), dtype=np.float32)
+        for start in range(0, size, self.SCAN_BLOCK):
+            end = min(start + self.SCAN_BLOCK, size)
+            block_rows = slice(start, end) if subset is None else subset[start:end]
+            block = self._codes[block_rows].astype(np.float32)
+            approx[:, start:end] = (queries @ block.T) * self._scales[block_rows]
+        candidates = self._smallest(-approx, n_candidates)
+        if subset is not None:
+            candidates = subset[candidates]
+        
+        rows, distances = [], []
+        for query, query_candidates in zip(queries, candidates):
+            exact = self._distances(query[None, :], query_candidates)
+            nearest = self._smallest(exact, n_results)[0]
+            rows.append(query_candidates[nearest].tolist())
+            distances.append(exact[0, nearest].tolist())
+        return rows, distances
+    
+    def _use_hnsw(self) -> bool:
+        """Whether the collection is large enough for the HNSW graph"""
+        return hnswlib is not None and self.hnsw_min_items > 0 and self._count >= self.hnsw_min_items
+    
+    def _search_hnsw(self, queries: np.ndarray, n_results: int):
+        """Approximate search on the HNSW graph (built on first use, labelled by row)"""
+        if self._hnsw is None:
+            live_rows = self._live_rows()
+            index = hnswlib.Index(space="l2", dim=self._dim)
+            index.init_index(max_elements=self._capacity, ef_construction=self.HNSW_EF_CONSTRUCTION, M=self.HNSW_M)
+            index.add_items(self._vectors[live_rows], live_rows)
+            self._hnsw = index
+        
+        self._hnsw.set_ef(max(Config.VECTOR_STORE_HNSW_EF_SEARCH, n_results))
+        try:
+            labels, distances = self._hnsw.knn_query(queries, k=n_results)
+        except RuntimeError:
+            # Too few reachable labels around deleted ones; answer exactly instead
+            subset = self._live_rows() if self._count != self._rows else None
+            return self._search_exact(queries, n_results, subset)
+        return labels.astype(np.int64).tolist(), distances.tolist()
+
+
+def build_where(
+    suite_name: Optional[str] = None,
+    priorities: Optional[List[str]] = None,
+    test_types: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    is_regression: Optional[bool] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Translate test case filters into a Chroma `where` clause
+    
+    Args:
+        suite_name: Only cases stored for this suite
+        priorities: Allowed priorities
+        test_types: Allowed test types
+        tags: Case must have at least one of these tags
+        is_regression: Only regression (True) or non-regression (False) cases
+    
+    Returns:
+        Where clause, or None when no filter is given
+    """
+    conditions: List[Dict[str, Any]] = []
+    
+    if suite_name:
+        conditions.append({"suite_name": suite_name})
+    if priorities:
+        conditions.append({"priority": {"$in": list(priorities)}})
+    if test_types:
+        conditions.append({"test_type": {"$in": list(test_types)}})
+    if tags:
+        tag_conditions = [{tag_key(tag): True} for tag in tags]
+        conditions.append(tag_conditions[0] if len(tag_conditions) == 1 else {"$or": tag_conditions})
+    if is_regression is not None:
+        conditions.append({"is_regression": is_regression})
+    
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+def tag_key(tag: str) -> str:
+    """Metadata key marking a tag (metadata values must be scalars, so each tag gets a flag)"""
+    return f"tag:{tag}"
+
+
+def matches_where(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """
+    Evaluate a Chroma `where` clause against one metadata dictionary
+    
+    Supports $and, $or, $eq, $ne, $in, $nin and implicit equality.
+    
+    Args:
+        metadata: Record metadata
+        where: Where clause
+    
+    Returns:
+        True if the record matches
+    """
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, c) for c in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, c) for c in condition):
+                return False
+        else:
+            value = metadata.get(key)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for operator, operand in condition.items():
+                if operator == "$eq":
+                    matched = value == operand
+                elif operator == "$ne":
+                    matched = value != operand
+                elif operator == "$in":
+                    matched = value in operand
+                elif operator == "$nin":
+                    matched = value not in operand
+                else:
+                    raise ValueError(f"Unsupported where operator: {operator}")
+                if not matched:
+                    return False
+    return True
+
+
+def get_vector_store(backend: Optional[str] = None) -> VectorStore:
+    """
+    Create the configured vector store
+    
+    Args:
+        backend: "chroma" or "numpy" (defaults to Config.VECTOR_STORE_BACKEND)
+    
+    Returns:
+        VectorStore instance
+    """
+    backend = (backend or Config.VECTOR_STORE_BACKEND).lower()
+    
+    if backend == "chroma":
+        return ChromaVectorStore()
+    elif backend == "numpy":
+        return NumpyVectorStore()
+    else:
+        raise ValueError(f"Unsupported vector store backend: {backend}")
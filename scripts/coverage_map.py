@@ -0,0 +1,59 @@
+"""
+Script to print a coverage map of the stored test cases
+Clusters the vectors in the RAG collection and lists per-cluster counts by
+test type, priority and business rule, flagging sparse, over-populated and
+redundant clusters
+
+Usage: python scripts/coverage_map.py [--suite NAME] [--clusters K] [--json PATH]
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.rag_engine import RAGEngine
+from engines.clustering import build_coverage_map
+from core.utils import save_json
+
+
+def coverage_map(suite_name=None, k=None, json_path=None):
+    """Build and print the coverage map"""
+    print("=" * 70)
+    print("TEST CASE COVERAGE MAP" + (f" - {suite_name}" if suite_name else ""))
+    print("=" * 70)
+    
+    report = build_coverage_map(RAGEngine().collection, suite_name=suite_name, k=k)
+    if not report["total_test_cases"]:
+        print("\n No test cases stored - import test cases first")
+        return report
+    
+    print(f" {report['total_test_cases']} test cases in {report['cluster_count']} clusters "
+          f"(average {report['average_cluster_size']})\n")
+    
+    for cluster in report["clusters"]:
+        flags = [flag for flag in ("sparse", "over_populated", "redundant") if cluster[flag]]
+        print(f" Cluster {cluster['cluster']:>3}  size {cluster['size']:>5}  cohesion {cluster['cohesion']:.3f}"
+              + (f"  [{', '.join(flags)}]" if flags else ""))
+        print(f"   e.g. {cluster['representative_titles'][0]}")
+        print(f"   types: {cluster['test_types']}  priorities: {cluster['priorities']}")
+        for rule, count in list(cluster["business_rules"].items())[:3]:
+            print(f"   rule ({count}): {rule[:80]}")
+    
+    if json_path:
+        save_json(report, json_path)
+        print(f"\n Report saved to {json_path}")
+    
+    print("=" * 70)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cluster stored test cases and report coverage")
+    parser.add_argument("--suite", help="Only map this suite")
+    parser.add_argument("--clusters", type=int, help="Number of clusters")
+    parser.add_argument("--json", help="Also save the report as JSON")
+    args = parser.parse_args()
+    
+    coverage_map(suite_name=args.suite, k=args.clusters, json_path=args.json)
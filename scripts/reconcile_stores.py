@@ -0,0 +1,62 @@
+"""
+Script to reconcile the RAG vector store with the knowledge base
+Re-embeds test cases that are missing or whose text changed, rewrites
+outdated metadata and deletes records that no longer exist in any suite,
+instead of resetting the store and re-importing everything.
+Run it once after upgrading: it also adds the suite, tag flags and
+payload to records stored before filtered search existed.
+
+Usage: python scripts/reconcile_stores.py [--dry-run] [--keep-orphans] [--batch-size N]
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.knowledge_base import KnowledgeBase
+from engines.rag_engine import RAGEngine
+from engines.reconciliation import StoreReconciler
+
+
+def reconcile_stores(dry_run: bool = False, delete_orphans: bool = True, batch_size: int = 256):
+    """Diff both stores and repair the vector store"""
+    print("=" * 70)
+    print("KNOWLEDGE BASE / VECTOR STORE RECONCILIATION" + (" (DRY RUN)" if dry_run else ""))
+    print("=" * 70)
+    
+    reconciler = StoreReconciler(RAGEngine(), KnowledgeBase(), batch_size=batch_size)
+    result = reconciler.reconcile(dry_run=dry_run, delete_orphans=delete_orphans)
+    
+    labels = {
+        "missing": "Missing from vector store (embed)",
+        "stale": "Text changed (re-embed)",
+        "metadata": "Metadata outdated (rewrite)",
+        "orphaned": "Not in knowledge base (delete)" if delete_orphans else "Not in knowledge base (kept)"
+    }
+    for key, label in labels.items():
+        print(f" {label:<40} {result['counts'][key]:>6}")
+        for test_case_id in result["ids"][key][:10]:
+            print(f"   - {test_case_id}")
+        if result["counts"][key] > 10:
+            print(f"   ... {result['counts'][key] - 10} more")
+    
+    for error in result["errors"]:
+        print(f" ❌ {error}")
+    if not result["errors"] and not dry_run:
+        print("\n ✓ Stores are in sync")
+    
+    print("=" * 70)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile the vector store with the knowledge base")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the differences")
+    parser.add_argument("--keep-orphans", action="store_true", help="Do not delete records missing from the knowledge base")
+    parser.add_argument("--batch-size", type=int, default=256, help="Test cases embedded per call")
+    args = parser.parse_args()
+    
+    result = reconcile_stores(dry_run=args.dry_run, delete_orphans=not args.keep_orphans, batch_size=args.batch_size)
+    sys.exit(1 if result["errors"] else 0)
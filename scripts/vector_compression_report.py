@@ -0,0 +1,62 @@
+"""
+Script to report recall versus size for compressed embeddings
+Fits PCA / random projections on the vectors stored in the RAG collection
+and measures how well each setting (optionally int8-quantized) preserves
+the exact top-k neighbours
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from engines.rag_engine import RAGEngine
+from engines.vector_compression import DimensionReducer, load_collection_embeddings, recall_report
+
+
+TARGET_DIMS = [768, 384, 256, 128, 64]
+TOP_K = 10
+
+
+def vector_compression_report():
+    """Print recall@k and bytes per vector for each compression setting"""
+    print("=" * 70)
+    print("VECTOR COMPRESSION REPORT")
+    print("=" * 70)
+    
+    matrix = load_collection_embeddings(RAGEngine().collection)
+    if len(matrix) < 2:
+        print("\n Not enough vectors in the collection - import test cases first")
+        return
+    
+    n_vectors, full_dim = matrix.shape
+    print(f" Collection: {Config.CHROMA_PERSIST_DIRECTORY} ({n_vectors} vectors, {full_dim} dims)")
+    print(f" Recall measured against exact float32 search, k={TOP_K}\n")
+    
+    settings = [(None, False), (None, True)]
+    for dim in TARGET_DIMS:
+        if dim >= full_dim:
+            continue
+        for method in DimensionReducer.METHODS:
+            # PCA cannot produce more components than samples
+            if method == "pca" and dim > n_vectors:
+                continue
+            reducer = DimensionReducer(dim, method=method).fit(matrix)
+            settings.append((reducer, False))
+            settings.append((reducer, True))
+    
+    print(f" {'Method':<8} {'Dims':>6} {'int8':>5} {'Recall@k':>9} {'Bytes':>7} {'Ratio':>7}")
+    print(" " + "-" * 46)
+    for reducer, quantize in settings:
+        report = recall_report(matrix, reducer=reducer, quantize=quantize, k=TOP_K)
+        print(
+            f" {report['method']:<8} {report['compressed_dim']:>6} {'yes' if quantize else 'no':>5} "
+            f"{report['recall_at_k']:>9.3f} {report['bytes_per_vector']:>7} {report['compression_ratio']:>6.1f}x"
+        )
+    
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    vector_compression_report()
@@ -0,0 +1,80 @@
+"""
+Script to compare query latency of the vector store backends
+Copies the vectors stored in the Chroma collection into temporary in-process
+indexes (exact, int8 re-rank, HNSW) and times the same queries on each, to
+help choose VECTOR_STORE_BACKEND for a deployment
+"""
+import sys
+import os
+import time
+import tempfile
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.vector_store import ChromaVectorStore, NumpyVectorStore, hnswlib
+
+
+NUM_QUERIES = 50
+TOP_K = 10
+
+
+def time_queries(store, queries) -> float:
+    """Average milliseconds per single-vector query"""
+    start = time.perf_counter()
+    for query in queries:
+        store.query(query_embeddings=query[None, :], n_results=TOP_K)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def vector_store_benchmark():
+    """Print per-query latency for each backend on the current collection"""
+    print("=" * 70)
+    print("VECTOR STORE BENCHMARK")
+    print("=" * 70)
+    
+    chroma = ChromaVectorStore()
+    stored = chroma.get(include=["embeddings", "documents", "metadatas"])
+    if len(stored["ids"]) == 0:
+        print("\n Collection is empty - import test cases first")
+        return
+    
+    vectors = np.asarray(stored["embeddings"], dtype=np.float32)
+    rng = np.random.default_rng(0)
+    queries = vectors[rng.choice(len(vectors), size=min(NUM_QUERIES, len(vectors)), replace=False)]
+    print(f" Collection: {len(vectors)} vectors, {vectors.shape[1]} dims, {len(queries)} queries, k={TOP_K}\n")
+    
+    timings = [("chroma", time_queries(chroma, queries))]
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        variants = [("numpy exact", False, 0), ("numpy int8", True, 0)]
+        if hnswlib is not None:
+            variants.append(("numpy hnsw", False, 1))
+        else:
+            print(" hnswlib not installed - skipping HNSW\n")
+        
+        for name, quantize, hnsw_min_items in variants:
+            store = NumpyVectorStore(
+                path=os.path.join(tmp_dir, f"{name.replace(' ', '_')}.idx"),
+                quantize=quantize,
+                hnsw_min_items=hnsw_min_items
+            )
+            store.add(
+                ids=stored["ids"],
+                embeddings=vectors,
+                documents=stored["documents"],
+                metadatas=stored["metadatas"]
+            )
+            store.query(query_embeddings=queries[:1], n_results=TOP_K)  # warm up (builds HNSW graph)
+            timings.append((name, time_queries(store, queries)))
+    
+    print(f" {'Backend':<14} {'ms/query':>10}")
+    print(" " + "-" * 25)
+    for name, ms in timings:
+        print(f" {name:<14} {ms:>10.2f}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    vector_store_benchmark()
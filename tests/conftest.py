@@ -0,0 +1,157 @@
+"""
+Shared test fakes and fixtures; keeps engine caches out of the working tree
+"""
+import sys
+import os
+import pytest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from core.knowledge_base import KnowledgeBase
+from core.models import TestCase, TestStep
+from engines import decision_store, embedding_cache, llm_cache
+from engines.embedding_cache import EmbeddingCache
+from engines.embedding_providers import LocalEmbeddingProvider
+from engines.embeddings import EmbeddingGenerator
+from engines.rag_engine import RAGEngine
+
+
+EXPANDED_ANALYSIS = {
+    "business_rule_match": True, "behavior_match": True, "coverage_expansion": ["lockout after 5 attempts"],
+    "relationship": "expanded", "reasoning": "Adds the lockout scenario"
+}
+DIFFERENT_ANALYSIS = {
+    "business_rule_match": False, "behavior_match": False, "coverage_expansion": [],
+    "relationship": "different", "reasoning": "Other feature"
+}
+
+
+class CountingProvider(LocalEmbeddingProvider):
+    """Local provider that records how many texts it embedded"""
+    
+    def __init__(self):
+        super().__init__(dimension=128)
+        self.embedded_texts = 0
+    
+    def embed(self, texts):
+        self.embedded_texts += len(texts)
+        return super().embed(texts)
+
+
+def make_test_case(test_case_id: str, title: str, action: str) -> TestCase:
+    """Build a small test case"""
+    return TestCase(
+        id=test_case_id,
+        title=title,
+        description=f"Verify {title.lower()}",
+        business_rule="Only authenticated users can access the system",
+        test_steps=[TestStep(step_number=1, action=action, expected_result="Request handled")],
+        expected_outcome="Request handled",
+        tags=["auth"],
+        priority="High"
+    )
+
+
+def make_engine(persist_directory: str, provider=None):
+    """Create an isolated RAG engine backed by a temporary Chroma directory"""
+    provider = provider or CountingProvider()
+    generator = EmbeddingGenerator(
+        cache=EmbeddingCache(path=":memory:", max_bytes=1024 * 1024, memory_items=0),
+        provider=provider
+    )
+    
+    original_directory = Config.CHROMA_PERSIST_DIRECTORY
+    Config.CHROMA_PERSIST_DIRECTORY = persist_directory
+    try:
+        engine = RAGEngine(embedding_generator=generator)
+    finally:
+        Config.CHROMA_PERSIST_DIRECTORY = original_directory
+    
+    return engine, provider
+
+
+def login_pair(new_id: str = "new", existing_id: str = "old"):
+    """A new login case and the existing login case it is compared with"""
+    return (
+        make_test_case(new_id, "Login with valid credentials", "Submit valid username and password"),
+        make_test_case(existing_id, "Login flow", "Enter username then password and submit")
+    )
+
+
+def make_knowledge_base(base_path: str) -> KnowledgeBase:
+    """Create a knowledge base stored in a temporary directory"""
+    original_path = Config.KNOWLEDGE_BASE_PATH
+    Config.KNOWLEDGE_BASE_PATH = base_path
+    try:
+        return KnowledgeBase()
+    finally:
+        Config.KNOWLEDGE_BASE_PATH = original_path
+
+
+class FakeChatClient:
+    """Chat client that returns canned responses and records prompts"""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+    
+    def _create(self, model, messages, **kwargs):
+        self.prompts.append(messages[-1]["content"])
+        content = self.responses.pop(0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def make_comparison_engine(responses):
+    """ComparisonEngine with a fake chat client (no network)"""
+    from engines.comparison_engine import ComparisonEngine
+    
+    # No response cache or decision store: nothing is opened on disk
+    settings = ("AZURE_OPENAI_API_KEY", "AZURE_OPENAI_ENDPOINT", "LLM_CACHE_ENABLED", "DECISION_STORE_ENABLED")
+    original = {name: getattr(Config, name) for name in settings}
+    Config.AZURE_OPENAI_API_KEY, Config.AZURE_OPENAI_ENDPOINT = "test-key", "https://example.invalid"
+    Config.LLM_CACHE_ENABLED = Config.DECISION_STORE_ENABLED = False
+    try:
+        engine = ComparisonEngine()
+    finally:
+        for name, value in original.items():
+            setattr(Config, name, value)
+    engine.client = FakeChatClient(responses)
+    return engine
+
+
+CACHE_SETTINGS = {
+    "CACHE_DIRECTORY": "",
+    "EMBEDDING_CACHE_PATH": "embeddings.db",
+    "LLM_CACHE_PATH": "llm_responses.db",
+    "DECISION_STORE_PATH": "decisions.db",
+    "VECTOR_STORE_PATH": "test_cases.idx"
+}
+
+
+def reset_shared_caches():
+    """Drop the process-wide caches so the next engine opens them under the current paths"""
+    for module, name in ((embedding_cache, "_shared_cache"), (llm_cache, "_shared_cache"), (decision_store, "_shared_store")):
+        shared = getattr(module, name)
+        if shared is not None:
+            shared.close()
+        setattr(module, name, None)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache_directory(tmp_path_factory):
+    """Point every cache and index path at a temporary directory for the whole run"""
+    directory = str(tmp_path_factory.mktemp("cache"))
+    original = {name: getattr(Config, name) for name in CACHE_SETTINGS}
+    
+    for name, filename in CACHE_SETTINGS.items():
+        setattr(Config, name, os.path.join(directory, filename) if filename else directory)
+    reset_shared_caches()
+    
+    yield directory
+    
+    reset_shared_caches()
+    for name, value in original.items():
+        setattr(Config, name, value)
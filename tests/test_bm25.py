@@ -0,0 +1,72 @@
+"""
+Test: BM25 index and reciprocal rank fusion
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.bm25 import BM25Index, reciprocal_rank_fusion
+
+
+def make_index() -> BM25Index:
+    """Index a few short documents"""
+    index = BM25Index()
+    index.add("login", "Login with valid credentials and submit password", {"suite_name": "web"})
+    index.add("export", "Export sales report to a spreadsheet", {"suite_name": "web"})
+    index.add("reset", "Request a password reset email", {"suite_name": "mobile"})
+    return index
+
+
+def test_ranks_by_term_overlap():
+    """Documents sharing rarer query terms rank higher; unrelated ones are omitted"""
+    index = make_index()
+    
+    results = index.search("submit login credentials", top_k=3)
+    
+    assert [doc_id for doc_id, _ in results] == ["login"]
+    assert [doc_id for doc_id, _ in index.search("password", top_k=3)] in (["login", "reset"], ["reset", "login"])
+    assert index.search("unrelated words") == []
+
+
+def test_replace_and_remove():
+    """Re-adding replaces a document and removing drops it from results"""
+    index = make_index()
+    
+    index.add("export", "Password export", {"suite_name": "web"})
+    assert "export" in [doc_id for doc_id, _ in index.search("password")]
+    assert index.search("spreadsheet") == []
+    
+    index.remove("export")
+    assert "export" not in index
+    assert len(index) == 2
+    
+    index.clear()
+    assert index.search("password") == []
+
+
+def test_where_filter_and_metadata_update():
+    """Searches honour metadata filters, including merged updates"""
+    index = make_index()
+    
+    assert [doc_id for doc_id, _ in index.search("password", where={"suite_name": "mobile"})] == ["reset"]
+    
+    index.update_metadata("login", {"suite_name": "mobile"})
+    assert {doc_id for doc_id, _ in index.search("password", where={"suite_name": "mobile"})} == {"login", "reset"}
+
+
+def test_reciprocal_rank_fusion():
+    """Items ranked well in several lists come first"""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+    
+    assert fused[0][0] == "b"
+    assert {doc_id for doc_id, _ in fused} == {"a", "b", "c", "d"}
+    assert abs(fused[0][1] - (1 / 62 + 1 / 61)) < 1e-12
+
+
+if __name__ == "__main__":
+    test_ranks_by_term_overlap()
+    test_replace_and_remove()
+    test_where_filter_and_metadata_update()
+    test_reciprocal_rank_fusion()
+    print("✅ All BM25 tests passed")
@@ -0,0 +1,86 @@
+"""
+Test: re-ranking of retrieved candidates and batched candidate comparison
+"""
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from core.models import DecisionType
+from engines.candidate_ranking import field_overlap, rank_candidates
+from tests.conftest import DIFFERENT_ANALYSIS, EXPANDED_ANALYSIS, make_comparison_engine, make_test_case
+
+
+def test_field_overlap_prefers_shared_rule_and_steps():
+    """Cases sharing rule and steps overlap more than cases sharing only the rule"""
+    new = make_test_case("new", "Login with valid credentials", "Submit valid username and password")
+    same_steps = make_test_case("a", "Sign in", "Submit valid username and password")
+    other_steps = make_test_case("b", "Export sales report", "Click export and download spreadsheet")
+    
+    assert field_overlap(new, new) == 1.0
+    assert field_overlap(new, same_steps) > field_overlap(new, other_steps)
+
+
+def test_rank_candidates_keeps_close_contenders():
+    """Candidates within the margin of the best are kept, weak ones are dropped"""
+    new = make_test_case("new", "Login with valid credentials", "Submit valid username and password")
+    close = make_test_case("close", "Login with valid credentials", "Submit valid username and password")
+    second = make_test_case("second", "Login with valid user", "Submit valid username and password")
+    far = make_test_case("far", "Export sales report", "Click export and download spreadsheet")
+    candidates = [
+        ({"id": "far", "similarity": 0.90}, far),
+        ({"id": "close", "similarity": 0.88}, close),
+        ({"id": "second", "similarity": 0.86}, second),
+        ({"id": "weak", "similarity": Config.THRESHOLD_ADDON_MIN - 0.1}, close),
+    ]
+    
+    shortlist = rank_candidates(new, candidates, max_candidates=3, margin=0.05, semantic_weight=0.7)
+    assert [c["hit"]["id"] for c in shortlist] == ["close", "second"]
+    assert shortlist[0]["rank_score"] >= shortlist[1]["rank_score"]
+    
+    assert len(rank_candidates(new, candidates, max_candidates=1, margin=1.0)) == 1
+    assert rank_candidates(new, candidates[3:]) == []
+
+
+def test_compare_against_candidates_uses_one_analysis_call():
+    """The best decision across candidates wins from a single analysis call"""
+    new = make_test_case("new", "Login with valid credentials", "Submit valid username and password")
+    first = make_test_case("first", "Login", "Submit username")
+    second = make_test_case("second", "Login with valid credentials", "Submit valid username and password twice")
+    analyses = [dict(DIFFERENT_ANALYSIS, candidate_id="first"), dict(EXPANDED_ANALYSIS, candidate_id="second")]
+    engine = make_comparison_engine([json.dumps(analyses)])
+    
+    result = engine.compare_against_candidates(new, [(first, 0.90), (second, 0.88)])
+    
+    assert result.existing_test_case_id == "second"
+    assert result.decision == DecisionType.ADDON
+    assert "Adds the lockout scenario" in result.reasoning
+    assert len(engine.client.prompts) == 1
+    assert "candidate_id: first" in engine.client.prompts[0] and "candidate_id: second" in engine.client.prompts[0]
+
+
+def test_invalid_candidate_analysis_falls_back_to_top_candidate():
+    """A non-list response or a malformed entry is not trusted: the top candidate is compared alone"""
+    new = make_test_case("new", "Login with valid credentials", "Submit valid username and password")
+    first = make_test_case("first", "Login", "Submit username")
+    second = make_test_case("second", "Login with valid credentials", "Submit valid username and password twice")
+    malformed = [dict(DIFFERENT_ANALYSIS, candidate_id="first"), dict(EXPANDED_ANALYSIS, candidate_id="second", relationship="maybe")]
+    
+    for response in (json.dumps("not a list"), json.dumps(malformed)):
+        engine = make_comparison_engine([response, json.dumps(DIFFERENT_ANALYSIS)])
+        
+        result = engine.compare_against_candidates(new, [(first, 0.90), (second, 0.88)])
+        
+        assert result.existing_test_case_id == "first"
+        assert result.decision == DecisionType.NEW
+        assert len(engine.client.prompts) == 2
+
+
+if __name__ == "__main__":
+    test_field_overlap_prefers_shared_rule_and_steps()
+    test_rank_candidates_keeps_close_contenders()
+    test_compare_against_candidates_uses_one_analysis_call()
+    test_invalid_candidate_analysis_falls_back_to_top_candidate()
+    print("✅ All candidate ranking tests passed")
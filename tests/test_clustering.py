@@ -0,0 +1,91 @@
+"""
+Test: semantic clustering and coverage map
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.clustering import mini_batch_kmeans, cluster_coverage, build_coverage_map
+from engines.context_engineering import ContextEngineer
+from tests.conftest import make_engine, make_test_case
+
+
+def make_blobs(sizes, dim=32, spread=0.05, seed=0):
+    """Unit vectors scattered around one random direction per blob"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((len(sizes), dim))
+    points = np.concatenate([
+        center + spread * np.linalg.norm(center) * rng.standard_normal((size, dim))
+        for center, size in zip(centers, sizes)
+    ])
+    labels = np.repeat(np.arange(len(sizes)), sizes)
+    return points.astype(np.float32), labels
+
+
+def test_kmeans_recovers_separated_groups():
+    """Every blob ends up in its own cluster"""
+    points, truth = make_blobs([300, 200, 100])
+    
+    centroids, labels = mini_batch_kmeans(points, 3, batch_size=128, iterations=50)
+    
+    assert centroids.shape == (3, 32)
+    assert np.allclose(np.linalg.norm(centroids, axis=1), 1.0, atol=1e-5)
+    for blob in range(3):
+        assert len(set(labels[truth == blob])) == 1
+    assert len(set(labels)) == 3
+
+
+def test_coverage_flags_sparse_and_dense_clusters():
+    """Cluster sizes drive the sparse / over-populated flags and counts are per cluster"""
+    points, truth = make_blobs([400, 60, 60, 5], spread=0.01)
+    ids = [f"tc-{i}" for i in range(len(points))]
+    metadatas = [
+        {"title": f"Case {i}", "test_type": "Negative" if truth[i] == 3 else "Positive",
+         "priority": "High", "business_rule": f"Rule {truth[i]}", "tags": "auth"}
+        for i in range(len(points))
+    ]
+    
+    report = cluster_coverage(ids, points, metadatas, k=4)
+    
+    sizes = [cluster["size"] for cluster in report["clusters"]]
+    assert sizes == [400, 60, 60, 5]
+    largest, smallest = report["clusters"][0], report["clusters"][-1]
+    assert largest["over_populated"] and not largest["sparse"]
+    assert smallest["sparse"] and smallest["test_types"] == {"Negative": 5}
+    assert largest["business_rules"] == {"Rule 0": 400}
+    assert largest["redundant"]
+    assert report["overall"]["priorities"] == {"High": 525}
+
+
+def test_coverage_map_from_vector_store_and_domain_context():
+    """Stored vectors are clustered per suite; domain context shares the metadata counts"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, _ = make_engine(tmp_dir)
+        cases = [
+            make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password"),
+            make_test_case("tc-login-2", "Login with remembered session", "Submit valid username and password"),
+            make_test_case("tc-export", "Export sales report", "Click export and download spreadsheet"),
+            make_test_case("tc-export-2", "Export monthly report", "Click export and download spreadsheet"),
+        ]
+        engine.add_test_cases_batch(cases, suite_name="web")
+        engine.add_test_case(make_test_case("tc-other", "Reset password", "Request reset link"), suite_name="mobile")
+        
+        report = build_coverage_map(engine.collection, suite_name="web", k=2)
+        assert report["total_test_cases"] == 4
+        assert sum(cluster["size"] for cluster in report["clusters"]) == 4
+        assert build_coverage_map(engine.collection, suite_name="missing")["clusters"] == []
+        
+        context = ContextEngineer().extract_domain_context(cases)
+        assert context["total_test_cases"] == 4
+        assert context["common_tags"] == ["auth"]
+        assert context["high_priority_count"] == 4
+
+
+if __name__ == "__main__":
+    test_kmeans_recovers_separated_groups()
+    test_coverage_flags_sparse_and_dense_clusters()
+    test_coverage_map_from_vector_store_and_domain_context()
+    print("✅ All clustering tests passed")
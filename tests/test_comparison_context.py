@@ -0,0 +1,71 @@
+"""
+Test: comparisons reuse vectors and scores from the retrieval step
+"""
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from core.models import DecisionType
+from engines.comparison_engine import ComparisonContext
+from tests.conftest import EXPANDED_ANALYSIS, login_pair, make_comparison_engine, make_test_case
+
+
+
+def counting_engine(responses):
+    """ComparisonEngine whose embedding calls are recorded"""
+    engine = make_comparison_engine(responses)
+    engine.embedded = []
+    
+    def generate_embedding(text):
+        engine.embedded.append(text)
+        return [1.0, 0.0] if "Login" in text else [0.6, 0.8]
+    
+    engine.embedding_generator.generate_embedding = generate_embedding
+    return engine
+
+
+def test_each_text_is_embedded_once():
+    """Without precomputed scores the pair is embedded once, not again for the prompt"""
+    new, existing = login_pair()
+    engine = counting_engine([json.dumps(EXPANDED_ANALYSIS)])
+    
+    engine.compare_test_cases(new, existing)
+    
+    assert len(engine.embedded) == 2
+
+
+def test_precomputed_similarity_skips_embedding():
+    """A score handed over by retrieval means no embedding call at all"""
+    new, existing = login_pair()
+    engine = counting_engine([json.dumps(EXPANDED_ANALYSIS)])
+    context = ComparisonContext()
+    context.add_similarity("new", "old", Config.THRESHOLD_ADDON_MIN + 0.01)
+    
+    result = engine.compare_test_cases(new, existing, context=context)
+    
+    assert engine.embedded == []
+    assert result.decision in (DecisionType.ADDON, DecisionType.SAME)
+
+
+def test_candidates_share_the_new_case_vector():
+    """Across several candidates the new case is embedded only once"""
+    new = make_test_case("new", "Login with valid credentials", "Submit valid username and password")
+    first = make_test_case("first", "Login", "Submit username")
+    second = make_test_case("second", "Password reset", "Request a reset link")
+    analyses = [dict(EXPANDED_ANALYSIS, candidate_id="first"), dict(EXPANDED_ANALYSIS, candidate_id="second")]
+    engine = counting_engine([json.dumps(analyses)])
+    
+    engine.compare_against_candidates(new, [(first, None), (second, None)])
+    
+    assert len(engine.embedded) == 3
+    assert engine.embedded.count(new.to_text()) == 1
+
+
+if __name__ == "__main__":
+    test_each_text_is_embedded_once()
+    test_precomputed_similarity_skips_embedding()
+    test_candidates_share_the_new_case_vector()
+    print("✅ All comparison context tests passed")
@@ -0,0 +1,74 @@
+"""
+Test: decision reasoning modes (template, inline, on-demand LLM)
+"""
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from core.models import DecisionType
+from engines.comparison_engine import ComparisonContext
+from tests.conftest import EXPANDED_ANALYSIS, login_pair, make_comparison_engine
+
+
+
+def compare(engine):
+    """Compare two login cases with a fixed semantic score"""
+    new, existing = login_pair()
+    context = ComparisonContext()
+    context.add_similarity("new", "old", 0.80)
+    return engine.compare_test_cases(new, existing, context=context)
+
+
+def make_reasoning_engine(mode, responses):
+    """ComparisonEngine in the given reasoning mode"""
+    original = Config.COMPARISON_REASONING_MODE
+    Config.COMPARISON_REASONING_MODE = mode
+    try:
+        return make_comparison_engine(responses)
+    finally:
+        Config.COMPARISON_REASONING_MODE = original
+
+
+def test_template_reasoning_needs_one_call():
+    """The default mode renders the reasoning from the analysis fields"""
+    engine = make_reasoning_engine("template", [json.dumps(EXPANDED_ANALYSIS)])
+    
+    result = compare(engine)
+    
+    assert result.decision == DecisionType.ADDON
+    assert "lockout after 5 attempts" in result.reasoning
+    assert "Adds the lockout scenario" in result.reasoning
+    assert len(engine.client.prompts) == 1
+
+
+def test_inline_reasoning_comes_with_the_analysis():
+    """Inline mode asks for the explanation in the analysis prompt"""
+    engine = make_reasoning_engine("inline", [json.dumps(dict(EXPANDED_ANALYSIS, explanation="Merge: it extends the login case."))])
+    
+    result = compare(engine)
+    
+    assert result.reasoning == "Merge: it extends the login case."
+    assert '"explanation"' in engine.client.prompts[0]
+    assert len(engine.client.prompts) == 1
+
+
+def test_llm_reasoning_on_demand():
+    """The LLM explanation is only generated when requested"""
+    engine = make_reasoning_engine("template", [json.dumps(EXPANDED_ANALYSIS), "Merge into the existing login case"])
+    result = compare(engine)
+    
+    assert engine.explain_comparison(result) == "Merge into the existing login case"
+    assert "Semantic: 80.00%" in engine.client.prompts[1]
+    
+    engine = make_reasoning_engine("llm", [json.dumps(EXPANDED_ANALYSIS), "Merge into the existing login case"])
+    assert compare(engine).reasoning == "Merge into the existing login case"
+
+
+if __name__ == "__main__":
+    test_template_reasoning_needs_one_call()
+    test_inline_reasoning_comes_with_the_analysis()
+    test_llm_reasoning_on_demand()
+    print("✅ All decision reasoning tests passed")
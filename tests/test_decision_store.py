@@ -0,0 +1,120 @@
+"""
+Test: pair decisions memoized by content hash
+"""
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from core.models import DecisionType
+from engines.comparison_engine import ComparisonContext
+from engines.decision_store import DecisionStore, decision_config_version
+from tests.conftest import DIFFERENT_ANALYSIS, EXPANDED_ANALYSIS, login_pair, make_comparison_engine, make_test_case
+
+
+def make_memo_engine(responses, reasoning_mode="template"):
+    """ComparisonEngine with an in-memory decision store"""
+    original = Config.COMPARISON_REASONING_MODE
+    Config.COMPARISON_REASONING_MODE = reasoning_mode
+    try:
+        engine = make_comparison_engine(responses)
+    finally:
+        Config.COMPARISON_REASONING_MODE = original
+    engine.decision_store = DecisionStore(path=":memory:")
+    engine.embedding_generator.generate_embedding = lambda text: [1.0, 0.0] if "Login" in text else [0.8, 0.6]
+    return engine
+
+
+def test_store_round_trip_follows_contents_and_config():
+    """Same contents under new IDs hit; other thresholds, prompts or modes miss"""
+    new, existing = login_pair()
+    engine = make_memo_engine([json.dumps(EXPANDED_ANALYSIS)])
+    result = engine.compare_test_cases(new, existing, context=ComparisonContext())
+    store = engine.decision_store
+    
+    renamed = store.get(new.model_copy(update={"id": "new-2"}), existing)
+    assert renamed.new_test_case_id == "new-2"
+    assert renamed.decision == result.decision and renamed.reasoning == result.reasoning
+    
+    original = Config.THRESHOLD_ADDON_MIN
+    Config.THRESHOLD_ADDON_MIN = original - 0.1
+    try:
+        assert store.get(new, existing) is None
+    finally:
+        Config.THRESHOLD_ADDON_MIN = original
+    
+    for version in (
+        decision_config_version(dict(engine.prompts, comparison_analysis={"system": "Be terse", "user": "{new}"})),
+        decision_config_version(use_context_engineering=False),
+        decision_config_version(reasoning_mode="inline")
+    ):
+        assert store.get(new, existing, version) is None
+    assert store.get(new, existing, engine._decision_version()) is not None
+
+
+def test_repeated_pair_skips_comparison():
+    """A stored decision is returned without embeddings or LLM calls"""
+    new, existing = login_pair()
+    engine = make_memo_engine([json.dumps(EXPANDED_ANALYSIS)])
+    
+    first = engine.compare_test_cases(new, existing)
+    engine.embedding_generator.generate_embedding = None  # any embedding call would fail
+    second = engine.compare_test_cases(new, existing)
+    
+    assert second.decision == first.decision == DecisionType.ADDON
+    assert len(engine.client.prompts) == 1
+    assert engine.decision_store.stats()["hits"] == 1
+
+
+def test_stored_decisions_feed_the_prompt():
+    """Past decisions against the same existing case become historical decisions"""
+    first, existing = login_pair("new-1")
+    second = make_test_case("new-2", "Login with remembered user", "Tick remember me and submit")
+    engine = make_memo_engine([json.dumps(EXPANDED_ANALYSIS), json.dumps(EXPANDED_ANALYSIS)])
+    
+    engine.compare_test_cases(first, existing)
+    engine.compare_test_cases(second, existing)
+    
+    assert "past decisions" not in engine.client.prompts[0]
+    assert "Adds the lockout scenario" in engine.client.prompts[1]
+
+
+def test_candidate_results_are_stored_with_final_reasoning():
+    """Losing candidates are stored with rendered reasoning, or not at all when it needs the LLM"""
+    new, existing = login_pair()
+    other = make_test_case("other", "Login with remembered user", "Tick remember me and submit")
+    candidates = [(existing, 0.85), (other, 0.85)]
+    analyses = json.dumps([dict(EXPANDED_ANALYSIS, candidate_id="old"), dict(DIFFERENT_ANALYSIS, candidate_id="other")])
+    
+    engine = make_memo_engine([analyses])
+    assert engine.compare_against_candidates(new, candidates).existing_test_case_id == "old"
+    loser = engine.decision_store.get(new, other, engine._decision_version())
+    assert loser.decision == DecisionType.NEW
+    assert loser.reasoning != DIFFERENT_ANALYSIS["reasoning"]
+    
+    engine = make_memo_engine([analyses, "Merge into the login case"], reasoning_mode="llm")
+    result = engine.compare_against_candidates(new, candidates)
+    assert result.reasoning == "Merge into the login case"
+    assert engine.decision_store.get(new, existing, engine._decision_version()).reasoning == result.reasoning
+    assert engine.decision_store.get(new, other, engine._decision_version()) is None
+
+
+def test_failed_analysis_is_not_stored():
+    """Errors are retried on the next run instead of being replayed"""
+    new, existing = login_pair()
+    engine = make_memo_engine([])  # the fake client raises: no response left
+    
+    engine.compare_test_cases(new, existing)
+    
+    assert len(engine.decision_store) == 0
+
+
+if __name__ == "__main__":
+    test_store_round_trip_follows_contents_and_config()
+    test_repeated_pair_skips_comparison()
+    test_stored_decisions_feed_the_prompt()
+    test_candidate_results_are_stored_with_final_reasoning()
+    test_failed_analysis_is_not_stored()
+    print("✅ All decision store tests passed")
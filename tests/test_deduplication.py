@@ -0,0 +1,101 @@
+"""
+Test: suite-wide duplicate detection with MinHash and LSH
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.deduplication import SuiteDeduplicator
+from tests.conftest import make_comparison_engine, make_test_case
+
+
+def make_suite():
+    """Distinct cases plus an exact copy and a reworded near-duplicate"""
+    cases = [
+        make_test_case(
+            f"tc-{i}",
+            f"Feature {i} scenario {i * 7}",
+            f"Open module {i} and perform operation {i * 13} with input {i * 31}"
+        )
+        for i in range(200)
+    ]
+    for i, tc in enumerate(cases):
+        tc.business_rule = f"Rule {i} for area {i * 3}"
+        tc.expected_outcome = f"Outcome {i} shown in panel {i * 5}"
+        tc.test_steps[0].expected_result = f"Result {i} visible"
+    
+    login = make_test_case("login", "Login with valid credentials", "Submit valid username and password on the login form")
+    login.description = "Verify that a registered user can sign in with correct credentials and reach the dashboard"
+    login.preconditions = ["User account exists", "User is on the login page", "Account is not locked"]
+    login.expected_outcome = "User is redirected to the dashboard and sees a welcome message"
+    copy = login.model_copy(update={"id": "login-copy"})
+    reworded = login.model_copy(update={
+        "id": "login-reworded",
+        "expected_outcome": "User is redirected to the dashboard and sees the welcome banner"
+    })
+    return cases + [login, copy, reworded]
+
+
+def test_finds_exact_and_near_duplicates_only():
+    """Copies cluster together; distinct cases are never reported"""
+    suite = make_suite()
+    
+    clusters = SuiteDeduplicator(threshold=0.7, certain_threshold=0.99).find_duplicate_clusters(suite)
+    
+    assert len(clusters) == 1
+    assert set(clusters[0]["test_case_ids"]) == {"login", "login-copy", "login-reworded"}
+    assert not clusters[0]["exact"]
+    assert clusters[0]["ambiguous"]
+    assert 0.7 <= clusters[0]["min_similarity"] < 1.0
+    
+    exact_only = SuiteDeduplicator(threshold=0.999).find_duplicate_clusters(suite)
+    assert [set(c["test_case_ids"]) for c in exact_only] == [{"login", "login-copy"}]
+    assert exact_only[0]["exact"] and not exact_only[0]["ambiguous"]
+
+
+def test_verify_routes_only_ambiguous_clusters():
+    """Only ambiguous clusters reach the comparison engine"""
+    suite = make_suite()
+    deduplicator = SuiteDeduplicator(threshold=0.7, certain_threshold=0.99)
+    clusters = deduplicator.find_duplicate_clusters(suite)
+    engine = make_comparison_engine([])
+    engine.embedding_generator.generate_embedding = lambda text: [1.0, 0.0]
+    
+    deduplicator.verify_clusters(clusters, suite, engine)
+    
+    assert len(clusters[0]["verification"]) == 2
+    assert {v["decision"] for v in clusters[0]["verification"]} <= {"same", "add-on", "new"}
+    
+    try:
+        SuiteDeduplicator(num_perm=100, bands=32)
+        assert False, "bands must divide the signature length"
+    except ValueError:
+        pass
+
+
+def test_verify_compares_cases_sharing_an_id():
+    """Cases with duplicate IDs are verified against their own contents"""
+    suite = make_suite()
+    suite[-1] = suite[-1].model_copy(update={"id": "login"})
+    deduplicator = SuiteDeduplicator(threshold=0.7, certain_threshold=0.99)
+    clusters = deduplicator.find_duplicate_clusters(suite)
+    engine = make_comparison_engine([])
+    engine.embedding_generator.generate_embedding = lambda text: [1.0, 0.0]
+    compared = []
+    compare = engine.compare_test_cases
+    engine.compare_test_cases = lambda new, existing: compared.append((new, existing)) or compare(new, existing)
+    
+    deduplicator.verify_clusters(clusters, suite, engine)
+    
+    members = [suite[i] for i in clusters[0]["indices"]]
+    assert sorted(tc.id for tc in members) == ["login", "login", "login-copy"]
+    assert compared == [(tc, members[0]) for tc in members[1:]]
+    assert len(clusters[0]["verification"]) == 2
+
+
+if __name__ == "__main__":
+    test_finds_exact_and_near_duplicates_only()
+    test_verify_routes_only_ambiguous_clusters()
+    test_verify_compares_cases_sharing_an_id()
+    print("✅ All deduplication tests passed")
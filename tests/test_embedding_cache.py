@@ -0,0 +1,125 @@
+"""
+Test: Persistent, size-bounded embedding cache
+"""
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils import normalize_text
+from engines.embedding_cache import EmbeddingCache, make_cache_key
+
+
+def test_cache_roundtrip():
+    """Embeddings are returned as stored (float32 precision)"""
+    cache = EmbeddingCache(path=":memory:", max_bytes=1024 * 1024, memory_items=10)
+    
+    assert cache.get("missing") is None
+    
+    cache.set("a", [0.5, -0.25, 1.0])
+    assert "a" in cache
+    assert cache.get("a") == [0.5, -0.25, 1.0]
+    assert len(cache) == 1
+    assert cache.total_bytes == 3 * 4
+
+
+def test_cache_persists_across_instances():
+    """A new cache on the same file sees previously stored embeddings"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "embeddings.db")
+        
+        first = EmbeddingCache(path=path, max_bytes=1024 * 1024, memory_items=10)
+        first.set("persisted", [0.1, 0.2])
+        first.close()
+        
+        second = EmbeddingCache(path=path, max_bytes=1024 * 1024, memory_items=10)
+        embedding = second.get("persisted")
+        assert embedding is not None
+        assert abs(embedding[0] - 0.1) < 1e-6 and abs(embedding[1] - 0.2) < 1e-6
+        assert second.total_bytes == 2 * 4
+        second.close()
+
+
+def test_cache_evicts_least_recently_used():
+    """Stored bytes stay within budget and the oldest entries go first"""
+    # Room for exactly three 4-dim float32 vectors
+    cache = EmbeddingCache(path=":memory:", max_bytes=3 * 16, memory_items=0)
+    
+    for key in ["k1", "k2", "k3"]:
+        cache.set(key, [1.0, 2.0, 3.0, 4.0])
+    
+    # Touch k1 so k2 becomes the least recently used entry
+    assert cache.get("k1") is not None
+    cache.set("k4", [1.0, 2.0, 3.0, 4.0])
+    
+    assert cache.total_bytes <= 3 * 16
+    assert "k2" not in cache
+    assert "k1" in cache and "k3" in cache and "k4" in cache
+
+
+def test_memory_hits_reach_the_disk_lru_in_batches():
+    """Hits served from memory still protect a row from eviction, written once per batch"""
+    cache = EmbeddingCache(path=":memory:", max_bytes=3 * 16, memory_items=10, access_flush_seconds=3600)
+    for key in ["k1", "k2", "k3"]:
+        cache.set(key, [1.0, 2.0, 3.0, 4.0])
+    stored = cache._conn.execute("SELECT last_access FROM embeddings WHERE key = 'k1'").fetchone()[0]
+    
+    # Memory hit: recorded, but not written until the next store
+    assert cache.get("k1") is not None
+    assert cache._conn.execute("SELECT last_access FROM embeddings WHERE key = 'k1'").fetchone()[0] == stored
+    
+    cache.set("k4", [1.0, 2.0, 3.0, 4.0])
+    assert "k2" not in cache
+    assert "k1" in cache and "k3" in cache and "k4" in cache
+    
+    # Without stores, the batch is written once the interval has passed
+    cache.access_flush_seconds = 0
+    cache.get("k3")
+    assert cache._conn.execute("SELECT last_access FROM embeddings WHERE key = 'k3'").fetchone()[0] > stored
+
+
+def test_cache_clear():
+    """Clearing empties both memory and disk tiers"""
+    cache = EmbeddingCache(path=":memory:", max_bytes=1024, memory_items=10)
+    cache.set("x", [1.0])
+    cache.clear()
+    
+    assert cache.get("x") is None
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+
+def test_cache_hit_miss_counters():
+    """Lookups are counted as hits or misses"""
+    cache = EmbeddingCache(path=":memory:", max_bytes=1024, memory_items=10)
+    cache.get("absent")
+    cache.set("present", [1.0])
+    cache.get("present")
+    cache.get("present")
+    
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert abs(stats["hit_rate"] - 2 / 3) < 1e-9
+    assert stats["entries"] == 1
+
+
+def test_cache_key_is_content_addressed():
+    """Keys depend on normalized text, model and truncation length"""
+    base = make_cache_key(normalize_text("Title: Login\n  Steps"), "ada", 8000)
+    
+    assert base == make_cache_key(normalize_text("Title:   Login Steps "), "ada", 8000)
+    assert base != make_cache_key(normalize_text("Title: Login Steps"), "other-model", 8000)
+    assert base != make_cache_key(normalize_text("Title: Login Steps"), "ada", 4000)
+
+
+if __name__ == "__main__":
+    test_cache_roundtrip()
+    test_cache_persists_across_instances()
+    test_cache_evicts_least_recently_used()
+    test_memory_hits_reach_the_disk_lru_in_batches()
+    test_cache_clear()
+    test_cache_hit_miss_counters()
+    test_cache_key_is_content_addressed()
+    print("✅ All embedding cache tests passed")
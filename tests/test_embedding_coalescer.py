@@ -0,0 +1,124 @@
+"""
+Test: Coalescing concurrent single-text embedding requests
+"""
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from engines.embedding_coalescer import EmbeddingCoalescer, get_embedding_coalescer
+from engines.embeddings import EmbeddingGenerator
+from tests.conftest import CountingProvider
+
+
+class RecordingEmbedder:
+    """Embeds text as [len(text)] and records every batch it receives"""
+    
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.lock = threading.Lock()
+    
+    def __call__(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        self.started.set()
+        self.release.wait()
+        time.sleep(self.delay)
+        return np.asarray([[float(len(t))] for t in texts], dtype=np.float32)
+
+
+def test_concurrent_requests_are_batched():
+    """Requests from many threads within the window share a call"""
+    embedder = RecordingEmbedder(delay=0.05)
+    coalescer = EmbeddingCoalescer(window_ms=100, max_batch=16)
+    texts = [f"text {'x' * i}" for i in range(10)]
+    
+    barrier = threading.Barrier(len(texts))
+    
+    def request(text):
+        barrier.wait()
+        return coalescer.embed(text, embedder)
+    
+    with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+        results = list(executor.map(request, texts))
+    
+    for text, vector in zip(texts, results):
+        assert vector.tolist() == [float(len(text))]
+    
+    assert len(embedder.batches) < len(texts)
+    assert sum(len(b) for b in embedder.batches) == len(texts)
+
+
+def test_lone_request_is_not_delayed():
+    """With nothing else pending a request is sent without waiting for the window"""
+    embedder = RecordingEmbedder()
+    coalescer = EmbeddingCoalescer(window_ms=5000, max_batch=16)
+    
+    start = time.monotonic()
+    assert coalescer.embed("alone", embedder).tolist() == [5.0]
+    assert time.monotonic() - start < 1.0
+
+
+def test_duplicate_texts_sent_once():
+    """Identical texts pending together are embedded once and fanned out"""
+    embedder = RecordingEmbedder()
+    embedder.release.clear()
+    coalescer = EmbeddingCoalescer(window_ms=100, max_batch=16)
+    
+    first = coalescer.submit("first", embedder)
+    embedder.started.wait(5)
+    futures = [coalescer.submit("same text", embedder) for _ in range(5)]
+    embedder.release.set()
+    results = [f.result() for f in futures]
+    
+    assert first.result().tolist() == [5.0]
+    assert all(r.tolist() == [9.0] for r in results)
+    assert embedder.batches == [["first"], ["same text"]]
+
+
+def test_generators_share_one_coalescer():
+    """Every generator uses the process-wide coalescer and its single worker"""
+    def coalescer_threads():
+        return sum(1 for t in threading.enumerate() if t.name == "embedding-coalescer")
+    
+    before = coalescer_threads()
+    generators = [EmbeddingGenerator(provider=CountingProvider()) for _ in range(4)]
+    for i, generator in enumerate(generators):
+        generator.generate_embedding(f"shared worker text {i}")
+    
+    assert all(generator.coalescer is get_embedding_coalescer() for generator in generators)
+    assert coalescer_threads() - before <= 1
+
+
+def test_errors_propagate_to_every_caller():
+    """A failed batch raises in each waiting caller"""
+    def failing(texts):
+        raise RuntimeError("service unavailable")
+    
+    coalescer = EmbeddingCoalescer(window_ms=20, max_batch=16)
+    futures = [coalescer.submit("a", failing), coalescer.submit("b", failing)]
+    
+    for future in futures:
+        try:
+            future.result()
+        except RuntimeError as e:
+            assert "service unavailable" in str(e)
+        else:
+            assert False, "Expected RuntimeError"
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_are_batched()
+    test_lone_request_is_not_delayed()
+    test_duplicate_texts_sent_once()
+    test_generators_share_one_coalescer()
+    test_errors_propagate_to_every_caller()
+    print("✅ All embedding coalescer tests passed")
@@ -0,0 +1,128 @@
+"""
+Test: Asynchronous batch embedding pipeline
+"""
+import sys
+import os
+import time
+import asyncio
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from config.config import Config
+from engines.embedding_pipeline import AsyncEmbeddingPipeline, RateLimiter
+
+
+class FakeEmbeddingsClient:
+    """Async client stand-in that embeds text as [len(text), first char code]"""
+    
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.embeddings = self
+    
+    async def create(self, input, model):
+        self.calls.append(list(input))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text)), float(ord(text[0]))])
+            for i, text in enumerate(input)
+        ]
+        # Return out of order to check that results are realigned by index
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+def test_pipeline_returns_aligned_float32_matrix():
+    """Output rows line up with inputs and duplicates are embedded once"""
+    client = FakeEmbeddingsClient()
+    pipeline = AsyncEmbeddingPipeline(
+        deployment="fake",
+        batch_size=2,
+        max_concurrency=2,
+        requests_per_minute=0,
+        tokens_per_minute=0,
+        client=client
+    )
+    
+    texts = ["alpha", "beta", "alpha", "gamma", "delta", "beta"]
+    matrix = pipeline.run(texts)
+    
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (6, 2)
+    assert matrix.flags["C_CONTIGUOUS"]
+    for row, text in zip(matrix, texts):
+        assert row.tolist() == [float(len(text)), float(ord(text[0]))]
+    
+    sent = [text for call in client.calls for text in call]
+    assert sorted(sent) == ["alpha", "beta", "delta", "gamma"]
+    assert len(client.calls) == 2
+
+
+def test_pipeline_respects_concurrency_limit():
+    """No more than max_concurrency requests are in flight"""
+    client = FakeEmbeddingsClient()
+    pipeline = AsyncEmbeddingPipeline(
+        deployment="fake",
+        batch_size=1,
+        max_concurrency=3,
+        requests_per_minute=0,
+        tokens_per_minute=0,
+        client=client
+    )
+    
+    pipeline.run([f"text-{i}" for i in range(12)])
+    
+    assert len(client.calls) == 12
+    assert 1 < client.max_in_flight <= 3
+
+
+def test_default_requests_are_bounded_by_api_limits():
+    """Short texts fill requests up to the API input limit; tokens bound long ones"""
+    client = FakeEmbeddingsClient()
+    pipeline = AsyncEmbeddingPipeline(deployment="fake", requests_per_minute=0, tokens_per_minute=0, client=client)
+    
+    pipeline.run([f"text {i}" for i in range(Config.EMBEDDING_MAX_REQUEST_INPUTS + 1)])
+    assert [len(call) for call in client.calls] == [Config.EMBEDDING_MAX_REQUEST_INPUTS, 1]
+    
+    client.calls.clear()
+    texts = [f"{i} " + "word " * 99 for i in range(6)]
+    original = Config.EMBEDDING_MAX_REQUEST_TOKENS
+    Config.EMBEDDING_MAX_REQUEST_TOKENS = 2 * max(pipeline.token_counter.count(t) for t in texts)
+    try:
+        pipeline.run(texts)
+    finally:
+        Config.EMBEDDING_MAX_REQUEST_TOKENS = original
+    assert [len(call) for call in client.calls] == [2, 2, 2]
+
+
+def test_rate_limit_budget_is_shared_across_jobs():
+    """Pipelines of one deployment share budgets; waits run outside the limiter lock"""
+    first = AsyncEmbeddingPipeline(deployment="shared", requests_per_minute=60, client=FakeEmbeddingsClient())
+    second = AsyncEmbeddingPipeline(deployment="shared", requests_per_minute=60, client=FakeEmbeddingsClient())
+    assert first.request_limiter is second.request_limiter
+    assert first.request_limiter is not AsyncEmbeddingPipeline(deployment="other", requests_per_minute=60).request_limiter
+    
+    limiter = RateLimiter(1200)  # 20 per second
+    assert limiter.reserve(1200) == 0.0
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda amount: asyncio.run(limiter.acquire(amount)), [4, 4]))
+    elapsed = time.monotonic() - start
+    
+    # One event loop per job: the second reservation queues behind the first
+    assert 0.35 < elapsed < 0.6
+
+
+if __name__ == "__main__":
+    test_pipeline_returns_aligned_float32_matrix()
+    test_pipeline_respects_concurrency_limit()
+    test_default_requests_are_bounded_by_api_limits()
+    test_rate_limit_budget_is_shared_across_jobs()
+    print("✅ All embedding pipeline tests passed")
@@ -0,0 +1,54 @@
+"""
+Test: knowledge base lookups by test case ID
+"""
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines import test_case_manager
+from tests.conftest import make_knowledge_base, make_test_case
+
+
+def test_lookup_by_id_follows_writes_and_reloads():
+    """Suite lookups find cases after adds, updates and restarts"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        knowledge_base = make_knowledge_base(tmp_dir)
+        login = make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password")
+        export = make_test_case("tc-export", "Export sales report", "Click export and download spreadsheet")
+        knowledge_base.add_test_case_to_suite("web", login)
+        knowledge_base.add_test_case_to_suite("reports", export)
+        
+        assert knowledge_base.get_test_case_from_suite("reports", "tc-export") is export
+        assert knowledge_base.get_test_case_from_suite("reports", "missing") is None
+        assert knowledge_base.get_test_case_from_suite("web", "tc-export") is None
+        
+        updated = login.model_copy(update={"title": "Login with remembered session"})
+        knowledge_base.update_test_case_in_suite("web", updated)
+        assert knowledge_base.get_test_case_from_suite("web", "tc-login") is updated
+        
+        reloaded = make_knowledge_base(tmp_dir)
+        assert reloaded.get_test_case_from_suite("web", "tc-login").title == "Login with remembered session"
+        assert reloaded.get_test_case_from_suite("reports", "tc-export").test_steps[0].action == "Click export and download spreadsheet"
+
+
+def test_hits_resolve_to_the_case_in_their_own_suite():
+    """The same ID in two suites resolves to the suite named in the hit"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = test_case_manager.TestCaseManager.__new__(test_case_manager.TestCaseManager)
+        manager.knowledge_base = make_knowledge_base(tmp_dir)
+        web = make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password")
+        mobile = make_test_case("tc-login", "Login with fingerprint", "Touch the fingerprint sensor")
+        manager.knowledge_base.add_test_case_to_suite("web", web)
+        manager.knowledge_base.add_test_case_to_suite("mobile", mobile)
+        
+        for suite_name, expected in (("web", web), ("mobile", mobile)):
+            hit = {"id": "tc-login", "metadata": {"suite_name": suite_name}}
+            assert manager._reconstruct_test_case(hit) is expected
+
+
+if __name__ == "__main__":
+    test_lookup_by_id_follows_writes_and_reloads()
+    test_hits_resolve_to_the_case_in_their_own_suite()
+    print("✅ All knowledge base tests passed")
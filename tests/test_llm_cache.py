@@ -0,0 +1,108 @@
+"""
+Test: persistent LLM response cache
+"""
+import sys
+import os
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.llm_cache import LLMResponseCache, cached_chat_completion, make_prompt_key
+from tests.conftest import FakeChatClient
+
+
+MESSAGES = [{"role": "system", "content": "Analyst"}, {"role": "user", "content": "Compare A and B"}]
+
+
+def test_prompt_key_covers_every_request_field():
+    """Deployment, prompts, temperature and max_tokens all change the key"""
+    key = make_prompt_key("gpt", MESSAGES, 0.1, 800)
+    
+    assert key == make_prompt_key("gpt", [dict(m) for m in MESSAGES], 0.1, 800)
+    assert key != make_prompt_key("gpt-2", MESSAGES, 0.1, 800)
+    assert key != make_prompt_key("gpt", MESSAGES[:1], 0.1, 800)
+    assert key != make_prompt_key("gpt", MESSAGES, 0.2, 800)
+    assert key != make_prompt_key("gpt", MESSAGES, 0.1, 400)
+
+
+def test_low_temperature_calls_are_served_from_disk():
+    """A repeated comparison prompt survives a restart; generation calls are never cached"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm.db")
+        client = FakeChatClient(['{"relationship": "identical"}', "case 1", "case 2"])
+        cache = LLMResponseCache(path=path)
+        
+        first = cached_chat_completion(client, cache, model="gpt", messages=MESSAGES, temperature=0.1, max_tokens=800)
+        cache.close()
+        cache = LLMResponseCache(path=path)
+        second = cached_chat_completion(client, cache, model="gpt", messages=MESSAGES, temperature=0.1, max_tokens=800)
+        
+        assert second.choices[0].message.content == first.choices[0].message.content
+        assert len(client.prompts) == 1
+        
+        for _ in range(2):
+            cached_chat_completion(client, cache, model="gpt", messages=MESSAGES, temperature=0.3, max_tokens=800)
+        assert len(client.prompts) == 3
+        assert cache.stats()["hits"] == 1
+        cache.close()
+
+
+def test_ttl_and_size_eviction():
+    """Expired entries are misses and the byte budget evicts the oldest rows"""
+    cache = LLMResponseCache(path=":memory:", max_bytes=10_000, ttl_seconds=1)
+    cache.set("old", "x" * 10)
+    cache._conn.execute("UPDATE responses SET created = ?", (time.time() - 5,))
+    assert cache.get("old") is None
+    
+    cache = LLMResponseCache(path=":memory:", max_bytes=250, ttl_seconds=0)
+    for i in range(5):
+        cache.set(f"key-{i}", "y" * 100)
+    assert len(cache) == 2
+    assert cache.get("key-0") is None and cache.get("key-4") == "y" * 100
+
+
+def test_responses_failing_validation_are_not_replayed():
+    """Malformed responses are not stored, and a stale one is dropped on the next hit"""
+    def is_json(content):
+        return isinstance(json.loads(content), dict)
+    
+    request = dict(model="gpt", messages=MESSAGES, temperature=0.1, max_tokens=800)
+    cache = LLMResponseCache(path=":memory:")
+    client = FakeChatClient(['{"relationship": ', '{"relationship": "identical"}'])
+    
+    cached_chat_completion(client, cache, validate=is_json, **request)
+    assert len(cache) == 0
+    cached_chat_completion(client, cache, validate=is_json, **request)
+    replayed = cached_chat_completion(client, cache, validate=is_json, **request)
+    assert replayed.choices[0].message.content == '{"relationship": "identical"}'
+    assert len(client.prompts) == 2
+    
+    # Stored by a caller without a check: rejected and replaced
+    cache = LLMResponseCache(path=":memory:")
+    cached_chat_completion(FakeChatClient(["not json"]), cache, **request)
+    client = FakeChatClient(['{"relationship": "different"}'])
+    response = cached_chat_completion(client, cache, validate=is_json, **request)
+    assert response.choices[0].message.content == '{"relationship": "different"}'
+    assert len(client.prompts) == 1
+    assert cache.stats()["bytes"] == len('{"relationship": "different"}')
+
+
+def test_expiry_uses_the_created_index():
+    """The TTL sweep on every write reads the index instead of scanning the table"""
+    cache = LLMResponseCache(path=":memory:")
+    plan = cache._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT COALESCE(SUM(nbytes), 0) FROM responses WHERE created < ?", (time.time(),)
+    ).fetchall()
+    
+    assert any("idx_responses_created" in row[-1] for row in plan)
+
+
+if __name__ == "__main__":
+    test_prompt_key_covers_every_request_field()
+    test_low_temperature_calls_are_served_from_disk()
+    test_ttl_and_size_eviction()
+    test_responses_failing_validation_are_not_replayed()
+    test_expiry_uses_the_created_index()
+    print("✅ All LLM cache tests passed")
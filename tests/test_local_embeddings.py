@@ -0,0 +1,78 @@
+"""
+Test: Local deterministic embedding provider (no network access)
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from engines.embedding_providers import LocalEmbeddingProvider, get_embedding_provider
+from engines.embedding_cache import EmbeddingCache
+from engines.embeddings import EmbeddingGenerator
+
+
+def test_local_provider_is_deterministic_and_normalized():
+    """Same text always yields the same unit-length vector"""
+    provider = LocalEmbeddingProvider(dimension=256)
+    
+    first = provider.embed(["User logs in with valid credentials"])
+    second = LocalEmbeddingProvider(dimension=256).embed(["User logs in with valid credentials"])
+    
+    assert first.shape == (1, 256)
+    assert first.dtype == np.float32
+    assert np.array_equal(first, second)
+    assert abs(np.linalg.norm(first[0]) - 1.0) < 1e-5
+    assert provider.model_id == "local-hash-256"
+
+
+def test_local_provider_ranks_related_text_higher():
+    """Overlapping vocabulary scores higher than unrelated text"""
+    provider = LocalEmbeddingProvider(dimension=512)
+    query, related, unrelated = provider.embed([
+        "Verify login fails with invalid password",
+        "Verify login fails with expired password",
+        "Export monthly sales report to spreadsheet"
+    ])
+    
+    assert np.dot(query, related) > np.dot(query, unrelated)
+
+
+def test_unknown_provider_rejected():
+    """Unsupported provider names raise ValueError"""
+    try:
+        get_embedding_provider("unknown")
+    except ValueError:
+        return
+    assert False, "Expected ValueError"
+
+
+def test_generator_with_local_provider_uses_cache():
+    """Single and batch paths share cache entries with the local provider"""
+    generator = EmbeddingGenerator(
+        cache=EmbeddingCache(path=":memory:", max_bytes=1024 * 1024, memory_items=100),
+        provider=LocalEmbeddingProvider(dimension=64)
+    )
+    
+    texts = ["Title: Login\nSteps: enter credentials", "Title: Logout"]
+    matrix = generator.generate_embeddings_matrix(texts)
+    assert matrix.shape == (2, 64)
+    
+    # The single-text path now hits the entries written by the batch path
+    single = generator.generate_embedding("Title: Login  Steps: enter credentials")
+    assert np.allclose(single, matrix[0])
+    
+    stats = generator.cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    
+    similarity = generator.calculate_similarity(single, matrix[0].tolist())
+    assert abs(similarity - 1.0) < 1e-5
+
+
+if __name__ == "__main__":
+    test_local_provider_is_deterministic_and_normalized()
+    test_local_provider_ranks_related_text_higher()
+    test_unknown_provider_rejected()
+    test_generator_with_local_provider_uses_cache()
+    print("✅ All local embedding tests passed")
@@ -0,0 +1,136 @@
+"""
+Test: deterministic near-duplicate fast path
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import DecisionType
+from engines.embedding_providers import LocalEmbeddingProvider
+from engines.near_duplicate import (
+    MinHasher, simhash, hamming_distance, tokenize, classify_near_duplicate
+)
+from engines import test_case_manager
+from tests.conftest import make_comparison_engine, make_engine, make_knowledge_base, make_test_case
+
+
+class KeyedProvider(LocalEmbeddingProvider):
+    """Provider that embeds each text as the vector of the first key it contains"""
+    
+    def __init__(self, vectors):
+        super().__init__(dimension=3)
+        self.vectors = vectors
+    
+    def embed(self, texts):
+        rows = [next(vector for key, vector in self.vectors.items() if key in text) for text in texts]
+        return np.array(rows, dtype=np.float32)
+
+
+def test_fingerprints_track_text_distance():
+    """Operators are tokens; SimHash and MinHash degrade with edits"""
+    text = "Submit valid username and password then verify the dashboard is displayed to the user"
+    edited = text.replace("dashboard", "home page")
+    unrelated = "Click export and download the monthly sales spreadsheet as CSV"
+    
+    assert tokenize("Amount >= -1000.") == ["amount", ">=", "-", "1000"]
+    assert hamming_distance(simhash(text), simhash(text)) == 0
+    assert hamming_distance(simhash(text), simhash(edited)) < hamming_distance(simhash(text), simhash(unrelated))
+    
+    hasher = MinHasher(num_perm=256)
+    assert MinHasher.jaccard(hasher.signature(text), hasher.signature(text)) == 1.0
+    assert 0.3 < MinHasher.jaccard(hasher.signature(text), hasher.signature(edited)) < 1.0
+    assert MinHasher.jaccard(hasher.signature(text), hasher.signature(unrelated)) < 0.1
+
+
+def test_classify_settles_only_obvious_pairs():
+    """Whitespace-only copies are SAME, unrelated cases NEW, everything else undecided"""
+    existing = make_test_case("tc-1", "Login with valid credentials", "Submit valid username and password")
+    reformatted = make_test_case("new-1", "Login  with valid credentials", "Submit valid username\nand password")
+    expanded = make_test_case("new-2", "Login with valid credentials", "Submit valid username, password and OTP")
+    unrelated = make_test_case("new-3", "Export sales report", "Click export and download spreadsheet")
+    unrelated.business_rule = "Reports can be exported by managers"
+    unrelated.expected_outcome = "Spreadsheet downloaded"
+    unrelated.test_steps[0].expected_result = "File saved"
+    unrelated.tags = ["reports"]
+    
+    same = classify_near_duplicate(reformatted, existing)
+    assert same.decision == DecisionType.SAME
+    assert same.existing_test_case_id == "tc-1"
+    
+    assert classify_near_duplicate(expanded, existing, semantic_similarity=0.9) is None
+    assert classify_near_duplicate(unrelated, existing, semantic_similarity=0.62).decision == DecisionType.NEW
+    assert classify_near_duplicate(unrelated, existing) is None
+
+
+def test_opposite_conditions_are_never_settled():
+    """Cases differing only in a comparison or a sign always reach the LLM"""
+    above = make_test_case("new-1", "Reject large transfers", "Submit a transfer with amount > 1000")
+    below = make_test_case("tc-1", "Reject large transfers", "Submit a transfer with amount < 1000")
+    negative = make_test_case("new-2", "Reject large transfers", "Submit a transfer with amount -1000")
+    positive = make_test_case("tc-2", "Reject large transfers", "Submit a transfer with amount 1000")
+    
+    for new, existing in ((above, below), (negative, positive)):
+        assert classify_near_duplicate(new, existing) is None
+        assert classify_near_duplicate(new, existing, semantic_similarity=0.999) is None
+
+
+def test_compare_skips_llm_for_duplicates():
+    """compare_test_cases returns the fast-path decision without any chat call"""
+    engine = make_comparison_engine([])
+    existing = make_test_case("tc-1", "Login with valid credentials", "Submit valid username and password")
+    copy = make_test_case("new-1", "Login with valid credentials", "Submit valid username and password")
+    engine.embedding_generator.generate_embedding = lambda text: [1.0, 0.0]
+    
+    result = engine.compare_test_cases(copy, existing)
+    
+    assert result.decision == DecisionType.SAME
+    assert engine.client.prompts == []
+    
+    # Among several candidates an exact copy wins before any batched analysis
+    other = make_test_case("tc-2", "Login with remembered session", "Open the app with a saved session")
+    assert engine.compare_against_candidates(copy, [(other, 0.9), (existing, 0.88)]).existing_test_case_id == "tc-1"
+    assert engine.client.prompts == []
+
+
+def test_manager_fast_path_settles_retrieved_pairs():
+    """Pairs past the retrieval gate are settled without the LLM at both ends of the scale"""
+    existing = make_test_case("tc-1", "Login with valid credentials", "Submit valid username and password")
+    existing.description = "Verify that a registered user can sign in and reach the dashboard"
+    reworded = existing.model_copy(update={"id": "new-1", "description": existing.description + " page"})
+    unrelated = make_test_case("new-2", "Export sales report", "Click export and download spreadsheet")
+    unrelated.business_rule = "Reports can be exported by managers"
+    unrelated.expected_outcome = "Spreadsheet downloaded"
+    
+    # Cosines 0.99 and 0.82: retrieval scores 0.98 and 0.64, both past THRESHOLD_ADDON_MIN
+    provider = KeyedProvider({
+        "dashboard page": [0.99, np.sqrt(1 - 0.99 ** 2), 0.0],
+        "Export": [0.82, 0.0, np.sqrt(1 - 0.82 ** 2)],
+        "Login": [1.0, 0.0, 0.0]
+    })
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = test_case_manager.TestCaseManager.__new__(test_case_manager.TestCaseManager)
+        manager.rag_engine, _ = make_engine(os.path.join(tmp_dir, "chroma"), provider)
+        manager.knowledge_base = make_knowledge_base(os.path.join(tmp_dir, "kb"))
+        manager.comparison_engine = make_comparison_engine([])
+        manager.rag_engine.add_test_case(existing)
+        
+        same = manager._analyze_new_test_case(reworded)
+        new = manager._analyze_new_test_case(unrelated)
+    
+    assert same.decision == DecisionType.SAME and same.existing_test_case_id == "tc-1"
+    assert "Near-duplicate" in same.reasoning
+    assert new.decision == DecisionType.NEW and new.existing_test_case_id == "tc-1"
+    assert "little shared wording" in new.reasoning
+    assert manager.comparison_engine.client.prompts == []
+
+
+if __name__ == "__main__":
+    test_fingerprints_track_text_distance()
+    test_classify_settles_only_obvious_pairs()
+    test_opposite_conditions_are_never_settled()
+    test_compare_skips_llm_for_duplicates()
+    test_manager_fast_path_settles_retrieved_pairs()
+    print("✅ All near-duplicate tests passed")
@@ -0,0 +1,72 @@
+"""
+Test: batched comparison of several (new, existing) pairs in one prompt
+"""
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import DecisionType
+from engines.comparison_engine import ComparisonContext
+from tests.conftest import DIFFERENT_ANALYSIS, EXPANDED_ANALYSIS, login_pair, make_comparison_engine, make_test_case
+
+
+
+def make_pairs():
+    """Three pairs with known semantic scores (no embedding calls)"""
+    pairs = [
+        login_pair("new-1", "old-1"),
+        (make_test_case("new-2", "Export sales report", "Click export and download spreadsheet"),
+         make_test_case("old-2", "Export report", "Open reports and export")),
+        (make_test_case("new-3", "Reset password by email", "Request a reset link"),
+         make_test_case("old-3", "Password reset", "Open forgot password and submit email")),
+    ]
+    context = ComparisonContext()
+    for new, existing in pairs:
+        context.add_similarity(new.id, existing.id, 0.80)
+    return pairs, context
+
+
+def test_pairs_share_one_call():
+    """All pairs are analyzed by a single prompt and results keep pair order"""
+    pairs, context = make_pairs()
+    response = [dict(EXPANDED_ANALYSIS, pair_id=1), dict(DIFFERENT_ANALYSIS, pair_id=3), dict(EXPANDED_ANALYSIS, pair_id=2)]
+    engine = make_comparison_engine([json.dumps(response)])
+    
+    results = engine.compare_test_case_pairs(pairs, context=context, batch_size=5)
+    
+    assert [r.existing_test_case_id for r in results] == ["old-1", "old-2", "old-3"]
+    assert [r.decision for r in results] == [DecisionType.ADDON, DecisionType.ADDON, DecisionType.NEW]
+    assert len(engine.client.prompts) == 1
+    assert "pair_id: 3" in engine.client.prompts[0]
+
+
+def test_invalid_entries_fall_back_per_pair():
+    """Only the pair whose entry failed validation gets its own call"""
+    pairs, context = make_pairs()
+    response = [dict(EXPANDED_ANALYSIS, pair_id=1), dict(EXPANDED_ANALYSIS, pair_id=2, relationship="maybe"), dict(DIFFERENT_ANALYSIS, pair_id=3)]
+    engine = make_comparison_engine([json.dumps(response), json.dumps(DIFFERENT_ANALYSIS)])
+    
+    results = engine.compare_test_case_pairs(pairs, context=context, batch_size=5)
+    
+    assert [r.decision for r in results] == [DecisionType.ADDON, DecisionType.NEW, DecisionType.NEW]
+    assert len(engine.client.prompts) == 2
+
+
+def test_unparseable_batch_analyzes_every_pair():
+    """A response that is not JSON means one call per pair"""
+    pairs, context = make_pairs()
+    engine = make_comparison_engine(["not json", json.dumps(EXPANDED_ANALYSIS), json.dumps(EXPANDED_ANALYSIS), json.dumps(DIFFERENT_ANALYSIS)])
+    
+    results = engine.compare_test_case_pairs(pairs, context=context, batch_size=5)
+    
+    assert [r.decision for r in results] == [DecisionType.ADDON, DecisionType.ADDON, DecisionType.NEW]
+    assert len(engine.client.prompts) == 4
+
+
+if __name__ == "__main__":
+    test_pairs_share_one_call()
+    test_invalid_entries_fall_back_per_pair()
+    test_unparseable_batch_analyzes_every_pair()
+    print("✅ All pair batching tests passed")
@@ -0,0 +1,86 @@
+"""
+Test: Embeddings carried in JSON exports are reused on import
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils import (
+    encode_embedding, decode_embedding, build_embedding_record,
+    load_precomputed_embeddings, import_from_json, save_json, compute_content_hash
+)
+from tests.conftest import make_engine, make_test_case
+
+
+def test_embedding_encoding_roundtrip():
+    """base64 float32 encoding is lossless at float32 precision"""
+    vector = np.random.default_rng(0).standard_normal(1536).astype(np.float32)
+    encoded = encode_embedding(vector)
+    
+    assert isinstance(encoded, str)
+    assert len(encoded) < 1536 * 6  # far smaller than a JSON float list
+    assert np.array_equal(decode_embedding(encoded), vector)
+
+
+def test_import_reuses_exported_embeddings():
+    """Vectors exported with a suite are stored as-is instead of being re-embedded"""
+    with tempfile.TemporaryDirectory() as source_dir, tempfile.TemporaryDirectory() as target_dir:
+        source, _ = make_engine(source_dir)
+        cases = [
+            make_test_case("tc-1", "Login with valid credentials", "Submit valid username and password"),
+            make_test_case("tc-2", "Password reset email", "Request a password reset link")
+        ]
+        source.add_test_cases_batch(cases)
+        
+        model = source.embedding_generator.deployment
+        stored = source.get_embeddings([tc.id for tc in cases])
+        export_path = os.path.join(source_dir, "suite.json")
+        data = {"name": "suite", "description": "", "test_cases": []}
+        for tc in cases:
+            tc_dict = tc.model_dump()
+            entry = stored[tc.id]
+            tc_dict["embedding"] = build_embedding_record(entry["embedding"], model, entry["content_hash"])
+            data["test_cases"].append(tc_dict)
+        save_json(data, export_path)
+        
+        imported = import_from_json(export_path)
+        precomputed = load_precomputed_embeddings(export_path)
+        assert set(precomputed) == {"tc-1", "tc-2"}
+        
+        # Only reuse vectors for unchanged text from the same model
+        vectors = [
+            precomputed[tc.id]["embedding"]
+            if precomputed[tc.id]["model"] == model
+            and precomputed[tc.id]["content_hash"] == compute_content_hash(tc.to_text())
+            else None
+            for tc in imported
+        ]
+        assert all(vector is not None for vector in vectors)
+        
+        target, provider = make_engine(target_dir)
+        target.add_test_cases_batch(imported, embeddings=vectors)
+        
+        assert provider.embedded_texts == 0
+        copied = target.get_embeddings(["tc-1", "tc-2"])
+        for tc in cases:
+            assert np.allclose(copied[tc.id]["embedding"], stored[tc.id]["embedding"], atol=1e-6)
+
+
+def test_batch_add_embeds_only_missing_vectors():
+    """None entries in the precomputed list are embedded as usual"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, provider = make_engine(tmp_dir)
+        cases = [
+            make_test_case("tc-1", "Login with valid credentials", "Submit valid username and password"),
+            make_test_case("tc-2", "Password reset email", "Request a password reset link")
+        ]
+        reused = provider.embed([cases[0].to_text()])[0]
+        provider.embedded_texts = 0
+        
+        engine.add_test_cases_batch(cases, embeddings=[reused, None])
+        
+        assert provider.embedded_texts == 1
+        assert engine.count() == 2
@@ -0,0 +1,251 @@
+"""
+Test: RAG engine storage and retrieval with the local embedding provider
+"""
+import sys
+import os
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines import test_case_manager
+from engines.rag_engine import RAGEngine
+from tests.conftest import make_comparison_engine, make_engine, make_knowledge_base, make_test_case
+
+
+def test_update_reuses_vector_when_text_unchanged():
+    """Metadata-only updates do not re-embed; content changes do"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, provider = make_engine(tmp_dir)
+        test_case = make_test_case("tc-1", "Login with valid credentials", "Submit valid username and password")
+        engine.add_test_case(test_case)
+        assert provider.embedded_texts == 1
+        
+        # Metadata-only change keeps the stored vector
+        test_case.priority = "Low"
+        test_case.version = 2
+        engine.update_test_case(test_case)
+        assert provider.embedded_texts == 1
+        
+        stored = engine.get_test_case_by_id("tc-1")
+        assert stored["metadata"]["priority"] == "Low"
+        assert stored["metadata"]["version"] == 2
+        
+        # A change to the embedded text triggers a fresh embedding
+        test_case.expected_outcome = "User lands on dashboard"
+        engine.update_test_case(test_case)
+        assert provider.embedded_texts == 2
+        assert "dashboard" in engine.get_test_case_by_id("tc-1")["document"]
+        assert engine.count() == 1
+
+
+def test_search_returns_most_similar_first():
+    """Nearest stored case is ranked first"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, _ = make_engine(tmp_dir)
+        engine.add_test_cases_batch([
+            make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password"),
+            make_test_case("tc-export", "Export sales report", "Click export and download spreadsheet"),
+        ])
+        
+        query = make_test_case("tc-new", "Login with valid credentials", "Submit valid username and password")
+        results = engine.search_similar_test_cases(query, top_k=2)
+        
+        assert [r["id"] for r in results] == ["tc-login", "tc-export"]
+        assert results[0]["similarity"] > results[1]["similarity"]
+
+
+def test_batch_search_matches_single_queries():
+    """One batched query returns the same hits as per-case searches"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, _ = make_engine(tmp_dir)
+        engine.add_test_cases_batch([
+            make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password"),
+            make_test_case("tc-export", "Export sales report", "Click export and download spreadsheet"),
+            make_test_case("tc-reset", "Password reset email", "Request a password reset link"),
+        ])
+        
+        queries = [
+            make_test_case("q-1", "Export monthly sales report", "Click export and download spreadsheet"),
+            make_test_case("q-2", "Login with valid credentials", "Submit valid username and password"),
+        ]
+        batched = engine.search_similar_batch(queries, top_k=2)
+        
+        assert len(batched) == 2
+        for query, hits in zip(queries, batched):
+            single = engine.search_similar_test_cases(query, top_k=2)
+            assert [h["id"] for h in hits] == [h["id"] for h in single]
+            for hit, expected in zip(hits, single):
+                assert abs(hit["similarity"] - expected["similarity"]) < 1e-5
+        assert batched[1][0]["id"] == "tc-login"
+
+
+def test_count_follows_writes_from_other_engines():
+    """Empty stores skip embedding, and another engine's writes are seen at once"""
+    from engines.vector_store import NumpyVectorStore
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "index.idx")
+        engine, provider = make_engine(tmp_dir)
+        engine.collection = NumpyVectorStore(path=path, hnsw_min_items=0)
+        writer, _ = make_engine(tmp_dir)
+        writer.collection = NumpyVectorStore(path=path, hnsw_min_items=0)
+        
+        query = make_test_case("q-1", "Login with valid credentials", "Submit valid username and password")
+        assert engine.search_similar_batch([query, query]) == [[], []]
+        assert provider.embedded_texts == 0
+        
+        writer.add_test_case(make_test_case("tc-1", "Login", "Submit credentials"))
+        assert engine.count() == 1
+        assert [hits[0]["id"] for hits in engine.search_similar_batch([query])] == ["tc-1"]
+        
+        writer.delete_test_case("tc-1")
+        assert engine.count() == 0
+
+
+def test_filtered_search_on_both_backends():
+    """Suite, type, priority, tag and regression filters restrict the candidates"""
+    from engines.vector_store import NumpyVectorStore
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chroma_engine, _ = make_engine(tmp_dir)
+        numpy_engine = RAGEngine(
+            embedding_generator=chroma_engine.embedding_generator,
+            vector_store=NumpyVectorStore(path=os.path.join(tmp_dir, "index.idx"), hnsw_min_items=0)
+        )
+        
+        login = make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password")
+        other_login = make_test_case("tc-login-b", "Login with valid credentials", "Submit valid username and password")
+        other_login.test_type = "Negative"
+        other_login.tags = ["smoke"]
+        other_login.is_regression = True
+        
+        for engine in (chroma_engine, numpy_engine):
+            engine.add_test_cases_batch([login], suite_name="web")
+            engine.add_test_case(other_login, suite_name="mobile")
+            
+            query = make_test_case("q-1", "Login with valid credentials", "Submit valid username and password")
+            assert [h["id"] for h in engine.search_similar_test_cases(query, suite_name="web")] == ["tc-login"]
+            assert [h["id"] for h in engine.search_similar_test_cases(query, test_types=["Negative"])] == ["tc-login-b"]
+            assert [h["id"] for h in engine.search_similar_test_cases(query, tags=["smoke", "missing"])] == ["tc-login-b"]
+            assert [h["id"] for h in engine.search_similar_test_cases(query, is_regression=False)] == ["tc-login"]
+            assert engine.search_similar_test_cases(query, suite_name="web", priorities=["Low"]) == []
+            
+            batched = engine.search_similar_batch([query, other_login], match_test_type=True)
+            assert [h["id"] for h in batched[1]] == ["tc-login-b"]
+            
+            # Removing a tag clears its flag so filtered searches stop matching
+            other_login.tags = []
+            engine.update_test_case(other_login)
+            assert engine.search_similar_test_cases(query, tags=["smoke"]) == []
+            assert engine.get_test_case_by_id("tc-login-b")["metadata"]["suite_name"] == "mobile"
+            other_login.tags = ["smoke"]
+
+
+def test_hybrid_and_lexical_retrieval():
+    """Hybrid fuses vector and BM25 hits; lexical mode skips embedding entirely"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, provider = make_engine(tmp_dir)
+        engine.add_test_cases_batch([
+            make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password"),
+            make_test_case("tc-export", "Export sales report", "Click export and download spreadsheet"),
+            make_test_case("tc-reset", "Password reset email", "Request a password reset link"),
+        ], suite_name="web")
+        query = make_test_case("q-1", "Export monthly sales report", "Click export and download spreadsheet")
+        
+        hybrid = engine.search_similar_test_cases(query, top_k=2, mode="hybrid")
+        assert hybrid[0]["id"] == "tc-export"
+        assert hybrid[0]["rrf_score"] > hybrid[1]["rrf_score"]
+        vector = {h["id"]: h["similarity"] for h in engine.search_similar_test_cases(query, top_k=3)}
+        for hit in hybrid:
+            assert abs(hit["similarity"] - vector[hit["id"]]) < 1e-5
+        
+        embedded = provider.embedded_texts
+        lexical = engine.search_similar_batch([query], mode="lexical", suite_name="web")[0]
+        assert lexical[0]["id"] == "tc-export"
+        assert lexical[0]["retrieval"] == "lexical"
+        assert provider.embedded_texts == embedded
+        
+        # Writes keep the lexical index in sync
+        engine.delete_test_case("tc-export")
+        assert "tc-export" not in [h["id"] for h in engine.search_similar_test_cases(query, mode="lexical")]
+
+
+def test_embedding_failure_falls_back_to_lexical():
+    """Searches still return candidates when the embedding service is down"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, provider = make_engine(tmp_dir)
+        engine.add_test_cases_batch([
+            make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password"),
+            make_test_case("tc-export", "Export sales report", "Click export and download spreadsheet"),
+        ])
+        
+        def fail(texts):
+            raise RuntimeError("embedding service unavailable")
+        provider.embed = fail
+        
+        query = make_test_case("q-1", "Login with valid credentials twice", "Submit valid username and password")
+        results = engine.search_similar_test_cases(query, top_k=2)
+        
+        assert results[0]["id"] == "tc-login"
+        assert results[0]["retrieval"] == "lexical"
+        assert results[0]["similarity"] > 0.8
+
+
+def test_keyword_only_matches_are_left_for_review():
+    """Lexical fallback hits are never decided by thresholds nor auto-applied"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = test_case_manager.TestCaseManager.__new__(test_case_manager.TestCaseManager)
+        manager.rag_engine, provider = make_engine(os.path.join(tmp_dir, "chroma"))
+        manager.knowledge_base = make_knowledge_base(os.path.join(tmp_dir, "kb"))
+        manager.comparison_engine = make_comparison_engine([])
+        existing = make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password")
+        manager.knowledge_base.add_test_case_to_suite("web", existing)
+        manager.rag_engine.add_test_case(existing, suite_name="web")
+        
+        def fail(texts):
+            raise RuntimeError("embedding service unavailable")
+        provider.embed = fail
+        
+        new = make_test_case("new-1", "Login with valid credentials twice", "Submit valid username and password")
+        manager.generator = SimpleNamespace(generate_from_text=lambda text, num_test_cases=None: [new])
+        result = manager.process_requirement_text("Users log in", suite_name="web", auto_apply=True)
+        
+        comparison = result["results"][0]["comparison"]
+        assert comparison.needs_review and comparison.existing_test_case_id == "tc-login"
+        assert result["actions_taken"] == ["Left for review (ID: new-1)"]
+        assert result["summary"]["review_count"] == 1
+        assert [tc.id for tc in manager.knowledge_base.get_all_test_cases("web")] == ["tc-login"]
+        assert manager.comparison_engine.client.prompts == []
+
+
+def test_hits_carry_full_payload():
+    """Search hits restore the complete stored test case"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, _ = make_engine(tmp_dir)
+        stored = make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password")
+        stored.preconditions = ["User account exists"]
+        engine.add_test_case(stored, suite_name="web")
+        
+        hit = engine.search_similar_test_cases(stored, top_k=1)[0]
+        restored = RAGEngine.hit_test_case(hit)
+        
+        assert restored == stored
+        assert restored.test_steps[0].action == "Submit valid username and password"
+        
+        # Records stored before payloads existed fall back to rebuilding
+        engine.collection.update(ids=["tc-login"], metadatas=[{"payload": ""}])
+        assert RAGEngine.hit_test_case(engine.get_test_case_by_id("tc-login")) is None
+
+
+if __name__ == "__main__":
+    test_update_reuses_vector_when_text_unchanged()
+    test_search_returns_most_similar_first()
+    test_batch_search_matches_single_queries()
+    test_count_follows_writes_from_other_engines()
+    test_filtered_search_on_both_backends()
+    test_hybrid_and_lexical_retrieval()
+    test_embedding_failure_falls_back_to_lexical()
+    test_keyword_only_matches_are_left_for_review()
+    test_hits_carry_full_payload()
+    print("✅ All RAG engine tests passed")
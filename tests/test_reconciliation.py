@@ -0,0 +1,86 @@
+"""
+Test: incremental reconciliation of the vector store with the knowledge base
+"""
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.rag_engine import RAGEngine
+from engines.reconciliation import StoreReconciler
+from tests.conftest import make_engine, make_knowledge_base, make_test_case
+
+
+def test_reconcile_repairs_only_drifted_records():
+    """Missing, changed, re-prioritized and orphaned records are fixed; the rest is untouched"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, provider = make_engine(os.path.join(tmp_dir, "chroma"))
+        knowledge_base = make_knowledge_base(os.path.join(tmp_dir, "kb"))
+        
+        unchanged = make_test_case("tc-same", "Login with valid credentials", "Submit valid username and password")
+        changed = make_test_case("tc-changed", "Export sales report", "Click export and download spreadsheet")
+        reprioritized = make_test_case("tc-reprioritized", "Password reset email", "Request a password reset link")
+        missing = make_test_case("tc-missing", "Logout", "Click logout")
+        orphan = make_test_case("tc-orphan", "Deleted case", "No longer exists")
+        
+        engine.add_test_cases_batch([unchanged, changed, reprioritized, orphan], suite_name="web")
+        for tc in (unchanged, changed, reprioritized, missing):
+            knowledge_base.add_test_case_to_suite("web", tc)
+        
+        # Knowledge base writes that never reached the vector store
+        changed.test_steps[0].action = "Click export and download CSV"
+        reprioritized.priority = "Low"
+        reprioritized.is_regression = True
+        
+        reconciler = StoreReconciler(engine, knowledge_base)
+        preview = reconciler.reconcile(dry_run=True)
+        assert preview["ids"] == {
+            "missing": ["tc-missing"],
+            "stale": ["tc-changed"],
+            "metadata": ["tc-reprioritized"],
+            "orphaned": ["tc-orphan"]
+        }
+        assert engine.count() == 4
+        
+        embedded = provider.embedded_texts
+        result = reconciler.reconcile()
+        assert result["errors"] == []
+        assert provider.embedded_texts - embedded == 2  # only missing + stale
+        
+        stored = {hit["id"]: hit for hit in engine.get_all_test_cases()}
+        assert set(stored) == {"tc-same", "tc-changed", "tc-reprioritized", "tc-missing"}
+        assert "download CSV" in stored["tc-changed"]["document"]
+        assert stored["tc-reprioritized"]["metadata"]["priority"] == "Low"
+        assert stored["tc-reprioritized"]["metadata"]["is_regression"] is True
+        assert stored["tc-missing"]["metadata"]["suite_name"] == "web"
+        
+        assert all(not ids for ids in reconciler.reconcile(dry_run=True)["ids"].values())
+
+
+def test_reconcile_upgrades_records_from_older_versions():
+    """Records without suite, tag flags or payload get them once, without re-embedding"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, provider = make_engine(os.path.join(tmp_dir, "chroma"))
+        knowledge_base = make_knowledge_base(os.path.join(tmp_dir, "kb"))
+        
+        test_case = make_test_case("tc-1", "Login with valid credentials", "Submit valid username and password")
+        engine.add_test_case(test_case)
+        knowledge_base.add_test_case_to_suite("web", test_case)
+        engine.collection.update(ids=["tc-1"], metadatas=[{"suite_name": "", "payload": ""}])
+        
+        reconciler = StoreReconciler(engine, knowledge_base)
+        assert reconciler.reconcile()["ids"]["metadata"] == ["tc-1"]
+        assert reconciler.reconcile(dry_run=True)["ids"]["metadata"] == []
+        assert provider.embedded_texts == 1
+        
+        metadata = engine.get_test_case_by_id("tc-1")["metadata"]
+        assert metadata["suite_name"] == "web"
+        assert metadata["tag:auth"] is True
+        assert RAGEngine.hit_test_case(engine.get_test_case_by_id("tc-1")) == test_case
+
+
+if __name__ == "__main__":
+    test_reconcile_repairs_only_drifted_records()
+    test_reconcile_upgrades_records_from_older_versions()
+    print("✅ All reconciliation tests passed")
@@ -0,0 +1,80 @@
+"""
+Test: Vectorized similarity kernels
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from engines.similarity import normalize_rows, similarity_matrix, top_k_similar, to_unit_interval, retrieval_to_unit_interval
+
+
+def test_similarity_matrix_matches_pairwise_cosine():
+    """The N x M matrix equals pairwise cosine similarity"""
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(4, 8)).astype(np.float32)
+    candidates = rng.normal(size=(6, 8)).astype(np.float32)
+    
+    matrix = similarity_matrix(normalize_rows(queries), normalize_rows(candidates))
+    
+    assert matrix.shape == (4, 6)
+    assert matrix.dtype == np.float32
+    for i in range(4):
+        for j in range(6):
+            expected = np.dot(queries[i], candidates[j]) / (
+                np.linalg.norm(queries[i]) * np.linalg.norm(candidates[j])
+            )
+            assert abs(matrix[i, j] - expected) < 1e-5
+
+
+def test_normalize_rows_handles_zero_vectors():
+    """Zero rows stay zero instead of producing NaN"""
+    normalized = normalize_rows([[3.0, 4.0], [0.0, 0.0]])
+    
+    assert np.allclose(normalized[0], [0.6, 0.8])
+    assert np.allclose(normalized[1], [0.0, 0.0])
+
+
+def test_top_k_similar_returns_best_first():
+    """Top-k indices and scores are sorted best first"""
+    candidates = normalize_rows([[1.0, 0.0], [0.0, 1.0], [0.7, 0.7], [-1.0, 0.0]])
+    queries = normalize_rows([[1.0, 0.1], [0.0, 1.0]])
+    
+    indices, scores = top_k_similar(queries, candidates, k=2)
+    
+    assert indices.shape == (2, 2)
+    assert indices[0].tolist() == [0, 2]
+    assert indices[1].tolist() == [1, 2]
+    assert scores[0, 0] >= scores[0, 1]
+    
+    # k larger than the candidate set is clamped
+    indices, scores = top_k_similar(queries, candidates, k=10)
+    assert indices.shape == (2, 4)
+    assert indices[0, -1] == 3
+
+
+def test_to_unit_interval():
+    """Cosine range maps onto 0-1"""
+    assert to_unit_interval(1.0) == 1.0
+    assert to_unit_interval(-1.0) == 0.0
+    assert to_unit_interval(0.0) == 0.5
+
+
+def test_retrieval_to_unit_interval_matches_pairwise_scale():
+    """Vector store scores (1 - squared L2) map onto the 0-1 cosine scale"""
+    a = np.array([1.0, 0.0], dtype=np.float32)
+    b = np.array([0.6, 0.8], dtype=np.float32)
+    retrieval_score = 1 - float(np.sum((a - b) ** 2))
+    
+    assert np.isclose(retrieval_to_unit_interval(retrieval_score), to_unit_interval(float(a @ b)))
+    assert retrieval_to_unit_interval(1.0) == 1.0
+
+
+if __name__ == "__main__":
+    test_similarity_matrix_matches_pairwise_cosine()
+    test_normalize_rows_handles_zero_vectors()
+    test_top_k_similar_returns_best_first()
+    test_to_unit_interval()
+    test_retrieval_to_unit_interval_matches_pairwise_scale()
+    print("✅ All similarity kernel tests passed")
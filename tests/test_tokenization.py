@@ -0,0 +1,72 @@
+"""
+Test: Token-aware truncation, chunking and batch packing for embeddings
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from engines.tokenization import TokenCounter, pack_batches
+from engines.embedding_cache import EmbeddingCache
+from engines.embedding_providers import LocalEmbeddingProvider
+from engines.embeddings import EmbeddingGenerator
+
+
+def approximate_counter() -> TokenCounter:
+    """Token counter that never loads tiktoken (deterministic, offline)"""
+    counter = TokenCounter()
+    counter.encoding = None
+    return counter
+
+
+def test_pack_batches_respects_item_and_token_limits():
+    """Batches never exceed either limit, and oversize inputs go alone"""
+    batches = pack_batches([10, 10, 10, 50, 5, 5, 5, 5], max_items=3, max_tokens=30)
+    
+    assert batches == [[0, 1, 2], [3], [4, 5, 6], [7]]
+    assert pack_batches([], max_items=3, max_tokens=30) == []
+
+
+def test_truncate_and_split_with_fallback_counter():
+    """Fallback counting truncates and chunks by approximate token size"""
+    counter = approximate_counter()
+    text = "x" * (counter.CHARS_PER_TOKEN * 10)
+    
+    assert counter.count(text) == 10
+    assert counter.truncate(text, 4) == "x" * (counter.CHARS_PER_TOKEN * 4)
+    assert counter.truncate("short", 100) == "short"
+    
+    chunks = counter.split(text, 4)
+    assert len(chunks) == 3
+    assert "".join(chunks) == text
+
+
+def test_oversize_text_is_mean_pooled_when_chunking_enabled():
+    """Chunked embeddings are the normalized token-weighted mean of chunk vectors"""
+    provider = LocalEmbeddingProvider(dimension=64)
+    generator = EmbeddingGenerator(
+        cache=EmbeddingCache(path=":memory:", max_bytes=1024 * 1024, memory_items=10),
+        provider=provider
+    )
+    generator.token_counter = approximate_counter()
+    generator.max_tokens = 4
+    generator.chunk_oversize = True
+    
+    text = "login page password reset email link"
+    embedding = np.asarray(generator.generate_embedding(text), dtype=np.float32)
+    
+    chunks = generator.token_counter.split(text, 4)
+    assert len(chunks) > 1
+    weights = np.asarray([generator.token_counter.count(c) for c in chunks], dtype=np.float32)
+    expected = weights @ provider.embed(chunks)
+    expected /= np.linalg.norm(expected)
+    
+    assert np.allclose(embedding, expected, atol=1e-5)
+
+
+if __name__ == "__main__":
+    test_pack_batches_respects_item_and_token_limits()
+    test_truncate_and_split_with_fallback_counter()
+    test_oversize_text_is_mean_pooled_when_chunking_enabled()
+    print("✅ All tokenization tests passed")
@@ -0,0 +1,94 @@
+"""
+Test: Dimensionality reduction and int8 quantization of embeddings
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.embedding_cache import EmbeddingCache
+from engines.similarity import normalize_rows
+from engines.vector_compression import (
+    DimensionReducer, quantize_int8, dequantize_int8, recall_report
+)
+
+
+def clustered_vectors(n=300, dim=128, clusters=10, seed=0):
+    """Unit vectors grouped around a few centres, like embeddings of related test cases"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    return normalize_rows(centres[labels] + 0.3 * rng.standard_normal((n, dim)))
+
+
+def test_int8_roundtrip_is_close():
+    """Quantized vectors keep their direction"""
+    matrix = clustered_vectors(n=20)
+    codes, scales = quantize_int8(matrix)
+    
+    assert codes.dtype == np.int8 and scales.dtype == np.float32
+    restored = normalize_rows(dequantize_int8(codes, scales))
+    cosines = np.sum(restored * matrix, axis=1)
+    assert cosines.min() > 0.999
+
+
+def test_reducer_output_shape_and_persistence():
+    """Reduced vectors are unit length and a saved reducer projects identically"""
+    matrix = clustered_vectors()
+    
+    for method in DimensionReducer.METHODS:
+        reducer = DimensionReducer(32, method=method).fit(matrix)
+        reduced = reducer.transform(matrix)
+        assert reduced.shape == (len(matrix), 32)
+        assert np.allclose(np.linalg.norm(reduced, axis=1), 1.0, atol=1e-5)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "reducer.npz")
+            reducer.save(path)
+            loaded = DimensionReducer.load(path)
+            assert loaded.method == method
+            assert np.allclose(loaded.transform(matrix), reduced, atol=1e-6)
+
+
+def test_recall_report():
+    """PCA plus int8 keeps most neighbours at a fraction of the size"""
+    matrix = clustered_vectors()
+    
+    baseline = recall_report(matrix, k=5)
+    assert baseline["recall_at_k"] == 1.0
+    assert baseline["compression_ratio"] == 1.0
+    
+    report = recall_report(matrix, reducer=DimensionReducer(32).fit(matrix), quantize=True, k=5)
+    assert report["bytes_per_vector"] == 32 + 4
+    assert report["compression_ratio"] > 10
+    assert report["recall_at_k"] > 0.5
+
+
+def test_quantized_cache():
+    """int8 cache entries take dim + 4 bytes and decode close to the original"""
+    cache = EmbeddingCache(path=":memory:", max_bytes=1024 * 1024, memory_items=0, quantize=True)
+    vector = clustered_vectors(n=1)[0].tolist()
+    
+    cache.set("q", vector)
+    assert cache.total_bytes == len(vector) + 4
+    
+    restored = np.asarray(cache.get("q"))
+    assert np.dot(restored, vector) / np.linalg.norm(restored) > 0.999
+
+
+def test_cache_reads_both_formats():
+    """Switching quantization on keeps previously stored float32 entries readable"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "embeddings.db")
+        
+        full = EmbeddingCache(path=path, max_bytes=1024 * 1024, memory_items=10, quantize=False)
+        full.set("old", [0.5, -0.25, 1.0])
+        full.close()
+        
+        quantized = EmbeddingCache(path=path, max_bytes=1024 * 1024, memory_items=10, quantize=True)
+        quantized.set("new", [0.5, -0.25, 1.0])
+        assert quantized.get("old") == [0.5, -0.25, 1.0]
+        assert np.allclose(quantized.get("new"), [0.5, -0.25, 1.0], atol=0.01)
+        quantized.close()
@@ -0,0 +1,306 @@
+"""
+Test: In-process NumPy vector store (Chroma-compatible API)
+"""
+import sys
+import os
+import tempfile
+import multiprocessing
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines import vector_store
+from engines.similarity import normalize_rows
+from engines.vector_store import NumpyVectorStore, build_where, matches_where
+from engines.rag_engine import RAGEngine
+from tests.conftest import make_engine, make_test_case
+
+
+def random_vectors(n, dim=32, seed=0):
+    return normalize_rows(np.random.default_rng(seed).standard_normal((n, dim)))
+
+
+def add_records(store, vectors, prefix="id"):
+    ids = [f"{prefix}-{i}" for i in range(len(vectors))]
+    store.add(
+        ids=ids,
+        embeddings=vectors,
+        documents=[f"doc {i}" for i in ids],
+        metadatas=[{"title": i, "priority": "High"} for i in ids]
+    )
+    return ids
+
+
+def exact_neighbours(vectors, query, k):
+    distances = np.sum((vectors - query) ** 2, axis=1)
+    order = np.argsort(distances)[:k]
+    return order, distances[order]
+
+
+def test_query_matches_brute_force():
+    """Exact search returns squared L2 neighbours, nearest first"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = NumpyVectorStore(path=os.path.join(tmp_dir, "index.idx"), hnsw_min_items=0)
+        vectors = random_vectors(200)
+        ids = add_records(store, vectors)
+        
+        queries = random_vectors(3, seed=1)
+        results = store.query(query_embeddings=queries, n_results=5)
+        
+        assert store.count() == 200
+        for row, query in enumerate(queries):
+            order, distances = exact_neighbours(vectors, query, 5)
+            assert results["ids"][row] == [ids[i] for i in order]
+            assert np.allclose(results["distances"][row], distances, atol=1e-4)
+            assert results["documents"][row][0] == f"doc {ids[order[0]]}"
+
+
+def test_persists_and_supports_incremental_changes():
+    """Adds, upserts, metadata updates and deletes survive reopening the file"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "index.idx")
+        store = NumpyVectorStore(path=path, hnsw_min_items=0)
+        vectors = random_vectors(100)  # grows past the initial capacity
+        ids = add_records(store, vectors)
+        
+        store.delete(ids=[ids[0], ids[50]])
+        store.update(ids=[ids[1]], metadatas=[{"priority": "Low"}])
+        replacement = random_vectors(1, seed=7)
+        store.upsert(ids=[ids[2]], embeddings=replacement, documents=["changed"], metadatas=[{"title": "changed"}])
+        
+        reopened = NumpyVectorStore(path=path, hnsw_min_items=0)
+        assert reopened.count() == 98
+        assert reopened.get(ids=[ids[0], ids[50]])["ids"] == []
+        
+        fetched = reopened.get(ids=[ids[1], ids[2], ids[99]], include=["metadatas", "documents", "embeddings"])
+        assert fetched["metadatas"][0] == {"title": ids[1], "priority": "Low"}
+        assert fetched["documents"][1] == "changed"
+        assert np.allclose(fetched["embeddings"][1], replacement[0])
+        assert np.allclose(fetched["embeddings"][2], vectors[99])
+        
+        # Deleted and replaced rows are never returned by search
+        hit = reopened.query(query_embeddings=np.vstack([vectors[0], replacement[0], vectors[99]]), n_results=1)
+        assert hit["ids"][0] != [ids[0]]
+        assert hit["ids"][1] == [ids[2]]
+        assert hit["ids"][2] == [ids[99]]
+
+
+def test_other_instances_see_writes():
+    """A second process-level handle picks up changes on its next read"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "index.idx")
+        writer = NumpyVectorStore(path=path, hnsw_min_items=0)
+        reader = NumpyVectorStore(path=path, hnsw_min_items=0)
+        assert reader.count() == 0
+        
+        add_records(writer, random_vectors(10))
+        assert reader.count() == 10
+        
+        writer.reset()
+        assert reader.count() == 0
+
+
+def test_quantized_search_keeps_nearest_neighbours():
+    """int8 candidate scan with float32 re-rank returns exact distances"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = NumpyVectorStore(path=os.path.join(tmp_dir, "index.idx"), quantize=True, hnsw_min_items=0)
+        vectors = random_vectors(300)
+        ids = add_records(store, vectors)
+        
+        results = store.query(query_embeddings=vectors[:5], n_results=3)
+        for row in range(5):
+            assert results["ids"][row][0] == ids[row]
+            assert results["distances"][row][0] < 1e-4
+
+
+def test_quantized_codes_are_stored_in_the_index_file():
+    """Codes are written by every writer and mapped from disk, not rebuilt in memory"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "index.idx")
+        writer = NumpyVectorStore(path=path, quantize=False, hnsw_min_items=0)
+        vectors = random_vectors(300)
+        ids = add_records(writer, vectors)
+        writer.delete(ids[:200])  # compacts into a new generation
+        
+        reader = NumpyVectorStore(path=path, quantize=True, hnsw_min_items=0)
+        assert isinstance(reader._codes, np.memmap) and isinstance(reader._scales, np.memmap)
+        
+        results = reader.query(query_embeddings=vectors[200:205], n_results=1)
+        assert [r[0] for r in results["ids"]] == ids[200:205]
+        assert max(r[0] for r in results["distances"]) < 1e-4
+
+
+def test_hnsw_search():
+    """Large collections are served from the HNSW graph when hnswlib is installed"""
+    pytest.importorskip("hnswlib")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = NumpyVectorStore(path=os.path.join(tmp_dir, "index.idx"), hnsw_min_items=50)
+        vectors = random_vectors(200)
+        ids = add_records(store, vectors)
+        
+        results = store.query(query_embeddings=vectors[:10], n_results=1)
+        assert store._hnsw is not None
+        assert [r[0] for r in results["ids"]] == ids[:10]
+        
+        # Incremental adds go into the existing graph
+        extra = random_vectors(5, seed=3)
+        extra_ids = add_records(store, extra, prefix="extra")
+        results = store.query(query_embeddings=extra, n_results=1)
+        assert [r[0] for r in results["ids"]] == extra_ids
+
+
+def test_hnsw_delete_marks_labels_instead_of_rebuilding():
+    """Deletes and upserts keep the graph; removed rows are masked, other rows keep their labels"""
+    pytest.importorskip("hnswlib")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = NumpyVectorStore(path=os.path.join(tmp_dir, "index.idx"), hnsw_min_items=50)
+        vectors = random_vectors(200)
+        ids = add_records(store, vectors)
+        store.query(query_embeddings=vectors[:1], n_results=1)
+        graph = store._hnsw
+        rows = {record_id: store._index[record_id] for record_id in ids}
+        
+        store.delete(ids=ids[:10])
+        replacement = random_vectors(1, seed=9)
+        store.upsert(ids=[ids[10]], embeddings=replacement, documents=["changed"], metadatas=[{"title": "changed"}])
+        
+        results = store.query(query_embeddings=np.vstack([vectors[:11], replacement]), n_results=1)
+        assert store._hnsw is graph
+        assert not set(ids[:10]) & {r[0] for r in results["ids"][:10]}
+        assert results["ids"][10] != [ids[10]]
+        assert results["ids"][11] == [ids[10]]
+        assert all(store._index[i] == rows[i] for i in ids[11:])
+        assert store.count() == 190
+
+
+def test_log_tail_past_committed_length_is_ignored():
+    """A crashed writer's partial log write is invisible to readers and dropped by the next writer"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "index.idx")
+        store = NumpyVectorStore(path=path, hnsw_min_items=0)
+        ids = add_records(store, random_vectors(10))
+        
+        with open(store._log_path(store._generation), "ab") as log:
+            log.write(b'{"op": "delete", "id": "id-0"')
+        
+        reader = NumpyVectorStore(path=path, hnsw_min_items=0)
+        assert reader.count() == 10
+        
+        store.delete(ids=[ids[1]])
+        assert reader.count() == 9
+        assert NumpyVectorStore(path=path, hnsw_min_items=0).get(ids=[ids[0]])["ids"] == [ids[0]]
+
+
+def test_growth_publishes_a_new_generation_atomically():
+    """Growing replaces the file in one rename; stale handles reload it and the old log is removed"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "index.idx")
+        writer = NumpyVectorStore(path=path, hnsw_min_items=0)
+        reader = NumpyVectorStore(path=path, hnsw_min_items=0)
+        add_records(writer, random_vectors(10))
+        assert reader.count() == 10
+        old_log = writer._log_path(writer._generation)
+        
+        vectors = random_vectors(100, seed=4)
+        ids = add_records(writer, vectors, prefix="more")
+        assert not os.path.exists(old_log)
+        assert not os.path.exists(f"{path}.tmp")
+        assert reader.count() == 110
+        assert reader.query(query_embeddings=vectors[-1:], n_results=1)["ids"][0] == [ids[-1]]
+
+
+def append_from_process(path, prefix, seed):
+    store = NumpyVectorStore(path=path, hnsw_min_items=0)
+    for batch in range(5):
+        add_records(store, random_vectors(20, seed=seed * 10 + batch), prefix=f"{prefix}-{batch}")
+
+
+def test_concurrent_writer_processes_do_not_lose_records():
+    """Writers in several processes are serialized by the file lock"""
+    if vector_store.fcntl is None:
+        pytest.skip("fcntl is not available")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "index.idx")
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=append_from_process, args=(path, f"p{i}", i)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        assert all(worker.exitcode == 0 for worker in workers)
+        store = NumpyVectorStore(path=path, hnsw_min_items=0)
+        assert store.count() == 4 * 5 * 20
+        assert len(set(store.get()["ids"])) == 400
+
+
+def test_rag_engine_on_numpy_store_matches_chroma():
+    """RAGEngine ranks and scores identically on both backends"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chroma_engine, _ = make_engine(tmp_dir)
+        numpy_engine = RAGEngine(
+            embedding_generator=chroma_engine.embedding_generator,
+            vector_store=NumpyVectorStore(path=os.path.join(tmp_dir, "index.idx"), hnsw_min_items=0)
+        )
+        
+        cases = [
+            make_test_case("tc-login", "Login with valid credentials", "Submit valid username and password"),
+            make_test_case("tc-export", "Export sales report", "Click export and download spreadsheet"),
+            make_test_case("tc-reset", "Password reset email", "Request a password reset link"),
+        ]
+        chroma_engine.add_test_cases_batch(cases)
+        numpy_engine.add_test_cases_batch(cases)
+        
+        query = make_test_case("q-1", "Login with valid credentials", "Submit username and password")
+        chroma_hits = chroma_engine.search_similar_test_cases(query, top_k=3)
+        numpy_hits = numpy_engine.search_similar_test_cases(query, top_k=3)
+        
+        assert [h["id"] for h in numpy_hits] == [h["id"] for h in chroma_hits]
+        for numpy_hit, chroma_hit in zip(numpy_hits, chroma_hits):
+            assert abs(numpy_hit["similarity"] - chroma_hit["similarity"]) < 1e-4
+            assert numpy_hit["metadata"] == chroma_hit["metadata"]
+
+
+def test_build_where_and_evaluation():
+    """Filters become Chroma where clauses that the NumPy store evaluates identically"""
+    assert build_where() is None
+    assert build_where(suite_name="web") == {"suite_name": "web"}
+    
+    where = build_where(suite_name="web", priorities=["High"], tags=["smoke", "auth"], is_regression=True)
+    assert where == {"$and": [
+        {"suite_name": "web"},
+        {"priority": {"$in": ["High"]}},
+        {"$or": [{"tag:smoke": True}, {"tag:auth": True}]},
+        {"is_regression": True}
+    ]}
+    
+    metadata = {"suite_name": "web", "priority": "High", "tag:auth": True, "is_regression": True}
+    assert matches_where(metadata, where)
+    assert not matches_where(dict(metadata, priority="Low"), where)
+    assert not matches_where(dict(metadata, **{"tag:auth": False}), where)
+    assert not matches_where({"priority": "High"}, where)
+
+
+def test_filtered_query_scans_matching_rows_only():
+    """Filtered queries return only matching records, also in quantized mode"""
+    for quantize in (False, True):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = NumpyVectorStore(path=os.path.join(tmp_dir, "index.idx"), quantize=quantize, hnsw_min_items=0)
+            vectors = random_vectors(50)
+            ids = [f"id-{i}" for i in range(50)]
+            store.add(
+                ids=ids,
+                embeddings=vectors,
+                documents=ids,
+                metadatas=[{"suite_name": "even" if i % 2 == 0 else "odd"} for i in range(50)]
+            )
+            
+            results = store.query(query_embeddings=vectors[:2], n_results=30, where={"suite_name": "odd"})
+            assert len(results["ids"][0]) == 25
+            assert all(int(i.split("-")[1]) % 2 == 1 for i in results["ids"][0])
+            assert results["ids"][1][0] == "id-1"
+            assert store.get(where={"suite_name": "even"})["ids"] == [i for i in ids if int(i.split("-")[1]) % 2 == 0]
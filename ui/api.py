@@ -97,6 +97,7 @@ class ExportRequest(BaseModel):
     """Request model for export operations"""
     suite_name: str = Field(default="default")
     format: str = Field(default="excel", description="Export format: excel, csv, json")
+    include_embeddings: bool = Field(default=False, description="Include stored vectors in JSON exports (skips re-embedding on import)")
 
 
 class FilteredExportRequest(BaseModel):
@@ -107,6 +108,7 @@ class FilteredExportRequest(BaseModel):
     test_types: Optional[List[str]] = Field(None, description="Filter by test types (e.g., ['Functional', 'Integration'])")
     tags: Optional[List[str]] = Field(None, description="Filter by tags")
     is_regression: Optional[bool] = Field(None, description="Filter regression tests (true=only regression, false=only non-regression)")
+    include_embeddings: bool = Field(default=False, description="Include stored vectors in JSON exports (skips re-embedding on import)")
 
 
 class HealthResponse(BaseModel):
@@ -252,6 +254,28 @@ async def apply_decision(request: ApplyDecisionRequest):
         )
 
 
+@app.post("/comparisons/explain", tags=["Processing"])
+async def explain_comparison(comparison: ComparisonResult):
+    """
+    Generate the LLM explanation of a comparison on demand
+    
+    Decisions carry a template-rendered reasoning by default; post one of the
+    returned comparison results here to get the full explanation.
+    """
+    try:
+        return {
+            "new_test_case_id": comparison.new_test_case_id,
+            "existing_test_case_id": comparison.existing_test_case_id,
+            "decision": comparison.decision.value,
+            "reasoning": manager.explain_comparison(comparison)
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error explaining comparison: {str(e)}"
+        )
+
+
 @app.get("/test-cases", response_model=List[TestCase], tags=["Test Cases"])
 async def get_test_cases(suite_name: str = "default"):
     """
@@ -307,6 +331,47 @@ async def list_suites():
         )
 
 
+@app.get("/suites/{suite_name}/duplicates", tags=["Test Suites"])
+async def find_suite_duplicates(suite_name: str, verify: bool = False):
+    """
+    Find clusters of duplicate test cases inside a suite
+    
+    - **suite_name**: Name of the test suite
+    - **verify**: Confirm ambiguous clusters with the LLM comparison
+    """
+    try:
+        if suite_name not in manager.knowledge_base.list_suites():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Test suite {suite_name} not found"
+            )
+        return manager.find_duplicates(suite_name, verify_with_llm=verify)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error finding duplicates: {str(e)}"
+        )
+
+
+@app.get("/suites/{suite_name}/coverage", tags=["Test Suites"])
+async def get_suite_coverage(suite_name: str, clusters: Optional[int] = None):
+    """
+    Cluster a suite's test cases and report coverage per cluster
+    
+    - **suite_name**: Name of the test suite
+    - **clusters**: Number of clusters (default: chosen from the suite size)
+    """
+    try:
+        return manager.get_coverage_map(suite_name, k=clusters)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error building coverage map: {str(e)}"
+        )
+
+
 @app.get("/statistics", tags=["Statistics"])
 async def get_statistics():
     """Get system statistics"""
@@ -327,6 +392,7 @@ async def export_test_suite(request: ExportRequest, background_tasks: Background
     
     - **suite_name**: Name of the test suite
     - **format**: Export format (excel, csv, json)
+    - **include_embeddings**: Include stored vectors in JSON exports
     """
     try:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -336,7 +402,8 @@ async def export_test_suite(request: ExportRequest, background_tasks: Background
         manager.export_test_suite(
             request.suite_name,
             output_path,
-            format=request.format
+            format=request.format,
+            include_embeddings=request.include_embeddings
         )
         
         return FileResponse(
@@ -362,6 +429,7 @@ async def export_filtered_test_suite(request: FilteredExportRequest, background_
     - **test_types**: Filter by test types (e.g., ["Functional", "Integration"])
     - **tags**: Filter by tags (test case must have at least one matching tag)
     - **is_regression**: Filter regression tests (true=only regression, false=only non-regression)
+    - **include_embeddings**: Include stored vectors in JSON exports
     
     Example for regression suite:
     ```json
@@ -400,7 +468,8 @@ async def export_filtered_test_suite(request: FilteredExportRequest, background_
             priorities=request.priorities,
             test_types=request.test_types,
             tags=request.tags,
-            is_regression=request.is_regression
+            is_regression=request.is_regression,
+            include_embeddings=request.include_embeddings
         )
         
         return FileResponse(